@@ -0,0 +1,86 @@
+"""Broad-phase benchmark: spatial hash vs brute-force pairwise overlap test.
+
+Enemies are scattered at a fixed density (the world grows with the count),
+which is the regime a broad phase is for.
+
+Run from the repository root:
+
+    python -m benchmarks.collisions
+"""
+import time
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+RADIUS = 15.0
+DENSITY = 5 / (800 * 600) * 40  # forty times today's five enemies per screen
+
+
+def scatter(count, seed=0):
+    rng = np.random.default_rng(seed)
+    side = np.sqrt(count / DENSITY)
+    return rng.uniform(0, side, count), rng.uniform(0, side, count)
+
+
+def brute_force_pairs(x, y, radius, block=2048):
+    """Pairwise distances in row blocks to bound memory"""
+    ii, jj = [], []
+    for start in range(0, len(x), block):
+        dx = x[start:start + block, None] - x[None, :]
+        dy = y[start:start + block, None] - y[None, :]
+        hit = dx * dx + dy * dy < (2 * radius) ** 2
+        i, j = np.nonzero(hit)
+        i += start
+        keep = i < j
+        ii.append(i[keep])
+        jj.append(j[keep])
+    return np.concatenate(ii), np.concatenate(jj)
+
+
+def cold_rebuild(x, y):
+    grid = SpatialHash(2 * RADIUS)
+    grid.rebuild(x, y)
+    return grid
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def as_set(i, j):
+    return set(zip(np.minimum(i, j).tolist(), np.maximum(i, j).tolist()))
+
+
+def main(counts=(100, 1_000, 10_000, 30_000, 100_000, 300_000), brute_limit=30_000):
+    print(f"{'enemies':>10}{'brute force':>14}{'rebuild':>12}{'hash pairs':>13}{'pairs':>10}")
+    for count in counts:
+        x, y = scatter(count)
+        rebuild_s, grid = timed(lambda: cold_rebuild(x, y))
+        hash_s, (i, j) = timed(lambda: grid.overlapping_pairs(RADIUS))
+
+        if count <= brute_limit:
+            brute_s, (bi, bj) = timed(lambda: brute_force_pairs(x, y, RADIUS), repeat=1)
+            assert as_set(i, j) == as_set(bi, bj), "spatial hash disagrees with brute force"
+            brute = f"{brute_s * 1000:11.2f} ms"
+        else:
+            brute = f"{'-':>14}"
+        print(f"{count:>10}{brute}{rebuild_s * 1000:9.2f} ms{hash_s * 1000:10.2f} ms{len(i):>10}")
+
+    # Incremental rebuild: small moves keep most points in their cells
+    x, y = scatter(100_000)
+    grid = SpatialHash(2 * RADIUS)
+    grid.rebuild(x, y)
+    x, y = x + 0.5, y + 0.5
+    moved_s, _ = timed(lambda: grid.rebuild(x, y), repeat=1)
+    cold_s, _ = timed(lambda: cold_rebuild(x, y))
+    print(f"rebuild at 100k after a half-pixel step: {moved_s * 1000:.2f} ms (cold {cold_s * 1000:.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
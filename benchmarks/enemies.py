@@ -0,0 +1,82 @@
+"""Enemy engine benchmark: Enemy objects vs the EnemySwarm arrays.
+
+Run from the repository root:
+
+    python -m benchmarks.enemies
+"""
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+from enemy_swarm import EnemySwarm
+from game import ENEMY_SIZE, ENEMY_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH, Enemy
+
+
+def new_swarm(count, seed=0):
+    return EnemySwarm(count, SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE, ENEMY_SPEED,
+                      rng=np.random.default_rng(seed))
+
+
+def check_parity(count=200, ticks=300):
+    """Swarm and Enemy must trace the same paths from the same start"""
+    swarm = new_swarm(count)
+    enemies = [Enemy(None) for _ in range(count)]
+    for enemy, x, y in zip(enemies, swarm.x, swarm.y):
+        enemy.x, enemy.y = float(x), float(y)
+
+    px, py = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+    worst = 0.0
+    for tick in range(ticks):
+        # Circle the player so nobody parks on it (or respawns)
+        px = SCREEN_WIDTH / 2 + 150 * np.cos(tick / 30)
+        py = SCREEN_HEIGHT / 2 + 150 * np.sin(tick / 30)
+        swarm.update(px, py)
+        for enemy in enemies:
+            enemy.update(px, py)
+        ex = np.array([e.x for e in enemies])
+        ey = np.array([e.y for e in enemies])
+        worst = max(worst, np.max(np.hypot(ex - swarm.x, ey - swarm.y)))
+    return worst
+
+
+def ticks_per_second(step, budget=0.5):
+    ticks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < budget:
+        step()
+        ticks += 1
+    return ticks / (time.perf_counter() - start)
+
+
+def main(counts=(10, 1_000, 10_000, 100_000)):
+    print(f"parity vs Enemy: max position error {check_parity():.2e} px")
+    print(f"{'enemies':>10}{'Enemy objs':>16}{'EnemySwarm':>16}{'speed-up':>10}")
+    px, py = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+    radius = 20
+    for count in counts:
+        enemies = [Enemy(None) for _ in range(count)]
+
+        def object_tick():
+            for enemy in enemies:
+                enemy.update(px, py)
+                dist = ((px - enemy.x) ** 2 + (py - enemy.y) ** 2) ** 0.5
+                if dist < radius + enemy.size:
+                    pass
+
+        swarm = new_swarm(count)
+
+        def swarm_tick():
+            swarm.update(px, py)
+            swarm.collides(px, py, radius)
+
+        objects = ticks_per_second(object_tick)
+        arrays = ticks_per_second(swarm_tick)
+        print(f"{count:>10}{objects:>13.0f} /s{arrays:>13.0f} /s{arrays / objects:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
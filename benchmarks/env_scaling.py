@@ -0,0 +1,96 @@
+"""Environment throughput: one TiltEnv, VectorTiltEnv batch sizes, and
+VectorTiltEnv rollouts spread over 1..all cores.
+
+Run from the repository root:
+
+    python -m benchmarks.env_scaling [--steps 200] [--envs 4096]
+
+Also replays seeded episodes through TiltEnv and VectorTiltEnv side by
+side to check they stay identical.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from tilt_env import RandomPolicy, TiltEnv, VectorTiltEnv, run_parallel
+
+
+def check_parity(num_envs=8, seed=10, max_steps=5000):
+    """Episodes of VectorTiltEnv vs TiltEnv with the same seeds and actions"""
+    vector = VectorTiltEnv(num_envs)
+    obs, _ = vector.reset(seed)
+    singles = [TiltEnv() for _ in range(num_envs)]
+    for k, env in enumerate(singles):
+        env.reset(seed + k)
+    policy = RandomPolicy(num_envs, seed)
+    live = set(range(num_envs))
+    mismatches = steps = 0
+    while live and steps < max_steps:
+        actions = policy(obs)
+        obs, _, terminated, _, info = vector.step(actions)
+        steps += 1
+        for k in list(live):
+            single_obs, _, done, _, single_info = singles[k].step(actions[k])
+            if done != terminated[k]:
+                mismatches += 1
+            if done:
+                mismatches += info['final_score'][k] != single_info['score']
+                live.discard(k)
+            elif not np.array_equal(single_obs, obs[k]):
+                mismatches += 1
+    return num_envs - len(live), mismatches
+
+
+def single_rate(steps):
+    env = TiltEnv()
+    env.reset(0)
+    policy = RandomPolicy(1, 0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, _, _ = env.step(policy(None)[0])
+        if terminated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def vector_rate(num_envs, steps):
+    env = VectorTiltEnv(num_envs)
+    obs, _ = env.reset(0)
+    policy = RandomPolicy(num_envs, 0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        obs, _, _, _, _ = env.step(policy(obs))
+    return env.total_steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--steps', type=int, default=200, help="lock-step ticks per worker")
+    parser.add_argument('--envs', type=int, default=4096, help="games per worker")
+    args = parser.parse_args()
+
+    episodes, mismatches = check_parity()
+    print(f"parity: {episodes} seeded episodes, {mismatches} mismatched steps")
+
+    print(f"{'TiltEnv (1 game)':<28}{single_rate(2000):>14,.0f} steps/s")
+    for num_envs in (1, 64, 1024, 8192):
+        print(f"{f'VectorTiltEnv({num_envs})':<28}{vector_rate(num_envs, max(20, 20_000 // num_envs)):>14,.0f} steps/s")
+
+    cores = os.cpu_count()
+    counts = sorted({w for w in (1, 2, 4, 8, 16, 32, 64) if w < cores} | {cores})
+    print(f"\n{args.envs} games x {args.steps} ticks per worker, {cores} cores")
+    print(f"{'workers':>8}{'steps/s':>16}{'per worker':>14}{'episodes':>10}{'mean score':>12}")
+    base = None
+    for workers in counts:
+        total = run_parallel(workers, args.envs, args.steps)
+        rate = total['steps_per_second']
+        base = base or rate
+        mean = total['score'] / max(total['episodes'], 1)
+        print(f"{workers:>8}{rate:>16,.0f}{rate / workers:>14,.0f}{total['episodes']:>10}{mean:>12.1f}"
+              f"   {rate / base:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Startup to the first interactive frame, with and without a board.
+
+Run from the repository root (Linux/macOS, the board is a mpu_sim pty):
+
+    python -m benchmarks.first_frame
+
+Each scenario starts the real Game and Game.run() in a fresh process under
+SDL's dummy drivers:
+
+- absent:   the port doesn't exist
+- attached: a simulated board is streaming before the game starts
+- late:     the board appears 1.5 s after startup (hot-attach)
+- skip:     SPACE is pressed on the waiting screen while a silent board
+            never answers; measures how fast the handshake is cancelled
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+SCENARIOS = ('absent', 'attached', 'late', 'skip')
+LATE_ATTACH = 1.5
+GIVE_UP = 10.0
+
+
+def run_scenario(name):
+    """Runs in the child process; prints one JSON line of timings"""
+    launched = time.perf_counter()
+
+    import pygame
+
+    from game import Game
+    from mpu_sim import VirtualMPU
+
+    device = None
+    port = os.path.join(tempfile.mkdtemp(), 'mpu')
+    if name == 'attached':
+        device = VirtualMPU(rate=200).start()
+        os.symlink(device.port, port)
+    elif name == 'late':
+        def plug_in():
+            nonlocal device
+            device = VirtualMPU(rate=200).start()
+            os.symlink(device.port, port)
+        threading.Timer(LATE_ATTACH, plug_in).start()
+    elif name == 'skip':
+        # Opens fine but never sends a byte, so the handshake just waits
+        device = VirtualMPU(rate=200)
+        os.symlink(device.port, port)
+
+    timings = {}
+
+    class TimedGame(Game):
+        def draw(self, alpha=1.0):
+            super().draw(alpha)
+            now = time.perf_counter() - launched
+            timings.setdefault('first_frame', now)
+            if self.mpu_initialized:
+                timings.setdefault('attached', now)
+            if name == 'skip' and 'skipped' not in timings and self.connector and \
+                    self.connector.state == 'handshake':
+                connector = self.connector
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+                timings['skipped'] = now
+                threading.Thread(target=lambda: (connector.join(), timings.setdefault(
+                    'cancelled', time.perf_counter() - launched)), daemon=True).start()
+            done = {
+                'absent': now > 1.0,
+                'attached': 'attached' in timings,
+                'late': 'attached' in timings,
+                'skip': 'cancelled' in timings,
+            }[name]
+            if done or now > GIVE_UP:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    game = TimedGame(port=port)
+    timings['constructed'] = time.perf_counter() - launched
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    if device is not None:
+        device.stop()
+    print(json.dumps(timings))
+
+
+def main():
+    print(f"{'scenario':<10}{'Game()':>10}{'first frame':>14}{'board attached':>17}{'skip -> cancelled':>20}")
+    for name in SCENARIOS:
+        out = subprocess.run([sys.executable, '-m', 'benchmarks.first_frame', name],
+                             capture_output=True, text=True, check=True).stdout
+        t = json.loads(out.strip().splitlines()[-1])
+
+        def ms(key):
+            return f"{t[key] * 1000:.0f} ms" if key in t else '-'
+
+        cancel = f"{(t['cancelled'] - t['skipped']) * 1000:.0f} ms" if 'cancelled' in t else '-'
+        print(f"{name:<10}{ms('constructed'):>10}{ms('first_frame'):>14}{ms('attached'):>17}{cancel:>20}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run_scenario(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,101 @@
+"""Line framer micro-benchmark on a synthetic 1 MB pitch,roll capture.
+
+Run from the repository root:
+
+    python -m benchmarks.framer
+
+The capture is fed in chunks from 16 bytes, about what a serial read of
+whatever is waiting returns while the game runs, up to 64 KiB, a backlog.
+
+Before timing anything it checks that lines with the wrong number of
+fields are counted and dropped, even when their commas add up across the
+block, and exits with status 1 if they aren't.
+"""
+import sys
+import time
+
+import numpy as np
+
+from line_framer import LineFramer
+
+
+def synthetic_capture(size=1 << 20, corrupt_every=0, seed=0):
+    """Bytes shaped like game.ino output, optionally with mangled lines"""
+    rng = np.random.default_rng(seed)
+    n = size // 12
+    angles = rng.uniform(-90, 90, size=(n, 2))
+    lines = [b"%.3f,%.3f\r\n" % (p, r) for p, r in angles]
+    if corrupt_every:
+        for i in range(0, n, corrupt_every):
+            lines[i] = lines[i][:5] + b"\xff#" + lines[i][7:]
+    return b"".join(lines)[:size]
+
+
+def baseline(capture, chunk):
+    """The original decode/split/parse loop, keeping every record"""
+    count = 0
+    for start in range(0, len(capture), chunk):
+        raw = capture[start:start + chunk].decode('utf-8', errors='ignore')
+        for line in raw.split('\n'):
+            line = line.strip()
+            if line and ',' in line:
+                parts = line.split(',')
+                try:
+                    float(parts[0]), float(parts[1])
+                    count += 1
+                except (ValueError, IndexError):
+                    pass
+    return count
+
+
+def framed(capture, chunk):
+    framer = LineFramer()
+    view = memoryview(capture)
+    count = 0
+    for start in range(0, len(capture), chunk):
+        count += len(framer.feed(view[start:start + chunk]))
+    return count, framer.malformed
+
+
+def check_shifted_fields():
+    """A line with a field too many next to one with a field too few must not pass as two records"""
+    shifted = b"1.0,2.0,3.0\r\n4.0\r\n"
+    cases = [(shifted, 0)]
+    for at in (0, 40, 80):
+        good = [b"%d.5,-%d.25\r\n" % (i, i) for i in range(80)]
+        cases.append((b"".join(good[:at]) + shifted + b"".join(good[at:]), 80))
+    ok = True
+    for capture, expected in cases:
+        framer = LineFramer()
+        records = framer.feed(capture)
+        clean = len(records) == expected and framer.malformed == 2
+        if expected:
+            clean = clean and (records[:, 0] == np.arange(80) + 0.5).all() and (records[:, 1] == -np.arange(80) - 0.25).all()
+        if not clean:
+            print(f"FAIL: {len(capture.splitlines())}-line block with shifted fields gave "
+                  f"{len(records)} records, {framer.malformed} malformed (want {expected}, 2)")
+            ok = False
+    return ok
+
+
+def main(chunks=(16, 32, 64, 128, 256, 4096, 65536)):
+    if not check_shifted_fields():
+        sys.exit(1)
+    for label, corrupt in (("clean", 0), ("0.1% corrupt", 1000)):
+        capture = synthetic_capture(corrupt_every=corrupt)
+        print(f"{label} capture: {len(capture)} bytes")
+        for chunk in chunks:
+            start = time.perf_counter()
+            base_n = baseline(capture, chunk)
+            base_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            framed_n, malformed = framed(capture, chunk)
+            framed_s = time.perf_counter() - start
+
+            print(f"  chunk {chunk:>6}: split/parse {base_n / base_s / 1e6:6.2f} M rec/s ({base_n} rec) | "
+                  f"framer {framed_n / framed_s / 1e6:6.2f} M rec/s ({framed_n} rec, {malformed} malformed)")
+
+
+if __name__ == '__main__':
+    main()
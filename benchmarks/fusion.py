@@ -0,0 +1,155 @@
+"""Host-side fusion of raw IMU data vs the board's own filter.
+
+Run from the repository root:
+
+    python -m benchmarks.fusion [--replay session.mpucap] [--seconds 30]
+
+The motion is a recorded capture (its pitch/roll, resampled) or a
+synthetic tilt pattern, both starting with the board held still, like a
+player waiting for the game. From it the script makes what the MPU6050 would read at 500 Hz, with
+the noise and gyro bias mpu_sim adds, and compares:
+
+- board:  game.ino's complementary filter, alpha 0.98 at 100 Hz, with a
+          startup gyro calibration, as the host sees it today
+- host:   each imu_fusion filter on the 500 Hz raw stream, with GyroBias
+          learning the bias from nothing, fed in per-frame batches
+
+Error is the RMS difference between the newest output the game could
+show and the true tilt, sampled every millisecond after a 2 s warm-up.
+Lag is the delay that best lines the output up with the truth. CPU is the
+host's time per sample and its share of one core at the stream's rate.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from imu_fusion import FILTERS, SensorFusion, imu_from_tilt
+from mpu_sim import ACCEL_NOISE, GYRO_BIAS, GYRO_NOISE, load_capture
+from wire_protocol import ACCEL_SENS, GYRO_SENS
+
+RAW_RATE = 500
+BOARD_RATE = 100
+BOARD_ALPHA = 0.98
+FRAME_RATE = 60
+WARMUP = 2.0
+STILL = 1.5
+
+
+def synthetic_motion(seconds, rate):
+    """Still for STILL seconds, then slow sweeps with quick flicks"""
+    t = np.arange(0.0, seconds, 1.0 / rate)
+    m = np.clip(t - STILL, 0.0, None)
+    pitch = 20 * np.sin(m * 1.3) + 12 * np.tanh(4 * np.sin(m * 2.3))
+    roll = 25 * np.sin(m * 0.7) + 10 * np.tanh(4 * np.sin(m * 3.1 + 1.0))
+    return t, pitch, roll
+
+
+def replay_motion(path, rate):
+    """The capture's tilt, held still for STILL seconds first (the board
+    calibrates at power-up, before anything is recorded)"""
+    capture = load_capture(path)
+    t = np.arange(0.0, float(capture['t'][-1]) + STILL, 1.0 / rate)
+    m = np.clip(t - STILL, 0.0, None)
+    return t, np.interp(m, capture['t'], capture['pitch']), np.interp(m, capture['t'], capture['roll'])
+
+
+def sensor_counts(t, pitch, roll, seed=0):
+    """Raw accelerometer and gyro counts, noise and bias as mpu_sim adds them"""
+    rng = np.random.default_rng(seed)
+    accel, gyro = imu_from_tilt(pitch, roll, np.gradient(pitch, t), np.gradient(roll, t))
+    accel = accel + rng.normal(0.0, ACCEL_NOISE, accel.shape)
+    gyro = gyro + np.asarray(GYRO_BIAS) + rng.normal(0.0, GYRO_NOISE, gyro.shape)
+    accel = np.clip(np.round(accel * ACCEL_SENS), -32768, 32767)
+    gyro = np.clip(np.round(gyro * GYRO_SENS), -32768, 32767)
+    return accel, gyro
+
+
+def board_filter(t, accel_counts, gyro_counts):
+    """game.ino at BOARD_RATE: (sample times, pitch, roll)"""
+    step = RAW_RATE // BOARD_RATE
+    accel = accel_counts[::step] / ACCEL_SENS
+    gyro = gyro_counts[::step] / GYRO_SENS
+    # calibrateGyro(): the mean of the still startup readings
+    gyro = gyro - gyro[:int(STILL * BOARD_RATE)].mean(axis=0)
+    ax, ay, az = accel.T
+    acc_roll = np.degrees(np.arctan2(ay, az))
+    acc_pitch = np.degrees(np.arctan2(-ax, np.hypot(ay, az)))
+    dt = 1.0 / BOARD_RATE
+    pitch = np.empty(len(accel))
+    roll = np.empty(len(accel))
+    p, r = acc_pitch[0], acc_roll[0]
+    for i in range(len(accel)):
+        r = BOARD_ALPHA * (r + gyro[i, 0] * dt) + (1 - BOARD_ALPHA) * acc_roll[i]
+        p = BOARD_ALPHA * (p + gyro[i, 1] * dt) + (1 - BOARD_ALPHA) * acc_pitch[i]
+        pitch[i], roll[i] = p, r
+    return t[::step], pitch, roll
+
+
+def host_filter(method, t, accel_counts, gyro_counts):
+    """One SensorFusion over the raw stream in per-frame batches"""
+    records = np.empty((len(t), 8))
+    records[:, 0:3] = accel_counts / ACCEL_SENS
+    records[:, 3:6] = gyro_counts / GYRO_SENS
+    records[:, 6] = 1.0 / RAW_RATE
+    records[:, 7] = np.arange(len(t)) & 0xFFFF
+    fusion = SensorFusion(method)
+    batch = RAW_RATE // FRAME_RATE
+    out = []
+    start = time.perf_counter()
+    for i in range(0, len(records), batch):
+        out.append(fusion.process(records[i:i + batch]))
+    seconds = time.perf_counter() - start
+    out = np.concatenate(out)
+    return out[:, 0], out[:, 1], seconds / len(t), fusion.bias.bias
+
+
+def score(sample_t, pitch, roll, t, true_pitch, true_roll, max_lag_ms=100):
+    """(RMS error, best-fit lag in ms) of a sample-and-hold output"""
+    grid = np.arange(WARMUP, t[-1] - max_lag_ms / 1000, 0.001)
+    held = np.searchsorted(sample_t, grid, side='right') - 1
+    est_p, est_r = pitch[held], roll[held]
+
+    def rms(lag):
+        shifted = grid - lag
+        err_p = est_p - np.interp(shifted, t, true_pitch)
+        err_r = est_r - np.interp(shifted, t, true_roll)
+        return float(np.sqrt(np.mean(err_p ** 2 + err_r ** 2) / 2))
+
+    lags = np.arange(0, max_lag_ms + 1) / 1000
+    errors = [rms(lag) for lag in lags]
+    return rms(0.0), float(lags[int(np.argmin(errors))] * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="host sensor fusion vs the board's filter")
+    parser.add_argument('--replay', help="capture file (mpu_sim.py record) to take the motion from")
+    parser.add_argument('--seconds', type=float, default=30.0, help="length of the synthetic motion")
+    args = parser.parse_args()
+
+    if args.replay:
+        t, pitch, roll = replay_motion(args.replay, RAW_RATE)
+        source = args.replay
+    else:
+        t, pitch, roll = synthetic_motion(args.seconds, RAW_RATE)
+        source = "synthetic motion"
+    accel, gyro = sensor_counts(t, pitch, roll)
+    print(f"{source}: {t[-1]:.1f} s, sensor read at {RAW_RATE} Hz, fused in {RAW_RATE // FRAME_RATE}-sample "
+          f"batches (one per {FRAME_RATE} Hz frame)")
+    print(f"{'filter':<26}{'rate':>7}{'error':>10}{'lag':>9}{'us/sample':>11}{'CPU':>8}{'bias error':>12}")
+
+    board_t, board_p, board_r = board_filter(t, accel, gyro)
+    err, lag = score(board_t, board_p, board_r, t, pitch, roll)
+    print(f"{'board complementary':<26}{BOARD_RATE:>5}Hz{err:>8.2f}°{lag:>7.0f}ms{'-':>11}{'-':>8}{'-':>12}")
+
+    for method in FILTERS:
+        est_p, est_r, per_sample, bias = host_filter(method, t, accel, gyro)
+        err, lag = score(t, est_p, est_r, t, pitch, roll)
+        cpu = per_sample * RAW_RATE * 100
+        bias_err = float(np.abs(bias - GYRO_BIAS).max())
+        print(f"{'host ' + method:<26}{RAW_RATE:>5}Hz{err:>8.2f}°{lag:>7.0f}ms{per_sample * 1e6:>11.1f}"
+              f"{cpu:>7.2f}%{bias_err:>9.2f}°/s")
+
+
+if __name__ == '__main__':
+    main()
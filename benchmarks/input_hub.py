@@ -0,0 +1,169 @@
+"""Many boards at once: InputHub vs one SerialReader thread per board.
+
+Run from the repository root (Linux/macOS):
+
+    python -m benchmarks.input_hub [--devices 1 4 16 32] [--seconds 5] [--rate 500]
+
+For each device count, starts that many mpu_sim pty boards streaming
+binary frames and connects to all of them, first through one InputHub
+(handshake included), then the way the game connects to a single board
+(a SensorConnector, then a SerialReader thread each). While the boards
+stream, a 60 Hz consumer drains every ring, like the game loop.
+
+Loss is per board: frames missing from its sequence numbers (the pty was
+full, or a frame was corrupt) plus ring overruns, over what the board
+produced. CPU is the reading threads' own CPU time (hub loop, or the sum
+of the reader threads), as a share of one core, and per sample; the
+boards' simulator threads are not counted.
+"""
+import argparse
+import time
+
+from input_hub import InputHub
+from mpu_sim import VirtualMPU
+from sensor_connector import SensorConnector
+from serial_reader import SerialReader
+
+FRAME_INTERVAL = 1 / 60
+
+
+def thread_cpu(thread):
+    """CPU seconds a running thread has used"""
+    return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+
+
+class HubRun:
+    """Every board on one InputHub"""
+    name = 'hub'
+
+    def __init__(self, ports):
+        self.hub = InputHub()
+        self.hub.start()
+        self.devices = [self.hub.open(port) for port in ports]
+
+    def ready(self):
+        return all(device.streaming for device in self.devices)
+
+    def rings(self):
+        return [device.ring for device in self.devices]
+
+    def decoders(self):
+        return [device.decoder for device in self.devices]
+
+    def cpu(self):
+        return thread_cpu(self.hub)
+
+    def stop(self):
+        self.hub.stop()
+
+
+class ThreadRun:
+    """A SensorConnector handshake, then a SerialReader thread, per board"""
+    name = 'thread per board'
+
+    def __init__(self, ports):
+        self.connectors = [SensorConnector(port) for port in ports]
+        for connector in self.connectors:
+            connector.start()
+        self.readers = [None] * len(ports)
+
+    def ready(self):
+        for i, connector in enumerate(self.connectors):
+            if self.readers[i] is None:
+                connection = connector.take()
+                if connection is not None:
+                    ser, decoder, _, records = connection
+                    self.readers[i] = SerialReader(ser, decoder=decoder)
+                    self.readers[i].start()
+        return all(self.readers)
+
+    def rings(self):
+        return [reader.ring for reader in self.readers]
+
+    def decoders(self):
+        return [reader.decoder for reader in self.readers]
+
+    def cpu(self):
+        return sum(thread_cpu(reader) for reader in self.readers)
+
+    def stop(self):
+        for connector in self.connectors:
+            connector.cancel()
+        for reader in self.readers:
+            if reader is not None:
+                reader.stop()
+                reader.ser.close()
+
+
+def measure(run_class, count, seconds, rate):
+    """(samples, loss per board, CPU seconds, connect seconds)"""
+    boards = [VirtualMPU(rate=rate, seed=i).start() for i in range(count)]
+    start = time.perf_counter()
+    run = run_class([board.port for board in boards])
+    try:
+        while not run.ready():
+            if time.perf_counter() - start > 30:
+                raise RuntimeError(f"{run.name}: boards did not all connect")
+            time.sleep(0.01)
+        connected = time.perf_counter() - start
+
+        # Settle, then count from here
+        time.sleep(0.5)
+        rings, decoders = run.rings(), run.decoders()
+        for ring in rings:
+            ring.read()
+        records = [decoder.records for decoder in decoders]
+        lost = [decoder.lost for decoder in decoders]
+        overruns = [ring.overruns for ring in rings]
+        cpu = run.cpu()
+
+        end = time.perf_counter() + seconds
+        samples = 0
+        while time.perf_counter() < end:
+            time.sleep(FRAME_INTERVAL)
+            samples += sum(len(ring.read()) for ring in rings)
+        cpu = run.cpu() - cpu
+        samples += sum(len(ring.read()) for ring in rings)
+
+        loss = []
+        for i, (decoder, ring) in enumerate(zip(decoders, rings)):
+            missing = decoder.lost - lost[i] + ring.overruns - overruns[i]
+            produced = decoder.records - records[i] + decoder.lost - lost[i]
+            loss.append(missing / max(produced, 1))
+    finally:
+        run.stop()
+        for board in boards:
+            board.stop()
+    return samples, loss, cpu, connected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InputHub vs a reader thread per board")
+    parser.add_argument('--devices', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--rate', type=float, default=500.0, help="samples per second per board")
+    args = parser.parse_args()
+
+    print(f"pty boards streaming binary frames at {args.rate:.0f} Hz, drained at 60 Hz for {args.seconds:.0f} s")
+    print(f"{'boards':>6}  {'reader':<17}{'connect':>8}{'samples/s':>11}{'CPU':>8}{'per board':>11}"
+          f"{'us/sample':>11}{'worst loss':>12}")
+    per_board = {}
+    for count in args.devices:
+        for run_class in (HubRun, ThreadRun):
+            samples, loss, cpu, connected = measure(run_class, count, args.seconds, args.rate)
+            share = cpu / args.seconds * 100
+            per_board.setdefault(run_class.name, []).append((count, share / count))
+            print(f"{count:>6}  {run_class.name:<17}{connected:>7.2f}s{samples / args.seconds:>11.0f}"
+                  f"{share:>7.1f}%{share / count:>10.2f}%{cpu / max(samples, 1) * 1e6:>11.1f}"
+                  f"{max(loss) * 100:>11.2f}%")
+            print(f"{'':>8}loss per board (%): " + " ".join(f"{x * 100:.2f}" for x in loss))
+
+    for name, points in per_board.items():
+        (n0, c0), (n1, c1) = points[0], points[-1]
+        if n1 > n0:
+            print(f"{name}: CPU per board {c0:.2f}% at {n0} -> {c1:.2f}% at {n1} "
+                  f"({'sub-linear' if c1 < c0 else 'linear or worse'} overall)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Sensor-to-display latency of the real game loop against a pty board.
+
+Run from the repository root (Linux/macOS):
+
+    python -m benchmarks.latency [--seconds 3]
+
+Runs Game.run() with --trace-latency for each wire format the board can
+use (binary frames, CSV, CSV with the CSV_SEQUENCE counter), each in a
+fresh process under SDL's dummy drivers, and prints the traced
+percentiles. Under the dummy driver "presented" is when display.update
+returns; a real display adds its own scan-out delay on top.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+MODES = {
+    'binary': {},
+    'csv': {'binary_capable': False},
+    'csv+seq': {'binary_capable': False, 'csv_seq': True},
+}
+
+
+def run_mode(mode, seconds, path):
+    """Runs in the child process"""
+    import numpy as np
+    import pygame
+
+    from game import Game
+    from mpu_sim import VirtualMPU
+
+    device = VirtualMPU(rate=200, **MODES[mode]).start()
+
+    class TimedGame(Game):
+        def draw(self, alpha=1.0):
+            super().draw(alpha)
+            if self.mpu_initialized and not hasattr(self, 'attached_at'):
+                self.attached_at = time.perf_counter()
+            if hasattr(self, 'attached_at') and time.perf_counter() - self.attached_at > seconds:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    game = TimedGame(port=device.port, trace_latency=path)
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    device.stop()
+    rows = np.load(os.path.splitext(path)[0] + '.npy')
+    print(json.dumps({'with_seq': int(np.isfinite(rows['seq']).sum()), 'rows': len(rows)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sensor-to-display latency per wire format")
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp()
+    print(f"{'mode':<9}{'stage':<21}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for mode in MODES:
+        path = os.path.join(out_dir, f'{mode}.json')
+        out = subprocess.run([sys.executable, '-m', 'benchmarks.latency', '--child', mode, str(args.seconds), path],
+                             capture_output=True, text=True, check=True).stdout
+        counts = json.loads(out.strip().splitlines()[-1])
+        with open(path) as f:
+            report = json.load(f)
+        for stage, stats in report['percentiles_ms'].items():
+            print(f"{mode:<9}{stage:<21}" + ''.join(f"{stats[k]:>6.1f} ms" for k in ('p50', 'p95', 'p99', 'max')))
+        print(f"{'':<9}{report['traced_frames']} frames traced, {report['samples']} samples, "
+              f"{counts['with_seq']}/{counts['rows']} frames carry a board sequence number")
+    print(f"reports in {out_dir}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_mode(sys.argv[2], float(sys.argv[3]), sys.argv[4])
+    else:
+        main()
@@ -0,0 +1,150 @@
+"""Frame pacing: deadline sleep-and-spin vs pygame's Clock.tick, and quality scaling.
+
+Run from the repository root:
+
+    python -m benchmarks.pacing [--seconds 6] [--overload-seconds 21] [--heavy-enemies 6000] [--extra-ms 8]
+
+Each run drives the real Game.run() loop (dummy drivers, keyboard input,
+in a child process) and reads its FramePacer stats:
+
+- steady: a light scene with both pacing modes; compares how evenly frames
+  come out (interval std, p99, max) and how many missed their deadline.
+- overload: a scene heavy to draw (enemies parked all over the screen, and
+  particle bursts), with extra per-frame work (a stand-in for a slower
+  machine) during the middle third of the run.
+  With quality scaling the game steps HUD refresh, effects and enemy
+  detail down while the load lasts and back up afterwards; without it
+  every frame stays late. Printed per second: quality level, frame load
+  and frames per second.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+SCENARIOS = ('steady', 'overload')
+
+
+def run_child(scenario, pacing, seconds, enemies, scaling, extra_ms):
+    """Runs in the child process; prints the stats as JSON"""
+    import os
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import numpy as np
+    import pygame
+
+    from frame_pacer import QualityGovernor
+    from game import QUALITY_LEVELS, SCREEN_HEIGHT, SCREEN_WIDTH, Game
+
+    class PacedGame(Game):
+        def __init__(self):
+            super().__init__(connect_sensor=False, enemy_count=enemies, seed=1, pacing=pacing)
+            if not scaling:
+                self.quality = QualityGovernor(QUALITY_LEVELS[:1])
+            self.started = None
+            self.timeline = []      # (seconds, quality level, load) per frame
+            if scenario == 'overload':
+                rng = np.random.default_rng(1)
+                swarm = self.enemies
+                swarm.x[:] = swarm.prev_x[:] = rng.uniform(0, SCREEN_WIDTH, enemies)
+                swarm.y[:] = swarm.prev_y[:] = rng.uniform(0, SCREEN_HEIGHT, enemies)
+                swarm.speed[:] = 0
+                swarm.separation = 0
+
+        def update(self):
+            # Keep the round going through collisions
+            super().update()
+            self.game_over = False
+
+        def effect(self, name, x, y, **params):
+            # Not one explosion per enemy touching the player every tick
+            if name != 'collision':
+                super().effect(name, x, y, **params)
+
+        def draw(self, alpha=1.0):
+            now = time.perf_counter()
+            if self.started is None:
+                self.started = now
+            elapsed = now - self.started
+            if scenario == 'overload':
+                self.effect('score', SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+                if seconds / 3 <= elapsed < 2 * seconds / 3:
+                    end = now + extra_ms / 1000
+                    while time.perf_counter() < end:
+                        pass
+            super().draw(alpha)
+            self.timeline.append((elapsed, self.quality.level, self.pacer.load))
+            if elapsed > seconds:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+        def announce_game_over(self):
+            pass
+
+        def handle_input(self):
+            t = time.perf_counter()
+            self.move_dx, self.move_dy = np.cos(t), np.sin(t)
+
+    game = PacedGame()
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    timeline = np.array(game.timeline)
+    per_second = []
+    for second in range(int(seconds)):
+        rows = timeline[(timeline[:, 0] >= second) & (timeline[:, 0] < second + 1)]
+        per_second.append((int(rows[:, 1].max()), float(rows[:, 2].mean()), len(rows)))
+    print(json.dumps({'stats': game.pacer.stats(), 'per_second': per_second, 'changes': game.quality.changes}))
+
+
+def run(scenario, pacing, args, scaling=True):
+    if scenario == 'steady':
+        seconds, enemies = args.seconds, args.enemies
+    else:
+        seconds, enemies = args.overload_seconds, args.heavy_enemies
+    out = subprocess.run([sys.executable, '-m', 'benchmarks.pacing', '--child', scenario, pacing,
+                          str(seconds), str(enemies), str(int(scaling)), str(args.extra_ms)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="frame pacing and quality scaling of the real game loop")
+    parser.add_argument('--seconds', type=float, default=6.0, help="length of each steady run")
+    parser.add_argument('--overload-seconds', type=float, default=21.0, help="length of each overload run")
+    parser.add_argument('--enemies', type=int, default=100, help="enemies in the steady scene")
+    parser.add_argument('--heavy-enemies', type=int, default=6000, help="enemies in the overload scene")
+    parser.add_argument('--extra-ms', type=float, default=8.0, help="extra work per frame in the overload")
+    args = parser.parse_args()
+
+    print(f"steady: {args.enemies} enemies for {args.seconds:.0f} s")
+    print(f"{'pacing':<10}{'fps':>7}{'mean':>9}{'std':>9}{'p99':>9}{'max':>9}{'late':>6}{'work':>9}")
+    for pacing in ('clock', 'deadline'):
+        stats = run('steady', pacing, args)['stats']
+        interval = stats['interval_ms']
+        print(f"{pacing:<10}{stats['fps']:>7.1f}{interval['mean']:>7.2f}ms{interval['std']:>7.2f}ms"
+              f"{interval['p99']:>7.2f}ms{interval['max']:>7.2f}ms{stats['late']:>6}"
+              f"{stats['work_ms']['mean']:>7.2f}ms")
+
+    print(f"\noverload: {args.heavy_enemies} enemies and particle bursts, +{args.extra_ms:.0f} ms per frame "
+          f"from {args.overload_seconds / 3:.0f} to {2 * args.overload_seconds / 3:.0f} s (deadline pacing)")
+    for scaling in (False, True):
+        result = run('overload', 'deadline', args, scaling)
+        stats = result['stats']
+        print(f"quality scaling {'on' if scaling else 'off'}: {stats['fps']:.1f} fps, "
+              f"interval p50 {stats['interval_ms']['p50']:.1f} ms p99 {stats['interval_ms']['p99']:.1f} ms, "
+              f"{stats['late']} late of {stats['frames']}, {result['changes']} level changes")
+        print("   second   " + "".join(f"{s:>6}" for s in range(len(result['per_second']))))
+        print("   level    " + "".join(f"{level:>6}" for level, _, _ in result['per_second']))
+        print("   load     " + "".join(f"{load:>5.0%} " for _, load, _ in result['per_second']))
+        print("   frames   " + "".join(f"{frames:>6}" for _, _, frames in result['per_second']))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        scenario, pacing, seconds, enemies, scaling, extra_ms = sys.argv[2:8]
+        run_child(scenario, pacing, float(seconds), int(enemies), scaling == '1', float(extra_ms))
+    else:
+        main()
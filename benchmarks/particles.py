@@ -0,0 +1,145 @@
+"""Particle effects: ParticleSystem arrays vs one Python object per particle.
+
+Run from the repository root:
+
+    python -m benchmarks.particles [--counts 1000 10000 50000 100000] [--frames 120]
+
+Keeps the given number of particles alive (an explosion every tick tops
+up the ones that expire) and times one simulation update plus drawing
+them onto the 800x600 display, against one RENDER_FPS frame. The object
+version is a Particle class with the same motion, fading and 2x2 square
+per particle, drawn with Surface.fill. Exits with status 1 if the arrays
+miss the frame budget at 50k particles.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from game import RENDER_FPS, SCREEN_HEIGHT, SCREEN_WIDTH
+from particles import ParticleSystem
+
+FRAME_MS = 1000 / RENDER_FPS
+LIFE = 60
+BUDGET_COUNT = 50000
+
+
+class Particle:
+    """Per-object reference with ParticleSystem's motion and look"""
+
+    def __init__(self, x, y, color, speed, life):
+        direction = random.uniform(0, 2 * math.pi)
+        velocity = speed * math.sqrt(random.random())
+        self.x, self.y = x, y
+        self.vx, self.vy = math.cos(direction) * velocity, math.sin(direction) * velocity
+        self.life = self.lifetime = life * random.uniform(0.5, 1.0)
+        self.color = color
+
+    def update(self, drag):
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= drag
+        self.vy *= drag
+        self.life -= 1
+        return self.life > 0
+
+    def draw(self, surface, alpha):
+        x = int(self.x + self.vx * alpha)
+        y = int(self.y + self.vy * alpha)
+        if 0 <= x <= SCREEN_WIDTH - 2 and 0 <= y <= SCREEN_HEIGHT - 2:
+            fade = self.life / self.lifetime
+            surface.fill([int(c * fade) for c in self.color], (x, y, 2, 2))
+
+
+class ObjectParticles:
+    """A list of Particle objects, rebuilt each tick without the expired ones"""
+
+    def __init__(self, capacity, drag=0.94):
+        self.capacity = capacity
+        self.drag = drag
+        self.particles = []
+
+    def __len__(self):
+        return len(self.particles)
+
+    def emit(self, x, y, count, color, speed, life):
+        room = self.capacity - len(self.particles)
+        self.particles += [Particle(x, y, color, speed, life) for _ in range(min(count, room))]
+
+    def update(self):
+        drag = self.drag
+        self.particles = [p for p in self.particles if p.update(drag)]
+
+    def draw(self, surface, alpha):
+        for p in self.particles:
+            p.draw(surface, alpha)
+
+
+def measure(system, count, frames, screen):
+    """Median (update, draw) milliseconds with about count particles alive"""
+    # Bursts of count/LIFE every tick keep about count alive once the first ones expire
+    per_tick = max(1, int(count / (LIFE * 0.75)))
+    center = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+
+    def tick():
+        system.emit(*center, per_tick, (255, 165, 0), speed=12.0, life=LIFE)
+        system.update()
+
+    for _ in range(LIFE * 2):
+        tick()
+    updates, draws, alive = [], [], []
+    for _ in range(frames):
+        start = time.perf_counter_ns()
+        tick()
+        updates.append(time.perf_counter_ns() - start)
+        screen.fill((0, 0, 0))
+        start = time.perf_counter_ns()
+        system.draw(screen, 0.5)
+        draws.append(time.perf_counter_ns() - start)
+        alive.append(len(system))
+    return np.median(updates) / 1e6, np.median(draws) / 1e6, int(np.mean(alive))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="particle update and draw cost")
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 50000, 100000])
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--object-limit', type=int, default=50000,
+                        help="skip the per-object version above this many particles")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    random.seed(0)
+    print(f"particles kept alive on {SCREEN_WIDTH}x{SCREEN_HEIGHT}, frame budget {FRAME_MS:.1f} ms")
+    print(f"{'particles':>10}  {'version':<8}{'alive':>8}{'update':>10}{'draw':>10}{'total':>10}{'frame':>8}")
+    within = True
+    for count in args.counts:
+        capacity = 1 << max(count - 1, 1).bit_length()
+        versions = [('arrays', ParticleSystem(capacity, rng=np.random.default_rng(0)))]
+        if count <= args.object_limit:
+            versions.append(('objects', ObjectParticles(capacity)))
+        for name, system in versions:
+            frames = args.frames if name == 'arrays' else max(5, args.frames * 1000 // count)
+            update_ms, draw_ms, alive = measure(system, count, frames, screen)
+            total = update_ms + draw_ms
+            print(f"{count:>10}  {name:<8}{alive:>8}{update_ms:>8.2f}ms{draw_ms:>8.2f}ms{total:>8.2f}ms"
+                  f"{total / FRAME_MS * 100:>7.0f}%")
+            if name == 'arrays' and count == BUDGET_COUNT and total > FRAME_MS:
+                within = False
+    pygame.quit()
+    if not within:
+        print(f"FAIL: {BUDGET_COUNT} particles take more than one frame")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
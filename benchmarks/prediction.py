@@ -0,0 +1,131 @@
+"""Perceived tilt latency with and without the input predictor.
+
+Run from the repository root:
+
+    python -m benchmarks.prediction [--replay session.mpucap] [--seconds 30]
+
+Replays a motion (a recorded capture or a synthetic one with quick
+flicks) through a model of the input path: the board samples it at its
+CSV (100 Hz) or binary (500 Hz) rate with a little noise, each sample
+reaches the SerialReader after the link's transport delay and the
+reader's polling, and a 60 Hz game loop reads everything buffered at the
+start of each frame and presents the frame a few milliseconds later.
+
+For each way of turning the frame's samples into a tilt, it compares the
+tilt each presented frame acts on with the true tilt at that moment.
+Lag is the delay that best lines the two up (the perceived latency),
+error the RMS difference at zero delay, and residual what remains once
+the lag is taken out (noise and overshoot).
+"""
+import argparse
+
+import numpy as np
+
+from mpu_sim import load_capture
+from tilt_input import TiltInput, TiltPredictor
+
+FRAME_RATE = 60
+TRANSPORT = 0.0015      # serial + USB, board to reader
+POLL = 0.001            # reader wake-up granularity
+PRESENT = 0.004         # frame start to display update
+NOISE = 0.05            # degrees, fused sample noise
+
+
+def synthetic_motion(seconds, rate=1000):
+    t = np.arange(0.0, seconds, 1.0 / rate)
+    pitch = 20 * np.sin(t * 1.3) + 12 * np.tanh(4 * np.sin(t * 2.3))
+    roll = 25 * np.sin(t * 0.7) + 10 * np.tanh(4 * np.sin(t * 3.1 + 1.0))
+    return t, pitch, roll
+
+
+def stream(t, pitch, roll, rate, seed=0):
+    """Board samples (time, pitch, roll) and the reader's arrival stamps"""
+    rng = np.random.default_rng(seed)
+    sample_t = np.arange(t[0], t[-1], 1.0 / rate)
+    p = np.interp(sample_t, t, pitch) + rng.normal(0.0, NOISE, len(sample_t))
+    r = np.interp(sample_t, t, roll) + rng.normal(0.0, NOISE, len(sample_t))
+    # The reader wakes on a POLL grid after the bytes are in
+    arrival = np.ceil((sample_t + TRANSPORT + rng.uniform(0, POLL / 2, len(sample_t))) / POLL) * POLL
+    return sample_t, p, r, arrival
+
+
+def play(tilt, rows, duration, seed=1):
+    """(present times, tilt acted on) for a 60 Hz loop reading the rows"""
+    rng = np.random.default_rng(seed)
+    frames = np.arange(rng.uniform(0, 1 / FRAME_RATE), duration, 1 / FRAME_RATE)
+    ends = np.searchsorted(rows[:, 0], frames, side='right')
+    out = np.empty((len(frames), 2))
+    start = 0
+    for i, (now, end) in enumerate(zip(frames, ends)):
+        out[i] = tilt.read(rows[start:end], now)
+        start = end
+        tilt.presented(now + PRESENT)
+    return frames + PRESENT, out
+
+
+def score(shown_t, shown, t, pitch, roll, warmup=2.0, max_lag_ms=100):
+    """(error, lag ms, residual) of the shown tilt against the truth"""
+    keep = shown_t > warmup
+    shown_t, shown = shown_t[keep], shown[keep]
+
+    def rms(lag):
+        err_p = shown[:, 0] - np.interp(shown_t - lag, t, pitch)
+        err_r = shown[:, 1] - np.interp(shown_t - lag, t, roll)
+        return float(np.sqrt(np.mean(err_p ** 2 + err_r ** 2) / 2))
+
+    lags = np.arange(0, max_lag_ms + 1) / 1000
+    errors = np.array([rms(lag) for lag in lags])
+    best = int(np.argmin(errors))
+    return errors[0], lags[best] * 1000, errors[best]
+
+
+class NewestSample(TiltInput):
+    """The newest sample as is"""
+
+    def read(self, samples, now):
+        if len(samples):
+            self.pitch, self.roll = samples[-1, 1], samples[-1, 2]
+        return self.pitch, self.roll
+
+
+def methods():
+    return [
+        ("frame mean (before)", lambda: TiltInput()),
+        ("newest sample", lambda: NewestSample()),
+        ("kalman, no prediction", lambda: TiltInput(TiltPredictor(max_horizon=0.0))),
+        ("kalman + prediction", lambda: TiltInput(TiltPredictor())),
+        ("  process noise 5e3", lambda: TiltInput(TiltPredictor(process_noise=5e3))),
+        ("  process noise 1e5", lambda: TiltInput(TiltPredictor(process_noise=1e5))),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="perceived tilt latency with the input predictor")
+    parser.add_argument('--replay', help="capture file (mpu_sim.py record) to take the motion from")
+    parser.add_argument('--seconds', type=float, default=30.0, help="length of the synthetic motion")
+    args = parser.parse_args()
+
+    if args.replay:
+        capture = load_capture(args.replay)
+        t = np.arange(0.0, float(capture['t'][-1]), 0.001)
+        pitch = np.interp(t, capture['t'], capture['pitch'])
+        roll = np.interp(t, capture['t'], capture['roll'])
+        source = args.replay
+    else:
+        t, pitch, roll = synthetic_motion(args.seconds)
+        source = "synthetic motion"
+    print(f"{source}: {t[-1]:.1f} s at {FRAME_RATE} fps, frames presented {PRESENT * 1000:.0f} ms after "
+          f"their input is read, {TRANSPORT * 1000:.1f} ms transport")
+
+    for name, rate in (('CSV', 100), ('binary', 500)):
+        sample_t, p, r, arrival = stream(t, pitch, roll, rate)
+        rows = np.column_stack((arrival, p, r))
+        print(f"\n{name} board, {rate} Hz{'':<14}{'error':>9}{'lag':>9}{'residual':>10}")
+        for label, make in methods():
+            shown_t, shown = play(make(), rows, t[-1])
+            err, lag, residual = score(shown_t, shown, t, pitch, roll)
+            print(f"{label:<30}{err:>8.2f}°{lag:>7.0f}ms{residual:>9.2f}°")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Cost of the frame profiler, and where the real loop's frames go.
+
+Run from the repository root:
+
+    python -m benchmarks.profiler [--enemies 200] [--frames 240]
+
+Measures, per frame of a game loop:
+
+- the profiler hooks when no profiler is attached (``is not None`` tests)
+  vs begin_frame/six laps/end_frame when one is
+- the call counter wrapped around EnemySwarm.update, per call
+- drawing the F3 overlay
+
+then runs the real Game.run() loop (dummy drivers, keyboard input, a new
+round whenever one ends) with --profile, showing the overlay for the
+second half, and prints the mean time of each phase from the dump.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from enemy_swarm import EnemySwarm
+from frame_profiler import PHASES, FrameProfiler, ProfilerOverlay
+from game import Game
+
+REPEATS = 100_000
+
+
+def hooks_per_frame(profiler):
+    """Seconds per frame spent in the loop's profiler hooks"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        if profiler is not None:
+            profiler.begin_frame()
+        for phase in range(len(PHASES)):
+            if profiler is not None:
+                profiler.lap(phase)
+        if profiler is not None:
+            profiler.end_frame()
+    return (time.perf_counter() - start) / REPEATS
+
+
+def swarm_update(swarm, calls=20_000):
+    start = time.perf_counter()
+    for _ in range(calls):
+        swarm.update(400.0, 300.0)
+    return (time.perf_counter() - start) / calls
+
+
+def overlay_per_frame(profiler, frames=300):
+    screen = pygame.display.set_mode((800, 600))
+    overlay = ProfilerOverlay(pygame.font.Font(None, 24))
+    start = time.perf_counter()
+    for _ in range(frames):
+        overlay.draw(screen, profiler)
+    return (time.perf_counter() - start) / frames
+
+
+def real_loop(enemies, frames, path):
+    drawn = 0
+
+    class ScriptedGame(Game):
+        def draw(self, alpha=1.0):
+            nonlocal drawn
+            super().draw(alpha)
+            drawn += 1
+            if self.game_over:
+                # Keep both halves in play mode
+                self.restart()
+            if drawn == frames // 2:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+            elif drawn >= frames:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    game = ScriptedGame(connect_sensor=False, enemy_count=enemies, profile=path)
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    return np.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="frame profiler overhead and phase breakdown")
+    parser.add_argument('--enemies', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=240)
+    args = parser.parse_args()
+
+    off = hooks_per_frame(None)
+    on = hooks_per_frame(FrameProfiler())
+    print(f"loop hooks per frame: disabled {off * 1e6:.2f} us, enabled {on * 1e6:.2f} us "
+          f"({on / (1 / 60) * 100:.3f}% of a 60 Hz frame)")
+
+    swarm = EnemySwarm(args.enemies, 800, 600, 15, 2, rng=np.random.default_rng(0))
+    plain = swarm_update(swarm)
+    counting = FrameProfiler()
+    counting.instrument([(EnemySwarm, 'update')])
+    counted = swarm_update(swarm)
+    counting.uninstrument()
+    print(f"EnemySwarm.update ({args.enemies} enemies): {plain * 1e6:.1f} us, "
+          f"counted {counted * 1e6:.1f} us (+{(counted - plain) * 1e6:.2f} us per call)")
+
+    filled = FrameProfiler()
+    for _ in range(1000):
+        filled.begin_frame()
+        for phase in range(len(PHASES)):
+            filled.lap(phase)
+        filled.end_frame()
+    print(f"F3 overlay: {overlay_per_frame(filled) * 1000:.2f} ms per frame")
+
+    path = os.path.join(tempfile.mkdtemp(), 'profile.npz')
+    dump = real_loop(args.enemies, args.frames, path)
+    frames = dump['frames']
+    ms = frames.view(np.int64).reshape(len(frames), -1)[:, 1:] / 1e6
+    half = len(ms) // 2
+    print(f"\nreal loop, {args.enemies} enemies, {len(ms)} frames (mean ms per frame)")
+    print(f"{'phase':<10}{'no overlay':>12}{'overlay':>10}")
+    for i, name in enumerate(PHASES):
+        print(f"{name:<10}{ms[:half, i].mean():>12.3f}{ms[half:, i].mean():>10.3f}")
+    print(f"{'total':<10}{ms[:half].sum(axis=1).mean():>12.3f}{ms[half:].sum(axis=1).mean():>10.3f}")
+    for name, count in zip(dump['call_names'], dump['call_counts']):
+        print(f"calls {name}: {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Game recordings: snapshot cost, recording size and seek time.
+
+Run from the repository root:
+
+    python -m benchmarks.recording [--enemies 5 100 1000 10000 100000] [--ticks 600 6000 60000]
+
+Snapshot and restore are timed per enemy count against one RENDER_FPS
+frame, since the recorder takes a snapshot every keyframe interval in the
+middle of the game loop. Then headless games with a seeded recorder run
+for each length; the recording is re-simulated start to end (it must be
+identical) and sought to random ticks, which should cost about the same
+however long the recording is.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from headless import HeadlessGame
+from game import RENDER_FPS
+from recording import Recording, Replay
+
+FRAME_MS = 1000 / RENDER_FPS
+
+
+def timed(fn, repeat):
+    """Median milliseconds of fn()"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        times.append(time.perf_counter_ns() - start)
+    return np.median(times) / 1e6
+
+
+def record(path, ticks, enemy_count):
+    """A seeded headless run of ticks steps, restarting after each collision"""
+    game = HeadlessGame(enemy_count=enemy_count, seed=1, record=path)
+    for _ in range(ticks):
+        game.tick()
+        if game.game_over:
+            game.restart()
+    game.recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="recording snapshot, size and seek costs")
+    parser.add_argument('--enemies', type=int, nargs='+', default=[5, 100, 1000, 10000, 100000])
+    parser.add_argument('--ticks', type=int, nargs='+', default=[600, 6000, 60000])
+    parser.add_argument('--recorded-enemies', type=int, default=100, help="enemy count of the recorded runs")
+    parser.add_argument('--seeks', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"snapshot / restore (frame budget {FRAME_MS:.1f} ms)")
+    print(f"{'enemies':>8}{'snapshot':>11}{'to bytes':>11}{'restore':>11}{'keyframe':>11}")
+    for count in args.enemies:
+        game = HeadlessGame(enemy_count=count, seed=1)
+        snapshot = game.snapshot()
+        size = len(snapshot.to_bytes())
+        snap_ms = timed(game.snapshot, 20)
+        bytes_ms = timed(snapshot.to_bytes, 20)
+        restore_ms = timed(lambda: game.restore(snapshot), 20)
+        print(f"{count:>8}{snap_ms:>9.3f}ms{bytes_ms:>9.3f}ms{restore_ms:>9.3f}ms{size / 1024:>8.1f}KiB"
+              + ("" if snap_ms + bytes_ms < FRAME_MS else "  over budget"))
+
+    print(f"\nrecordings of {args.recorded_enemies} enemies")
+    print(f"{'ticks':>8}{'bytes/tick':>12}{'re-sim':>14}{'identical':>11}{'seek p50':>10}{'seek max':>10}")
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for ticks in args.ticks:
+            path = os.path.join(directory, f'{ticks}.mpurec')
+            record(path, ticks, args.recorded_enemies)
+            recording = Recording(path)
+
+            replay = Replay(path)
+            start = time.perf_counter()
+            replay.seek(recording.first_tick)
+            mismatch = replay.run()
+            rate = len(recording) / (time.perf_counter() - start)
+
+            seeks = []
+            for tick in rng.integers(recording.first_tick, recording.end_tick + 1, args.seeks).tolist():
+                start = time.perf_counter_ns()
+                replay.seek(tick)
+                seeks.append((time.perf_counter_ns() - start) / 1e6)
+            print(f"{ticks:>8}{os.path.getsize(path) / ticks:>12.0f}{rate:>9.0f}/s"
+                  f"{'yes' if mismatch is None else f'tick {mismatch}':>11}"
+                  f"{np.median(seeks):>8.2f}ms{max(seeks):>8.2f}ms")
+            recording = replay = None
+
+
+if __name__ == '__main__':
+    main()
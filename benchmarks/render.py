@@ -0,0 +1,81 @@
+"""Frame time: full redraw (fill + font.render + flip) vs the dirty-rect renderer.
+
+Run from the repository root:
+
+    python -m benchmarks.render
+
+Under SDL's dummy video driver display.flip/update cost almost nothing, so
+this measures the drawing work only; on a real display the dirty-rect path
+also avoids presenting the whole 800x600 frame.
+"""
+import time
+
+import numpy as np
+import pygame
+
+from headless import HeadlessGame, ScriptedInput
+from game import BLACK, GREEN, RED, SCREEN_WIDTH, YELLOW
+
+
+def object_circles(game, alpha):
+    """(color, center, radius) per draw.circle call, as Player/Enemy.draw made them"""
+    yield from game.player.circles(alpha)
+    enemy_x, enemy_y = game.enemies.interpolate(alpha)
+    for x, y, size in zip(enemy_x, enemy_y, game.enemies.size):
+        yield RED, (int(x), int(y)), int(size)
+
+
+def full_redraw(game, alpha):
+    """The original Game.draw: clear, draw, render every string, flip"""
+    screen = game.screen
+    screen.fill(BLACK)
+    for color, center, radius in object_circles(game, alpha):
+        pygame.draw.circle(screen, color, center, radius)
+    screen.blit(game.font.render(f"Score: {game.score}", True, GREEN), (10, 10))
+    screen.blit(game.font.render(
+        f"Pitch: {game.current_pitch:5.1f}° Roll: {game.current_roll:5.1f}°", True, YELLOW), (10, 50))
+    screen.blit(game.font.render("Control: ⌨️ Keyboard (MPU failed)", True, RED), (10, 90))
+    screen.blit(game.font.render("🔊 Using arrow keys to move", True, YELLOW), (SCREEN_WIDTH - 400, 10))
+    pygame.display.flip()
+
+
+def frame_times(game, draw, frames):
+    times = np.empty(frames)
+    for i in range(frames):
+        game.run_ticks(1)
+        start = time.perf_counter()
+        draw(0.5)
+        times[i] = time.perf_counter() - start
+    return times * 1000
+
+
+def check_identical(enemy_count, frames=120):
+    """The dirty-rect path must leave exactly the full redraw's pixels"""
+    game = HeadlessGame(enemy_count, inputs=ScriptedInput('circle'))
+    mismatches = 0
+    for _ in range(frames):
+        game.run_ticks(1)
+        game.draw(0.5)
+        fast = pygame.surfarray.array3d(game.screen)
+        full_redraw(game, 0.5)
+        mismatches += not np.array_equal(fast, pygame.surfarray.array3d(game.screen))
+    return mismatches
+
+
+def main(counts=(5, 100, 1_000), frames=600):
+    for count in counts[:2]:
+        print(f"pixel check at {count} enemies: {check_identical(count)} mismatched frames")
+    print(f"{'enemies':>8}{'full redraw':>16}{'dirty rects':>16}{'speed-up':>10}")
+    for count in counts:
+        game = HeadlessGame(count, inputs=ScriptedInput('circle'))
+        full = frame_times(game, lambda a: full_redraw(game, a), frames)
+        game = HeadlessGame(count, inputs=ScriptedInput('circle'))
+        dirty = frame_times(game, game.draw, frames)
+        print(f"{count:>8}{np.median(full):>13.3f} ms{np.median(dirty):>13.3f} ms"
+              f"{np.median(full) / np.median(dirty):>9.1f}x")
+    print(f"text cache: {game.text_cache.hits} hits, {game.text_cache.misses} misses; "
+          f"{game.renderer.full_frames}/{game.renderer.frames} frames fell back to a full redraw")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""One board, many local readers: sensor_hub.py fan-out.
+
+Run from the repository root:
+
+    python -m benchmarks.shared_ring [--readers 0 1 4 16] [--seconds 5] [--rate 500]
+
+Starts an mpu_sim pty board streaming binary frames and a sensor_hub.py
+process sharing it, then for each reader count starts that many reader
+processes. Each one drains the shared ring at 60 Hz like the game, with
+read() (a copy) or read_views() (zero-copy NumPy views).
+
+Hub CPU is the hub process's CPU time over the run, from its heartbeat; it
+should not move with the reader count. Missed counts samples absent from
+a reader's sequence numbers: lost between board and hub, overwritten
+before it read them, or torn under its views. Age is how old the newest
+sample was when a frame read it; read is the time of one read() or
+read_views() call.
+"""
+import argparse
+import multiprocessing
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from mpu_sim import VirtualMPU
+from sensor_hub import HubClient
+
+FRAME_INTERVAL = 1 / 60
+
+
+def reader(name, seconds, views, barrier, results):
+    """Runs in a reader process"""
+    client = HubClient(name)
+    ring = client.ring
+    barrier.wait()
+    # Count from the common start only
+    ring.read()
+    samples = missed = 0
+    last_seq = None
+    ages, reads = [], []
+    cpu = time.process_time()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        time.sleep(FRAME_INTERVAL)
+        start = time.perf_counter_ns()
+        parts = ring.read_views() if views else [ring.read()]
+        reads.append(time.perf_counter_ns() - start)
+        newest = None
+        for rows in parts:
+            if len(rows) == 0:
+                continue
+            seq = rows[:, 3].astype(np.int64)
+            if last_seq is not None:
+                missed += int((seq[0] - last_seq - 1) % 65536)
+            missed += int(((np.diff(seq) - 1) % 65536).sum())
+            last_seq = int(seq[-1])
+            samples += len(rows)
+            newest = rows[-1, 0]
+        if newest is not None:
+            ages.append(time.perf_counter() - newest)
+        if views:
+            torn = ring.torn()
+            samples -= torn
+            missed += torn
+    cpu = time.process_time() - cpu
+    # Views into the block must go before it can be closed
+    parts = rows = None
+    client.close()
+    results.put((samples, missed, ring.overruns, np.median(reads) / 1000, np.percentile(ages, 50) * 1000,
+                 np.percentile(ages, 99) * 1000, cpu))
+
+
+def fan_out(name, count, views, seconds):
+    """(hub CPU seconds, reader results) with count readers for seconds"""
+    context = multiprocessing.get_context()
+    barrier = context.Barrier(count + 1)
+    results = context.Queue()
+    procs = [context.Process(target=reader, args=(name, seconds, views, barrier, results)) for _ in range(count)]
+    for proc in procs:
+        proc.start()
+    client = HubClient(name)
+    barrier.wait()
+    cpu = client.ring.status()['cpu']
+    time.sleep(seconds)
+    # The hub publishes CPU time with each heartbeat
+    time.sleep(0.15)
+    cpu = client.ring.status()['cpu'] - cpu
+    client.close()
+    out = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return cpu, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sensor hub fan-out to local reader processes")
+    parser.add_argument('--readers', type=int, nargs='+', default=[0, 1, 4, 16])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--rate', type=float, default=500.0, help="board samples per second")
+    args = parser.parse_args()
+
+    name = f"mpu-bench-{int(time.time())}"
+    board = VirtualMPU(rate=args.rate).start()
+    hub = subprocess.Popen([sys.executable, 'sensor_hub.py', '--port', board.port, '--name', name],
+                           stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                client = HubClient(name)
+            except FileNotFoundError:
+                client = None
+            if client is not None and client.streaming:
+                client.close()
+                break
+            if client is not None:
+                client.close()
+            if time.monotonic() > deadline:
+                raise SystemExit("sensor hub did not start streaming")
+            time.sleep(0.1)
+
+        print(f"binary board at {args.rate:.0f} Hz shared by sensor_hub.py, readers draining at 60 Hz "
+              f"for {args.seconds:.0f} s")
+        print(f"{'readers':>7}  {'read':<6}{'hub CPU':>9}{'samples/s':>11}{'missed':>8}{'read us':>9}"
+              f"{'age p50':>9}{'age p99':>9}{'reader CPU':>12}")
+        for count in args.readers:
+            for views in ((False, True) if count else (False,)):
+                cpu, out = fan_out(name, count, views, args.seconds)
+                row = f"{count:>7}  {'views' if views else 'copy':<6}{cpu / args.seconds * 100:>8.1f}%"
+                if out:
+                    samples, missed, _, read_us, age50, age99, reader_cpu = (np.array(col) for col in zip(*out))
+                    row += (f"{samples.mean() / args.seconds:>11.0f}{missed.max():>8d}{np.median(read_us):>9.1f}"
+                            f"{np.median(age50):>7.1f}ms{age99.max():>7.1f}ms"
+                            f"{reader_cpu.mean() / args.seconds * 100:>11.2f}%")
+                print(row)
+    finally:
+        hub.terminate()
+        hub.wait()
+        board.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Headless simulation throughput: ticks/s, per-phase time and allocations.
+
+Run from the repository root:
+
+    python -m benchmarks.sim_throughput
+    python -m benchmarks.sim_throughput --save baseline.json
+    python -m benchmarks.sim_throughput --compare baseline.json --tolerance 0.2
+
+With --compare the run exits non-zero if ticks/s fell by more than the
+tolerance at any enemy count, so it can gate changes to the hot path.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from headless import HeadlessGame, ScriptedInput
+
+PHASES = (
+    ('input', lambda g: g, 'handle_input'),
+    ('player', lambda g: g.player, 'move'),
+    ('enemies', lambda g: g.enemies, 'update'),
+    ('separation', lambda g: g.enemies, 'separate'),
+    ('collision', lambda g: g.enemies, 'collides'),
+)
+
+
+def instrument(game, totals):
+    """Wrap the hot-path methods of this instance with timers"""
+    for phase, owner, name in PHASES:
+        target = owner(game)
+        inner = getattr(target, name)
+
+        def timed(*args, _inner=inner, _phase=phase, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return _inner(*args, **kwargs)
+            finally:
+                totals[_phase] += time.perf_counter_ns() - start
+
+        setattr(target, name, timed)
+
+
+def measure(enemy_count, budget=1.0, seed=0):
+    game = HeadlessGame(enemy_count, inputs=ScriptedInput('random', seed=seed))
+    game.run_ticks(20)  # warm up
+
+    # Plain throughput, no wrappers in the way
+    start = time.perf_counter()
+    ticks = 0
+    while time.perf_counter() - start < budget:
+        game.run_ticks(10)
+        ticks += 10
+    elapsed = time.perf_counter() - start
+
+    # Per-phase split on a separate, instrumented run
+    totals = defaultdict(int)
+    instrument(game, totals)
+    phase_ticks = max(10, ticks // 4)
+    start = time.perf_counter_ns()
+    game.run_ticks(phase_ticks)
+    total_ns = time.perf_counter_ns() - start
+    phases = {phase: totals[phase] / phase_ticks / 1000 for phase, _, _ in PHASES}
+    # update() contains separate(); report homing without it
+    phases['enemies'] -= phases['separation']
+    phases['other'] = total_ns / phase_ticks / 1000 - sum(phases.values())
+
+    # Allocations: transient peak per tick and net growth
+    alloc_ticks = min(200, phase_ticks)
+    tracemalloc.start()
+    # Let per-tick arrays be replaced once under tracing so frees are counted
+    game.run_ticks(2)
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    game.run_ticks(alloc_ticks)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'enemies': enemy_count,
+        'ticks_per_s': ticks / elapsed,
+        'phase_us': phases,
+        'peak_alloc_kb': (peak - base) / 1024,
+        'net_alloc_kb_per_tick': (current - base) / 1024 / alloc_ticks,
+        'collisions_per_tick': game.collisions / game.ticks,
+    }
+
+
+def report(results):
+    names = [p for p, _, _ in PHASES] + ['other']
+    print(f"{'enemies':>8}{'ticks/s':>11}" + ''.join(f"{n + ' us':>14}" for n in names)
+          + f"{'peak KB':>10}{'net B/tick':>12}")
+    for r in results:
+        phases = ''.join(f"{r['phase_us'][n]:>14.1f}" for n in names)
+        print(f"{r['enemies']:>8}{r['ticks_per_s']:>11.0f}{phases}"
+              f"{r['peak_alloc_kb']:>10.1f}{r['net_alloc_kb_per_tick'] * 1024:>12.1f}")
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['enemies']: r for r in json.load(f)}
+    failed = False
+    for r in results:
+        old = baseline.get(r['enemies'])
+        if not old:
+            continue
+        ratio = r['ticks_per_s'] / old['ticks_per_s']
+        status = 'ok'
+        if ratio < 1 - tolerance:
+            status = 'REGRESSION'
+            failed = True
+        print(f"{r['enemies']:>8} enemies: {ratio:6.2f}x baseline  {status}")
+    return not failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[5, 100, 1_000, 10_000, 100_000])
+    parser.add_argument('--budget', type=float, default=1.0, help="seconds per enemy count")
+    parser.add_argument('--save', help="write results as JSON")
+    parser.add_argument('--compare', help="baseline JSON to check against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = [measure(count, args.budget) for count in args.counts]
+    report(results)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
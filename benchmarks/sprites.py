@@ -0,0 +1,75 @@
+"""Object drawing: one pygame.draw.circle per circle vs sprite-atlas blits.
+
+Run from the repository root:
+
+    python -m benchmarks.sprites
+
+Times only putting the player and enemies on the screen, then the whole
+Game.draw frame against the 16 ms budget of a 60 Hz display. A pixel check
+with mixed enemy sizes makes sure the sprites leave the same image as the
+draw calls.
+"""
+import time
+
+import numpy as np
+import pygame
+
+from benchmarks.render import object_circles
+from headless import HeadlessGame, ScriptedInput
+from game import BLACK
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def draw_circles(game, alpha):
+    for color, center, radius in object_circles(game, alpha):
+        pygame.draw.circle(game.screen, color, center, radius)
+
+
+def draw_sprites(game, alpha):
+    game.screen.blits(game.object_sprites(alpha), doreturn=False)
+
+
+def median_ms(game, draw, frames, tick=False):
+    times = np.empty(frames)
+    for i in range(frames):
+        if tick:
+            game.run_ticks(1)
+        start = time.perf_counter()
+        draw(0.5)
+        times[i] = time.perf_counter() - start
+    return float(np.median(times)) * 1000
+
+
+def check_identical(enemy_count, sizes=(10, 15, 20), frames=60):
+    game = HeadlessGame(enemy_count, inputs=ScriptedInput('circle'))
+    game.enemies.size[:] = np.resize(sizes, enemy_count)
+    mismatches = 0
+    for _ in range(frames):
+        game.run_ticks(1)
+        game.screen.fill(BLACK)
+        draw_sprites(game, 0.5)
+        fast = pygame.surfarray.array3d(game.screen)
+        game.screen.fill(BLACK)
+        draw_circles(game, 0.5)
+        mismatches += not np.array_equal(fast, pygame.surfarray.array3d(game.screen))
+    return mismatches
+
+
+def main(counts=(100, 1_000, 2_000, 5_000, 10_000), frames=200):
+    print(f"pixel check, 3 enemy sizes: {check_identical(500)} mismatched frames")
+    print(f"{'enemies':>8}{'draw.circle':>15}{'blits':>12}{'speed-up':>10}{'Game.draw':>13}")
+    for count in counts:
+        game = HeadlessGame(count, inputs=ScriptedInput('circle'))
+        game.run_ticks(30)
+        circles = median_ms(game, lambda a: draw_circles(game, a), frames)
+        sprites = median_ms(game, lambda a: draw_sprites(game, a), frames)
+        frame = median_ms(game, game.draw, frames, tick=True)
+        verdict = 'ok' if frame < FRAME_BUDGET_MS else 'over budget'
+        print(f"{count:>8}{circles:>12.3f} ms{sprites:>9.3f} ms{circles / sprites:>9.1f}x"
+              f"{frame:>10.3f} ms  {verdict}")
+    print(f"atlas holds {len(game.sprites)} sprites")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Check that game over never stalls the main loop.
+
+Run from the repository root:
+
+    python -m benchmarks.stalls
+
+Drives the real Game.run() loop (dummy video and audio drivers, real
+SoundManager, keyboard input) for a moment, drops an enemy onto the player,
+keeps running through the collision and game-over sounds, then quits. The
+work of every loop iteration (everything but the frame pacer's wait, as
+the pacer itself records it) must fit in one RENDER_FPS frame, or the script exits with
+status 1. Wall-clock gaps between frames are printed too, but they also
+include the OS's sleep jitter.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from game import RENDER_FPS, Game
+
+FRAME = 1.0 / RENDER_FPS
+
+
+class TimedGame(Game):
+    """Game that records when each frame is drawn and scripts a collision"""
+
+    def __init__(self, collide_at=30, frames_after=90):
+        super().__init__(connect_sensor=False)
+        self.collide_at = collide_at
+        self.frames_after = frames_after
+        self.frame_times = []
+        self.game_over_frame = None
+
+    def draw(self, alpha=1.0):
+        super().draw(alpha)
+        self.frame_times.append(time.perf_counter())
+        frame = len(self.frame_times)
+        if frame == self.collide_at:
+            # Put the first enemy right on top of the player
+            self.enemies.x[0] = self.enemies.prev_x[0] = self.player.x
+            self.enemies.y[0] = self.enemies.prev_y[0] = self.player.y
+        if self.game_over and self.game_over_frame is None:
+            self.game_over_frame = frame
+        if self.game_over_frame is not None and frame >= self.game_over_frame + self.frames_after:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def main():
+    game = TimedGame()
+    try:
+        game.run()
+    except SystemExit:
+        pass
+
+    if game.game_over_frame is None:
+        print("no game over happened; nothing was checked")
+        return 1
+    start = game.game_over_frame - 5
+    # The pacer's first record is the second frame's work
+    busy = game.pacer.history()[1][start:]
+    gaps = np.diff(game.frame_times)[start:]
+    worst = float(busy.max())
+    print(f"{len(game.frame_times)} frames, game over at frame {game.game_over_frame}")
+    print(f"loop work per frame from game over on: median {np.median(busy) * 1000:.2f} ms, "
+          f"worst {worst * 1000:.2f} ms (limit {FRAME * 1000:.1f} ms)")
+    print(f"wall-clock frame gap: median {np.median(gaps) * 1000:.1f} ms, worst {gaps.max() * 1000:.1f} ms")
+    print(f"sounds played from the queue: {game.sound_queue.played}, "
+          f"worst lateness {game.sound_queue.max_lateness * 1000:.1f} ms")
+    if game.sound_queue.played < 2:
+        print("FAIL: collision and game over sounds did not both play")
+        return 1
+    if worst > FRAME:
+        print("FAIL: the loop stalled for more than one frame")
+        return 1
+    print("ok")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Startup benchmark: per-sample loop vs vectorized vs cached sound loading.
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+"""
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+from game import SAMPLE_RATE, SoundManager
+
+
+def loop_sweep(duration, freq, sweep, volume, fade_in=False):
+    """The original per-sample sweep generator, kept as the baseline"""
+    samples = int(duration * SAMPLE_RATE)
+    sound_data = []
+    for i in range(samples):
+        t = i / SAMPLE_RATE
+        f = freq + sweep * (t / duration)
+        v = volume * (t / duration) if fade_in else volume * (1 - t / duration)
+        sound_data.append(int(32767 * v * math.sin(2 * math.pi * f * t)))
+    return sound_data
+
+
+def loop_explosion(duration, freq, attack, seed):
+    samples = int(duration * SAMPLE_RATE)
+    sound_data = []
+    for i in range(samples):
+        t = i / SAMPLE_RATE
+        rumble = math.sin(2 * math.pi * freq * t)
+        noise = random.uniform(-0.5, 0.5)
+        if t < attack:
+            volume = t / attack
+        else:
+            volume = max(0, 1 - (t - attack) / (duration - attack))
+        sound_data.append(int(32767 * volume * (rumble * 0.7 + noise * 0.3)))
+    return sound_data
+
+
+def loop_beep(duration, freq, wobble, volume):
+    samples = int(duration * SAMPLE_RATE)
+    sound_data = []
+    for i in range(samples):
+        t = i / SAMPLE_RATE
+        f = freq + wobble * math.sin(t * 10)
+        v = volume * (1 - t / duration)
+        sound_data.append(int(32767 * v * math.sin(2 * math.pi * f * t)))
+    return sound_data
+
+
+def loop_chime(duration, freqs, volume):
+    samples = int(duration * SAMPLE_RATE)
+    sound_data = []
+    for i in range(samples):
+        t = i / SAMPLE_RATE
+        wave = sum(math.sin(2 * math.pi * f * t) for f in freqs)
+        v = volume * math.exp(-3 * t)
+        sound_data.append(int(32767 * v * wave / len(freqs)))
+    return sound_data
+
+
+LOOP_GENERATORS = {
+    'create_whoosh_sound': loop_sweep,
+    'create_explosion_sound': loop_explosion,
+    'create_beep_sound': loop_beep,
+    'create_chime_sound': loop_chime,
+    'create_startup_sound': lambda **p: loop_sweep(fade_in=True, **p),
+    'create_game_over_sound': loop_sweep,
+    'create_spawn_sound': loop_sweep,
+}
+
+
+def load_with_loops():
+    for method, params in SoundManager.SOUND_SPECS.values():
+        data = np.asarray(LOOP_GENERATORS[method](**params), dtype=np.int16)
+        np.column_stack((data, data))
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=5):
+    cache_dir = tempfile.mkdtemp(prefix='sound-cache-')
+    try:
+        manager = SoundManager(cache=False)
+        loop_s = best_of(load_with_loops, max(1, repeat // 2))
+        vector_s = best_of(manager.load_buffers, repeat)
+
+        warm = SoundManager(cache_dir=cache_dir)  # populates the cache
+        cached_s = best_of(warm.load_buffers, repeat)
+        full_s = best_of(lambda: SoundManager(cache_dir=cache_dir), repeat)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'per-sample loops':<28}{loop_s * 1000:10.2f} ms")
+    print(f"{'vectorized synthesis':<28}{vector_s * 1000:10.2f} ms  ({loop_s / vector_s:6.1f}x)")
+    print(f"{'memory-mapped cache':<28}{cached_s * 1000:10.2f} ms  ({loop_s / cached_s:6.1f}x)")
+    print(f"{'SoundManager() warm start':<28}{full_s * 1000:10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
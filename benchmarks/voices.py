@@ -0,0 +1,75 @@
+"""Sound storms: the mixer's own channel choice vs the SoundManager voice pool.
+
+Run from the repository root:
+
+    python -m benchmarks.voices
+
+Every frame of the storm fires a burst of 'move' and 'enemy_spawn' sounds
+(as a large swarm would), and now and then a 'collision'. Counts how many
+collision cues got a channel, how many voices were playing at most, and
+what a play() call costs.
+"""
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from game import SoundManager
+
+FRAME = 1 / 60
+
+
+def storm(play, busy_channels, frames=120, burst=16, collide_every=20):
+    """Returns (collisions heard, collisions fired, peak busy channels, us per play)"""
+    heard = fired = peak = calls = 0
+    spent = 0.0
+    for frame in range(frames):
+        start = time.perf_counter()
+        for i in range(burst):
+            play('enemy_spawn' if i % 2 else 'move', 0.3)
+        calls += burst
+        if frame % collide_every == 0:
+            fired += 1
+            heard += play('collision', 0.7) is not None
+            calls += 1
+        spent += time.perf_counter() - start
+        peak = max(peak, busy_channels())
+        time.sleep(FRAME)
+    return heard, fired, peak, spent / calls * 1e6
+
+
+def main():
+    manager = SoundManager()
+    channels = pygame.mixer.get_num_channels()
+
+    def unmanaged_play(name, volume):
+        sound = manager.sounds[name]
+        sound.set_volume(volume)
+        return sound.play()
+
+    def mixer_busy():
+        return sum(pygame.mixer.Channel(i).get_busy() for i in range(channels))
+
+    # The original play(): shared Sound volume, first free unreserved channel
+    pygame.mixer.set_reserved(0)
+    heard, fired, peak, cost = storm(unmanaged_play, mixer_busy)
+    print(f"mixer picks channels: {heard}/{fired} collisions heard, "
+          f"peak {peak}/{channels} channels, {cost:.1f} us/play")
+    pygame.mixer.stop()
+
+    pygame.mixer.set_reserved(channels)
+    voices = manager.voices
+    heard, fired, peak, cost = storm(lambda name, volume: voices.play(manager.sounds[name], name, volume),
+                                     voices.active)
+    print(f"voice pool:           {heard}/{fired} collisions heard, "
+          f"peak {peak}/{channels} channels, {cost:.1f} us/play")
+    stats = voices.stats()
+    for key in ('played', 'stolen', 'dropped'):
+        print(f"  {key:>8}: {stats[key]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""CSV vs binary wire protocol: link capacity and host-side decode cost.
+
+Run from the repository root:
+
+    python -m benchmarks.wire_protocol
+"""
+import time
+
+import numpy as np
+import serial
+
+from benchmarks.framer import synthetic_capture
+from line_framer import LineFramer
+from mpu_sim import VirtualMPU
+from wire_protocol import FRAME, FRAME_SIZE, BinaryDecoder, ProtocolNegotiator, encode_frame
+
+BAUD = 115200
+BYTES_PER_SECOND = BAUD / 10  # 8N1
+
+
+def binary_capture(frames, corrupt_every=0, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(-90, 90, size=(frames, 2))
+    chunks = [encode_frame(i, p, r) for i, (p, r) in enumerate(angles)]
+    if corrupt_every:
+        for i in range(0, frames, corrupt_every):
+            chunks[i] = chunks[i][:4] + b'\x00' + chunks[i][5:]
+    return b''.join(chunks)
+
+
+def iter_unpack(capture):
+    """Reference per-frame decode with struct.iter_unpack (aligned input only)"""
+    count = 0
+    for sync, seq, pitch, roll, crc in FRAME.iter_unpack(capture):
+        count += 1
+    return count
+
+
+def run_decoder(decoder, capture, chunk=4096):
+    view = memoryview(capture)
+    count = 0
+    start = time.perf_counter()
+    for i in range(0, len(capture), chunk):
+        count += len(decoder.feed(view[i:i + chunk]))
+    return count, time.perf_counter() - start
+
+
+def negotiation_time(binary_capable):
+    with VirtualMPU(rate=200, binary_capable=binary_capable) as device:
+        ser = serial.Serial(device.port, BAUD, timeout=0.1)
+        negotiator = ProtocolNegotiator(ser)
+        start = time.monotonic()
+        while negotiator.decoder is None:
+            negotiator.poll()
+            time.sleep(0.005)
+        elapsed = time.monotonic() - start
+        ser.close()
+    return negotiator.protocol, elapsed
+
+
+def main():
+    csv = synthetic_capture()
+    csv_bytes = len(csv) / csv.count(b'\n')
+    print(f"link at {BAUD} baud: CSV {csv_bytes:.1f} B/sample -> {BYTES_PER_SECOND / csv_bytes:.0f} Hz max, "
+          f"binary {FRAME_SIZE} B/sample -> {BYTES_PER_SECOND / FRAME_SIZE:.0f} Hz max")
+
+    n, s = run_decoder(LineFramer(), csv)
+    print(f"{'CSV LineFramer':<30}{n / s / 1e6:8.2f} M samples/s")
+
+    frames = binary_capture(len(csv) // FRAME_SIZE)
+    start = time.perf_counter()
+    n = iter_unpack(frames)
+    print(f"{'struct.iter_unpack':<30}{n / (time.perf_counter() - start) / 1e6:8.2f} M samples/s (no CRC)")
+    n, s = run_decoder(BinaryDecoder(), frames)
+    print(f"{'BinaryDecoder':<30}{n / s / 1e6:8.2f} M samples/s")
+
+    decoder = BinaryDecoder()
+    n, s = run_decoder(decoder, binary_capture(len(csv) // FRAME_SIZE, corrupt_every=1000))
+    print(f"{'BinaryDecoder, 0.1% corrupt':<30}{n / s / 1e6:8.2f} M samples/s "
+          f"({decoder.malformed} resyncs, {decoder.lost} lost by seq)")
+
+    for capable in (True, False):
+        protocol, elapsed = negotiation_time(capable)
+        label = 'binary-capable board' if capable else 'CSV-only board'
+        print(f"negotiation with {label:<22}-> {protocol} in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
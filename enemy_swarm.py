@@ -0,0 +1,158 @@
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+# Enemies this far off-screen are recycled, same as Enemy.update
+RESPAWN_MARGIN = 100
+# Only this many enemies per grid cell take part in separation; a cell is
+# two enemy diameters wide, so any more are a pile-up that can't be resolved
+# in one tick anyway
+SEPARATION_CELL_LIMIT = 8
+# Small swarms check every pair directly; the grid only pays off above this
+BRUTE_FORCE_LIMIT = 64
+NONE = np.zeros(0, dtype=np.intp)
+
+
+def spawn_points(rng, size, width, height):
+    """Random points just outside a screen edge for enemies of the given sizes"""
+    n = len(size)
+    side = rng.integers(0, 4, n)  # top, right, bottom, left
+    along_x = rng.integers(0, width + 1, n).astype(float)
+    along_y = rng.integers(0, height + 1, n).astype(float)
+    x = np.select([side == 1, side == 3], [width + size, -size], along_x)
+    y = np.select([side == 0, side == 2], [-size, height + size], along_y)
+    return x, y
+
+
+class EnemySwarm:
+    """All enemies as one structure of arrays.
+
+    Mirrors Enemy (spawn on a random screen edge, home in on the player at a
+    fixed speed, respawn once far off-screen) but advances every enemy with
+    a handful of array operations per tick instead of one Python object each.
+    Scratch buffers are reused, so a tick allocates nothing proportional to
+    the swarm size except when enemies respawn. With ``separation`` > 0,
+    overlapping enemies are pushed apart by that fraction of their overlap
+    each tick, found through a SpatialHash broad phase.
+    """
+
+    def __init__(self, count, width, height, size, speed, rng=None, separation=0.0):
+        self.width = width
+        self.height = height
+        self.rng = rng or np.random.default_rng()
+        self.separation = separation
+        self.grid = SpatialHash(2 * size)
+        self._all_pairs = np.triu_indices(count, 1) if count <= BRUTE_FORCE_LIMIT else None
+
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.prev_x = np.zeros(count)
+        self.prev_y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.size = np.full(count, float(size))
+        self.speed = np.full(count, float(speed))
+
+        # Per-tick scratch space
+        self._dist = np.zeros(count)
+        self._mask = np.zeros(count, dtype=bool)
+        self._tmp = np.zeros(count, dtype=bool)
+        self._draw_x = np.zeros(count)
+        self._draw_y = np.zeros(count)
+
+        self.respawn(np.arange(count))
+        self.respawned = NONE   # indices of the enemies the last update() respawned
+
+    def __len__(self):
+        return len(self.x)
+
+    def respawn(self, idx):
+        """Move the given enemies to random points just outside an edge"""
+        if len(idx) == 0:
+            return
+        self.x[idx], self.y[idx] = spawn_points(self.rng, self.size[idx], self.width, self.height)
+        # Don't interpolate across the jump
+        self.prev_x[idx] = self.x[idx]
+        self.prev_y[idx] = self.y[idx]
+
+    def save_previous(self):
+        """Remember positions before a simulation step, for interpolation"""
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+
+    def interpolate(self, alpha):
+        """Positions alpha of the way from the previous step to the current one"""
+        x, y = self._draw_x, self._draw_y
+        np.subtract(self.x, self.prev_x, out=x)
+        x *= alpha
+        x += self.prev_x
+        np.subtract(self.y, self.prev_y, out=y)
+        y *= alpha
+        y += self.prev_y
+        return x, y
+
+    def update(self, player_x, player_y):
+        """Advance every enemy one tick toward the player"""
+        vx, vy, dist = self.vx, self.vy, self._dist
+        np.subtract(player_x, self.x, out=vx)
+        np.subtract(player_y, self.y, out=vy)
+        np.hypot(vx, vy, out=dist)
+        np.maximum(dist, 1, out=dist)
+        np.divide(self.speed, dist, out=dist)
+        vx *= dist
+        vy *= dist
+        self.x += vx
+        self.y += vy
+
+        if self.separation:
+            self.separate()
+
+        mask, tmp = self._mask, self._tmp
+        np.less(self.x, -RESPAWN_MARGIN, out=mask)
+        mask |= np.greater(self.x, self.width + RESPAWN_MARGIN, out=tmp)
+        mask |= np.less(self.y, -RESPAWN_MARGIN, out=tmp)
+        mask |= np.greater(self.y, self.height + RESPAWN_MARGIN, out=tmp)
+        if mask.any():
+            self.respawned = np.flatnonzero(mask)
+            self.respawn(self.respawned)
+        else:
+            self.respawned = NONE
+
+    def separate(self):
+        """Push overlapping enemies apart along the line between them"""
+        if self._all_pairs is not None:
+            i, j = self._all_pairs
+        else:
+            self.grid.rebuild(self.x, self.y)
+            i, j = self.grid.candidate_pairs(SEPARATION_CELL_LIMIT)
+        x, y, size = self.x, self.y, self.size
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        reach = size[i] + size[j]
+        # Most candidates are only neighbours: compare squares, root the hits
+        hit = np.flatnonzero(dx * dx + dy * dy < reach * reach)
+        if len(hit) == 0:
+            return
+        i, j, dx, dy, reach = i[hit], j[hit], dx[hit], dy[hit], reach[hit]
+        dist = np.hypot(dx, dy)
+        # Coincident enemies get an arbitrary but consistent direction
+        zero = dist == 0
+        dx[zero] = 1.0
+        dist[zero] = 1.0
+        push = self.separation * 0.5 * (reach - dist) / dist
+        dx *= push
+        dy *= push
+        n = len(x)
+        x += np.bincount(i, dx, n) - np.bincount(j, dx, n)
+        y += np.bincount(i, dy, n) - np.bincount(j, dy, n)
+
+    def hits(self, x, y, radius):
+        """Indices of enemies overlapping a circle at (x, y)"""
+        dist = self._dist
+        np.hypot(self.x - x, self.y - y, out=dist)
+        np.less(dist, self.size + radius, out=self._mask)
+        return np.flatnonzero(self._mask)
+
+    def collides(self, x, y, radius):
+        """True if any enemy overlaps a circle at (x, y)"""
+        return len(self.hits(x, y, radius)) > 0
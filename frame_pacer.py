@@ -0,0 +1,187 @@
+import time
+
+import numpy as np
+import pygame
+
+PACING_MODES = ('deadline', 'clock')
+
+
+class FramePacer:
+    """Frame cap that holds each frame to a deadline, with timing stats.
+
+    The game loop calls wait() once per frame after presenting it. In
+    ``deadline`` mode frames are due every 1/fps seconds from the first
+    one: wait() sleeps until ``spin`` seconds before the deadline, then
+    spins on time.perf_counter() the rest of the way, so OS timer slack
+    doesn't leak into the frame interval. ``spin`` follows how late the
+    sleeps wake up: it jumps to cover the worst recent oversleep and
+    decays slowly. A frame that overruns its deadline is shown late and the
+    next one is due a full period after it, instead of rushing frames out
+    to catch up. ``clock`` mode is the old pygame.time.Clock.tick() loop,
+    kept to compare against.
+
+    Either way, the interval between frames and the work done in each
+    (everything but the wait) go into a ring of ``capacity`` frames for
+    stats(), and ``load`` is a moving average of the work over the frame
+    budget: above 1 the loop can't keep up.
+    """
+
+    def __init__(self, fps=60, mode='deadline', capacity=4096, min_spin=0.0005, max_spin=0.004,
+                 smoothing=0.1, time_source=time.perf_counter, sleep=time.sleep):
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}")
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.fps = fps
+        self.mode = mode
+        self.period = 1.0 / fps if fps else 0.0
+        # Uncapped loops are still measured against 60 Hz
+        self.budget = self.period or 1 / 60
+        self.min_spin = min_spin
+        self.max_spin = max_spin
+        self.spin = max_spin
+        self.smoothing = smoothing
+        self.time_source = time_source
+        self.sleep = sleep
+        self.clock = pygame.time.Clock() if mode == 'clock' else None
+
+        self.intervals = np.zeros(capacity)
+        self.work = np.zeros(capacity)
+        self.mask = capacity - 1
+        self.count = 0          # frames recorded
+        self.late = 0           # frames that missed their deadline
+        self.deadline = None
+        self.frame_start = None  # when the previous wait() returned
+        self.load = 0.0
+
+    def reset(self):
+        """Forget the schedule, e.g. after a pause; the stats are kept"""
+        self.deadline = None
+        self.frame_start = None
+
+    def wait(self):
+        """End the frame: wait until the next one is due and record its timing"""
+        now = self.time_source()
+        work = None if self.frame_start is None else now - self.frame_start
+        if self.clock is not None:
+            self.clock.tick(self.fps)
+        elif self.period:
+            self.wait_deadline(now)
+        end = self.time_source()
+        if work is not None:
+            i = self.count & self.mask
+            self.intervals[i] = end - self.frame_start
+            self.work[i] = work
+            self.count += 1
+            self.load += self.smoothing * (work / self.budget - self.load)
+        self.frame_start = end
+
+    def wait_deadline(self, now):
+        if self.deadline is None:
+            self.deadline = now + self.period
+        deadline = self.deadline
+        remaining = deadline - now
+        if remaining <= 0:
+            # Overran: start over from here rather than rush the next frames
+            self.late += 1
+            self.deadline = now + self.period
+            return
+        if remaining > self.spin:
+            wake = deadline - self.spin
+            self.sleep(remaining - self.spin)
+            overslept = self.time_source() - wake
+            self.spin = min(self.max_spin, max(self.min_spin, self.spin * 0.995, overslept * 1.25))
+        time_source = self.time_source
+        while time_source() < deadline:
+            pass
+        self.deadline = deadline + self.period
+
+    def history(self):
+        """(intervals, work) in seconds of the recorded frames, oldest first"""
+        n = min(self.count, len(self.intervals))
+        order = (np.arange(self.count - n, self.count)) & self.mask
+        return self.intervals[order], self.work[order]
+
+    def stats(self):
+        """Frame interval and work percentiles (ms) over the recorded frames, and lateness"""
+        intervals, work = self.history()
+        if len(intervals) == 0:
+            return {'mode': self.mode, 'frames': 0}
+        ms = intervals * 1000
+        return {
+            'mode': self.mode,
+            'frames': len(intervals),
+            'fps': float(1 / intervals.mean()),
+            'interval_ms': {
+                'mean': float(ms.mean()),
+                'std': float(ms.std()),
+                'p50': float(np.percentile(ms, 50)),
+                'p95': float(np.percentile(ms, 95)),
+                'p99': float(np.percentile(ms, 99)),
+                'max': float(ms.max()),
+            },
+            'work_ms': {
+                'mean': float(work.mean() * 1000),
+                'p95': float(np.percentile(work, 95) * 1000),
+            },
+            'late': self.late,
+            'spin_ms': self.spin * 1000,
+        }
+
+
+class QualityGovernor:
+    """Step rendering quality down while frames run over budget, back up with headroom.
+
+    ``levels`` are settings from full quality down; update() takes the
+    pacer's load each frame. After ``down_after`` frames in a row above
+    ``high`` it drops one level, and once the load has settled it notes how
+    much the drop saved. A level comes back after ``up_after`` frames in a
+    row where the load plus that saving stays below ``low``, so a game
+    whose full quality normally runs at 70% load still gets it back, and a
+    level that would push the load over budget again stays off. The gap
+    between the thresholds and the longer wait to recover keep it from
+    flapping between two levels.
+    """
+
+    def __init__(self, levels, high=0.9, low=0.75, down_after=15, up_after=120):
+        self.levels = levels
+        self.high = high
+        self.low = low
+        self.down_after = down_after
+        self.up_after = up_after
+        self.level = 0
+        self.savings = [0.0] * len(levels)  # load saved by each level over the one above
+        self.left_at = None     # load when the last drop happened, until its saving is known
+        self.since = 0          # frames since the last change
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def update(self, load):
+        """Account one frame's load; True when the level changed"""
+        self.since += 1
+        if self.left_at is not None and self.since >= self.down_after:
+            self.savings[self.level] = max(0.0, self.left_at - load)
+            self.left_at = None
+        if load > self.high:
+            self.over += 1
+            self.under = 0
+        elif self.left_at is None and load + self.savings[self.level] < self.low:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+        if self.over >= self.down_after and self.level < len(self.levels) - 1:
+            self.level += 1
+            self.left_at = load
+        elif self.under >= self.up_after and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.over = self.under = self.since = 0
+        self.changes += 1
+        return True
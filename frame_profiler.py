@@ -0,0 +1,172 @@
+import functools
+import os
+import time
+
+import numpy as np
+import pygame
+
+# Frame phases, in the order the game loop passes through them
+PHASES = ('events', 'input', 'update', 'draw', 'present', 'sleep')
+EVENTS, INPUT, UPDATE, DRAW, PRESENT, SLEEP = range(len(PHASES))
+PHASE_COLORS = (
+    (160, 160, 160),  # events
+    (255, 255, 0),    # input
+    (0, 200, 255),    # update
+    (0, 255, 0),      # draw
+    (255, 0, 255),    # present
+    (60, 60, 90),     # sleep
+)
+FRAME_DTYPE = np.dtype([('start_ns', '<i8')] + [(f'{name}_ns', '<i8') for name in PHASES])
+
+
+class FrameProfiler:
+    """Where each frame's time goes, kept in a fixed-size ring.
+
+    The loop calls begin_frame(), then lap(PHASE) as it finishes each phase
+    and end_frame() at the end: one perf_counter_ns() per phase and no
+    allocation. The newest ``capacity`` frames are kept. A game without a
+    profiler pays one ``is not None`` test per hook.
+
+    instrument() wraps hot methods at class level to count their calls;
+    nothing is wrapped (and nothing counted) until it is called.
+    """
+
+    def __init__(self, capacity=4096, time_source=time.perf_counter_ns):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.frames = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self.raw = self.frames.view(np.int64).reshape(capacity, 1 + len(PHASES))
+        self.mask = capacity - 1
+        self.time_source = time_source
+        self.count = 0          # frames completed
+        self.row = self.raw[0]  # the frame being timed
+        self.last = 0
+        self.calls = {}         # label -> [count]
+        self._patched = []      # (cls, name, original)
+
+    def begin_frame(self):
+        row = self.row = self.raw[self.count & self.mask]
+        row[1:] = 0
+        self.last = row[0] = self.time_source()
+
+    def lap(self, phase):
+        """Charge the time since the previous mark to phase"""
+        now = self.time_source()
+        self.row[1 + phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        self.count += 1
+
+    def recent(self, n=None):
+        """The newest n (default: all kept) frames, oldest first"""
+        kept = min(self.count, len(self.frames))
+        n = kept if n is None else min(n, kept)
+        return self.frames.take(np.arange(self.count - n, self.count) & self.mask)
+
+    def phase_ms(self, n=None):
+        """(frames, phases) array of phase times in milliseconds"""
+        frames = self.recent(n)
+        return frames.view(np.int64).reshape(len(frames), 1 + len(PHASES))[:, 1:] / 1e6
+
+    # Call counting
+
+    def instrument(self, targets):
+        """Count calls to each (class, method name) until uninstrument()"""
+        for cls, name in targets:
+            label = f'{cls.__name__}.{name}'
+            if label in self.calls:
+                continue
+            original = cls.__dict__[name]
+            counter = self.calls[label] = [0]
+
+            @functools.wraps(original)
+            def counted(*args, _original=original, _counter=counter, **kwargs):
+                _counter[0] += 1
+                return _original(*args, **kwargs)
+
+            setattr(cls, name, counted)
+            self._patched.append((cls, name, original))
+
+    def uninstrument(self):
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+
+    def call_counts(self):
+        return {label: counter[0] for label, counter in self.calls.items()}
+
+    # Output
+
+    def summary(self, n=None):
+        """{phase: (mean ms, p95 ms)} over the newest n frames"""
+        ms = self.phase_ms(n)
+        if len(ms) == 0:
+            return {}
+        p95 = np.percentile(ms, 95, axis=0)
+        return {name: (float(ms[:, i].mean()), float(p95[i])) for i, name in enumerate(PHASES)}
+
+    def dump(self, path):
+        """Write the kept frames: .npz (compact binary) or CSV of nanoseconds"""
+        frames = self.recent()
+        counts = self.call_counts()
+        if os.path.splitext(path)[1] == '.npz':
+            np.savez(path, frames=frames, call_names=np.array(list(counts), dtype=str),
+                     call_counts=np.array(list(counts.values()), dtype=np.int64))
+            return
+        with open(path, 'w') as f:
+            for label, count in counts.items():
+                f.write(f"# calls {label} {count}\n")
+            f.write(','.join(FRAME_DTYPE.names) + '\n')
+            np.savetxt(f, frames.view(np.int64).reshape(len(frames), 1 + len(PHASES)), fmt='%d', delimiter=',')
+
+
+class ProfilerOverlay:
+    """Rolling stacked frame-time graph plus per-phase averages.
+
+    The graph is rasterized with NumPy into one surface per frame: a column
+    per frame, coloured by phase from the bottom up, with a line at the
+    frame budget. The text only changes a few times a second.
+    """
+
+    def __init__(self, font, width=300, height=90, budget_ms=1000 / 60, scale_ms=33.4, text_every=15):
+        self.font = font
+        self.width = width
+        self.height = height
+        self.budget_ms = budget_ms
+        self.px_per_ms = height / scale_ms
+        self.text_every = text_every
+        self.graph = pygame.Surface((width, height))
+        self.palette = np.array(((0, 0, 0),) + PHASE_COLORS, dtype=np.uint8)
+        self.levels = np.arange(height)[::-1, None]     # pixel height above the bottom, per row
+        self.lines = []
+        self.frames = 0
+
+    def draw(self, screen, profiler, pos=(10, 130)):
+        """Draw onto screen; returns the rect it covered"""
+        ms = profiler.phase_ms(self.width)
+        tops = np.cumsum(ms, axis=1) * self.px_per_ms               # (frames, phases)
+        # Phase index per pixel: how many phase tops lie at or below it
+        pixel = (self.levels[:, :, None] >= tops[None, :, :]).sum(axis=2) + 1
+        pixel[self.levels >= tops[None, :, -1]] = 0                # above the frame: background
+        image = np.zeros((self.width, self.height, 3), dtype=np.uint8)
+        image[self.width - len(ms):] = self.palette[pixel.T]
+        budget_row = self.height - 1 - int(self.budget_ms * self.px_per_ms)
+        if 0 <= budget_row < self.height:
+            image[:, budget_row] = (255, 0, 0)
+        pygame.surfarray.blit_array(self.graph, image)
+
+        if self.frames % self.text_every == 0:
+            self.lines = [self.font.render(f"{name:<8}{mean:6.2f} ms  p95 {p95:6.2f}", True, color)
+                          for (name, (mean, p95)), color in zip(profiler.summary(120).items(), PHASE_COLORS)]
+            calls = [f"{label} {count}" for label, count in profiler.call_counts().items()]
+            for i in range(0, len(calls), 2):
+                self.lines.append(self.font.render(('calls: ' if i == 0 else '       ') + ', '.join(calls[i:i + 2]),
+                                                   True, (255, 255, 255)))
+        self.frames += 1
+
+        x, y = pos
+        rect = screen.blit(self.graph, pos)
+        for i, line in enumerate(self.lines):
+            rect.union_ip(screen.blit(line, (x, y + self.height + 4 + 16 * i)))
+        return rect
@@ -19,6 +19,23 @@ float gx_bias = 0, gy_bias = 0, gz_bias = 0;
 unsigned long lastMicros = 0;
 const float alpha = 0.98f; // complementary filter factor
 
+// Output protocol: CSV text by default, binary frames once the host sends 'B'
+// Frame (9 bytes, little-endian): 0xA5 0x5A, seq u16, pitch i16, roll i16
+// (centidegrees), CRC-8 (poly 0x07) over seq..roll
+// 'R' streams raw sensor counts instead and leaves the filtering to the host
+// Frame (19 bytes, little-endian): 0xA5 0x5B, seq u16, ax ay az gx gy gz i16
+// (gyro bias not removed), dt u16 (us since the last sample), CRC-8 over seq..dt
+bool binaryMode = false;
+bool rawMode = false;
+uint16_t frameSeq = 0;
+const unsigned long CSV_PERIOD_US = 10000;   // ~100 Hz
+const unsigned long BINARY_PERIOD_US = 2000; // ~500 Hz, 4.5 kB/s at 115200 baud
+const unsigned long RAW_PERIOD_US = 2000;    // ~500 Hz, 9.5 kB/s: most of the 11.5 kB/s link
+// 1 appends the sample counter to every CSV line (pitch,roll,seq) so host
+// latency traces can be matched to device samples; binary frames always
+// carry it. The host detects the extra field on its own.
+#define CSV_SEQUENCE 0
+
 int16_t read16(int reg) {
   Wire.beginTransmission(MPU_ADDR);
   Wire.write(reg);
@@ -54,6 +71,101 @@ void readMPU(float &ax, float &ay, float &az, float &gx, float &gy, float &gz) {
   gz -= gz_bias;
 }
 
+// All six axes in one burst from ACCEL_XOUT_H (temperature sits in between)
+void readRaw(int16_t accel[3], int16_t gyro[3]) {
+  Wire.beginTransmission(MPU_ADDR);
+  Wire.write(REG_ACCEL_XOUT_H);
+  Wire.endTransmission(false);
+  Wire.requestFrom(MPU_ADDR, 14, true);
+  int16_t words[7];
+  for (int i = 0; i < 7; i++) {
+    int16_t hi = Wire.read();
+    int16_t lo = Wire.read();
+    words[i] = (hi << 8) | lo;
+  }
+  for (int i = 0; i < 3; i++) {
+    accel[i] = words[i];
+    gyro[i] = words[4 + i];
+  }
+}
+
+uint8_t crc8(const uint8_t *data, uint8_t len) {
+  uint8_t crc = 0;
+  while (len--) {
+    crc ^= *data++;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : (crc << 1);
+    }
+  }
+  return crc;
+}
+
+int16_t toCentidegrees(float deg) {
+  float c = constrain(deg * 100.0f, -32768.0f, 32767.0f);
+  return (int16_t)(c >= 0 ? c + 0.5f : c - 0.5f);
+}
+
+void sendBinaryFrame(float pitch, float roll) {
+  int16_t p = toCentidegrees(pitch);
+  int16_t r = toCentidegrees(roll);
+  uint8_t frame[9];
+  frame[0] = 0xA5;
+  frame[1] = 0x5A;
+  frame[2] = frameSeq & 0xFF;
+  frame[3] = frameSeq >> 8;
+  frame[4] = p & 0xFF;
+  frame[5] = (p >> 8) & 0xFF;
+  frame[6] = r & 0xFF;
+  frame[7] = (r >> 8) & 0xFF;
+  frame[8] = crc8(frame + 2, 6);
+  Serial.write(frame, sizeof(frame));
+  frameSeq++;
+}
+
+void sendRawFrame(const int16_t accel[3], const int16_t gyro[3], unsigned long dtMicros) {
+  uint16_t dt = dtMicros > 0xFFFF ? 0xFFFF : dtMicros;
+  uint8_t frame[19];
+  frame[0] = 0xA5;
+  frame[1] = 0x5B;
+  frame[2] = frameSeq & 0xFF;
+  frame[3] = frameSeq >> 8;
+  for (int i = 0; i < 3; i++) {
+    frame[4 + 2 * i] = accel[i] & 0xFF;
+    frame[5 + 2 * i] = (accel[i] >> 8) & 0xFF;
+    frame[10 + 2 * i] = gyro[i] & 0xFF;
+    frame[11 + 2 * i] = (gyro[i] >> 8) & 0xFF;
+  }
+  frame[16] = dt & 0xFF;
+  frame[17] = dt >> 8;
+  frame[18] = crc8(frame + 2, 16);
+  Serial.write(frame, sizeof(frame));
+  frameSeq++;
+}
+
+// Host commands: 'B' switches to binary frames, 'R' to raw frames, 'C' back
+// to CSV. Each switch is acknowledged with a text line before the new
+// format starts.
+void handleCommands() {
+  while (Serial.available() > 0) {
+    char c = Serial.read();
+    if (c == 'B') {
+      Serial.print("#BIN1\r\n");
+      binaryMode = true;
+      rawMode = false;
+      frameSeq = 0;
+    } else if (c == 'R') {
+      Serial.print("#RAW1\r\n");
+      rawMode = true;
+      binaryMode = false;
+      frameSeq = 0;
+    } else if (c == 'C') {
+      binaryMode = false;
+      rawMode = false;
+      Serial.print("#CSV\r\n");
+    }
+  }
+}
+
 void calibrateGyro(int samples = 500) {
   long sumX = 0, sumY = 0, sumZ = 0;
   for (int i = 0; i < samples; i++) {
@@ -73,6 +185,7 @@ void calibrateGyro(int samples = 500) {
 void setup() {
   Serial.begin(115200);
   Wire.begin();
+  Wire.setClock(400000); // fast-mode I2C so six register reads fit the binary rate
 
   // Wake MPU6050
   Wire.beginTransmission(MPU_ADDR);
@@ -97,6 +210,19 @@ void setup() {
 }
 
 void loop() {
+  handleCommands();
+
+  if (rawMode) {
+    // The host fuses; just sample and send as fast as the link takes it
+    int16_t accel[3], gyro[3];
+    readRaw(accel, gyro);
+    unsigned long now = micros();
+    sendRawFrame(accel, gyro, now - lastMicros);
+    lastMicros = now;
+    while (micros() - now < RAW_PERIOD_US) { }
+    return;
+  }
+
   float ax, ay, az, gx, gy, gz;
   readMPU(ax, ay, az, gx, gy, gz);
 
@@ -116,10 +242,21 @@ void loop() {
   roll  = alpha * roll_gyro  + (1.0f - alpha) * acc_roll;
   pitch = alpha * pitch_gyro + (1.0f - alpha) * acc_pitch;
 
-  // Stream CSV: pitch,roll (degrees)
-  // (You asked: Roll = X, Pitch = Y; both included)
-  Serial.print(pitch, 3); Serial.print(',');
-  Serial.println(roll, 3);
+  if (binaryMode) {
+    sendBinaryFrame(pitch, roll);
+  } else {
+    // Stream CSV: pitch,roll (degrees)
+    // (You asked: Roll = X, Pitch = Y; both included)
+    Serial.print(pitch, 3); Serial.print(',');
+#if CSV_SEQUENCE
+    Serial.print(roll, 3); Serial.print(',');
+    Serial.println(frameSeq++);
+#else
+    Serial.println(roll, 3);
+#endif
+  }
 
-  delay(10); // ~100 Hz loop
+  // Pace the loop from the start of this iteration
+  unsigned long period = binaryMode ? BINARY_PERIOD_US : CSV_PERIOD_US;
+  while (micros() - now < period) { }
 }
\ No newline at end of file
@@ -1,14 +1,38 @@
+import argparse
+import os
 import pygame
-import serial
 import sys
 import random
 import math
 import time
 import numpy as np
 
+from enemy_swarm import EnemySwarm
+from frame_profiler import DRAW, EVENTS, INPUT, PRESENT, SLEEP, UPDATE, FrameProfiler, ProfilerOverlay
+from imu_fusion import SensorFusion
+from input_hub import InputHub
+from frame_pacer import PACING_MODES, FramePacer, QualityGovernor
+from latency_trace import LatencyTracer
+from particles import ParticleSystem, draw_squares
+from recording import GAME_OVER, WAITING, Recorder, Snapshot
+from line_framer import LineFramer
+from renderer import DirtyRectRenderer, TextCache
+from sensor_connector import SensorConnector
+from sensor_hub import HubClient, HubConnector, shared_name
+from serial_reader import SampleRing, SerialReader
+from sim_clock import FixedStepClock
+from sound_cache import SoundCache, cache_key
+from sound_scheduler import SoundScheduler
+from voice_pool import VoicePool
+from sprites import SpriteAtlas
+from tilt_input import ResponseCurve, TiltInput, TiltPredictor
+from wire_protocol import BinaryDecoder
+
+SAMPLE_RATE = 44100
+
 # Initialize Pygame and mixer
 pygame.init()
-pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
 
 # Game constants
 SCREEN_WIDTH = 800
@@ -18,6 +42,20 @@ ENEMY_SIZE = 15
 PLAYER_SPEED = 8
 ENEMY_SPEED = 2
 ENEMY_COUNT = 5
+SIM_HZ = 60       # fixed simulation rate; speeds and score are per tick
+RENDER_FPS = 60   # frame cap, 0 for uncapped
+FRAME_PACING = 'deadline'  # 'deadline' sleeps then spins to each frame's deadline, 'clock' is pygame's Clock.tick
+MAX_CATCH_UP_STEPS = 5  # simulation steps per frame before backlog is dropped
+ENEMY_SEPARATION = 0.5  # fraction of enemy overlap resolved per frame (0 lets them stack)
+SEPARATION_MAX_ENEMIES = 2000  # bigger swarms stack: separating them costs more than the rest of a tick
+SERIAL_PORT = os.environ.get('MPU_PORT', 'COM6')
+SERIAL_PROTOCOL = 'auto'  # 'auto' asks the board for binary frames, 'raw' for raw IMU data, 'csv' never asks
+SENSOR_FUSION = 'madgwick'  # host filter for raw IMU data: 'complementary', 'madgwick' or 'mahony'
+SENSOR_WAIT = 5.0  # seconds on the waiting screen before falling back to the keyboard
+TILT_FULL_SCALE = 25.0  # degrees of tilt for full speed
+TILT_DEADZONE = 2.5     # degrees of tilt ignored around level; movement ramps up from 0 past it
+TILT_EXPONENT = 1.0     # response curve: 1 linear, >1 finer control near level
+TILT_PREDICTION = True  # extrapolate tilt to when the frame is shown (False: average the frame's samples)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -28,178 +66,181 @@ GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 PURPLE = (128, 0, 128)
+PLAYER_COLORS = [BLUE, GREEN, ORANGE, PURPLE, YELLOW]  # one per board with --ports, repeating
+
+PARTICLE_CAPACITY = 65536  # live particle slots shared by every effect
+# name -> ParticleSystem.emit() parameters, per point the effect starts from
+PARTICLE_EFFECTS = {
+    'collision': {'count': 800, 'color': ORANGE, 'speed': 10.0, 'life': 70},
+    'score': {'count': 200, 'color': YELLOW, 'speed': 6.0, 'life': 40},
+    'enemy_spawn': {'count': 40, 'color': RED, 'speed': 3.0, 'life': 25},
+    'trail': {'count': 3, 'speed': 1.0, 'life': 18, 'spread': 0.8},   # in the player's color, behind it
+}
+# Rendering quality from full down, stepped through while frames run over budget:
+# HUD redrawn every N frames, share of each effect's particles emitted, whether
+# enemies are interpolated between steps, and enemies as ENEMY_DOT squares
+# written straight into the pixels instead of one sprite blit each
+QUALITY_LEVELS = [
+    {'hud_every': 1, 'effects': 1.0, 'interpolate': True, 'enemy_dots': False},
+    {'hud_every': 2, 'effects': 0.5, 'interpolate': True, 'enemy_dots': False},
+    {'hud_every': 4, 'effects': 0.25, 'interpolate': False, 'enemy_dots': False},
+    {'hud_every': 8, 'effects': 0.1, 'interpolate': False, 'enemy_dots': True},
+]
+ENEMY_DOT = 6   # side in pixels of an enemy at the lowest quality
 
 class SoundManager:
-    def __init__(self):
+    # name -> (generator method, parameters). The parameters are also part of
+    # the on-disk cache key, so tweaking any of them regenerates the buffers.
+    SOUND_SPECS = {
+        'move': ('create_whoosh_sound', {'duration': 0.3, 'freq': 400, 'sweep': -200, 'volume': 0.3}),
+        'collision': ('create_explosion_sound', {'duration': 0.5, 'freq': 60, 'attack': 0.1, 'seed': 6050}),
+        'score': ('create_beep_sound', {'duration': 0.2, 'freq': 800, 'wobble': 400, 'volume': 0.5}),
+        'powerup': ('create_chime_sound', {'duration': 0.4, 'freqs': [523.25, 659.25, 783.99], 'volume': 0.4}),
+        'game_start': ('create_startup_sound', {'duration': 0.8, 'freq': 200, 'sweep': 600, 'volume': 0.6}),
+        'game_over': ('create_game_over_sound', {'duration': 1.0, 'freq': 400, 'sweep': -350, 'volume': 0.7}),
+        'enemy_spawn': ('create_spawn_sound', {'duration': 0.3, 'freq': 300, 'sweep': -250, 'volume': 0.4}),
+    }
+    # Priority classes in order: (name, reserved mixer channels, may steal voices)
+    VOICE_CLASSES = [
+        ('critical', 2, True),
+        ('feedback', 2, True),
+        ('ambient', 4, False),
+    ]
+    # name -> (priority class, max simultaneous voices)
+    VOICE_LIMITS = {
+        'collision': ('critical', 1),
+        'game_over': ('critical', 1),
+        'game_start': ('critical', 1),
+        'score': ('feedback', 1),
+        'powerup': ('feedback', 1),
+        'move': ('ambient', 2),
+        'enemy_spawn': ('ambient', 2),
+    }
+
+    def __init__(self, sample_rate=SAMPLE_RATE, cache=True, cache_dir=None):
         self.sounds = {}
+        self.sample_rate = sample_rate
+        self.cache = SoundCache(cache_dir) if cache else None
+        self.voices = VoicePool(self.VOICE_CLASSES, self.VOICE_LIMITS)
         self.load_sounds()
         
     def load_sounds(self):
-        """Generate all sound effects"""
+        """Load all sound effects from the cache, generating them on a miss"""
         try:
-            self.generate_sound('move', self.create_whoosh_sound)
-            self.generate_sound('collision', self.create_explosion_sound)
-            self.generate_sound('score', self.create_beep_sound)
-            self.generate_sound('powerup', self.create_chime_sound)
-            self.generate_sound('game_start', self.create_startup_sound)
-            self.generate_sound('game_over', self.create_game_over_sound)
-            self.generate_sound('enemy_spawn', self.create_spawn_sound)
+            buffers = self.load_buffers()
+            for name, buf in buffers.items():
+                self.sounds[name] = pygame.sndarray.make_sound(buf)
             print("✅ All sounds generated successfully!")
         except Exception as e:
             print(f"❌ Sound generation failed: {e}")
+
+    def load_buffers(self):
+        """Return {name: (n, 2) int16 array}, memory-mapped when cached"""
+        key = cache_key(self.sample_rate, self.SOUND_SPECS)
+        if self.cache:
+            buffers = self.cache.load(key)
+            if buffers is not None and set(buffers) == set(self.SOUND_SPECS):
+                return buffers
+
+        buffers = {}
+        for name in self.SOUND_SPECS:
+            try:
+                buffers[name] = self.generate_buffer(name)
+            except Exception as e:
+                print(f"❌ Failed to generate sound '{name}': {e}")
+
+        if self.cache and len(buffers) == len(self.SOUND_SPECS):
+            try:
+                self.cache.store(key, buffers)
+            except OSError as e:
+                print(f"⚠️ Could not write sound cache: {e}")
+        return buffers
     
-    def generate_sound(self, name, sound_function):
-        """Generate a sound using the provided function"""
-        try:
-            sound_array = sound_function()
-            # Convert to proper format for pygame
-            sound_array = np.asarray(sound_array, dtype=np.int16)
-            sound_array = np.column_stack((sound_array, sound_array))  # Stereo
-            sound = pygame.sndarray.make_sound(sound_array)
-            self.sounds[name] = sound
-        except Exception as e:
-            print(f"❌ Failed to generate sound '{name}': {e}")
+    def generate_buffer(self, name):
+        """Synthesize one sound as a stereo int16 buffer"""
+        method, params = self.SOUND_SPECS[name]
+        sound_array = getattr(self, method)(**params)
+        # Convert to proper format for pygame
+        sound_array = np.asarray(sound_array, dtype=np.int16)
+        return np.column_stack((sound_array, sound_array))  # Stereo
+
+    def timeline(self, duration):
+        """Sample times for a sound of the given duration"""
+        samples = int(duration * self.sample_rate)
+        return np.arange(samples) / self.sample_rate
+
+    def sweep(self, duration, freq, sweep, volume, fade_in=False):
+        """Linear frequency sweep with a linear fade in or out"""
+        t = self.timeline(duration)
+        freqs = freq + sweep * (t / duration)
+        if fade_in:
+            envelope = volume * (t / duration)
+        else:
+            envelope = volume * (1 - t / duration)
+        return (32767 * envelope * np.sin(2 * np.pi * freqs * t)).astype(np.int16)
     
-    def create_whoosh_sound(self):
+    def create_whoosh_sound(self, duration, freq, sweep, volume):
         """Create whoosh sound for movement"""
-        duration = 0.3
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            freq = 400 - 200 * (t / duration)  # Descending frequency
-            volume = 0.3 * (1 - t/duration)    # Fade out
-            sample = int(32767 * volume * math.sin(2 * math.pi * freq * t))
-            sound_data.append(sample)
-        
-        return sound_data
+        return self.sweep(duration, freq, sweep, volume)  # Descending, fade out
     
-    def create_explosion_sound(self):
+    def create_explosion_sound(self, duration, freq, attack, seed):
         """Create explosion sound for collisions"""
-        duration = 0.5
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            # Low frequency rumble with noise
-            rumble = math.sin(2 * math.pi * 60 * t)
-            noise = random.uniform(-0.5, 0.5)
-            
-            if t < 0.1:
-                volume = t / 0.1  # Quick attack
-            else:
-                volume = max(0, 1 - (t - 0.1) / 0.4)  # Slow decay
-                
-            sample = int(32767 * volume * (rumble * 0.7 + noise * 0.3))
-            sound_data.append(sample)
+        t = self.timeline(duration)
+        # Low frequency rumble with noise
+        rumble = np.sin(2 * np.pi * freq * t)
+        noise = np.random.default_rng(seed).uniform(-0.5, 0.5, len(t))
         
-        return sound_data
+        # Quick attack, slow decay
+        decay = np.maximum(0, 1 - (t - attack) / (duration - attack))
+        volume = np.where(t < attack, t / attack, decay)
+        return (32767 * volume * (rumble * 0.7 + noise * 0.3)).astype(np.int16)
     
-    def create_beep_sound(self):
+    def create_beep_sound(self, duration, freq, wobble, volume):
         """Create beep sound for scoring"""
-        duration = 0.2
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            freq = 800 + 400 * math.sin(t * 10)  # Wobbly frequency
-            volume = 0.5 * (1 - t/duration)      # Fade out
-            sample = int(32767 * volume * math.sin(2 * math.pi * freq * t))
-            sound_data.append(sample)
-        
-        return sound_data
+        t = self.timeline(duration)
+        freqs = freq + wobble * np.sin(t * 10)  # Wobbly frequency
+        envelope = volume * (1 - t / duration)  # Fade out
+        return (32767 * envelope * np.sin(2 * np.pi * freqs * t)).astype(np.int16)
     
-    def create_chime_sound(self):
+    def create_chime_sound(self, duration, freqs, volume):
         """Create magical chime sound"""
-        duration = 0.4
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            # Multiple harmonious frequencies
-            wave1 = math.sin(2 * math.pi * 523.25 * t)  # C5
-            wave2 = math.sin(2 * math.pi * 659.25 * t)  # E5
-            wave3 = math.sin(2 * math.pi * 783.99 * t)  # G5
-            volume = 0.4 * math.exp(-3 * t)  # Exponential decay
-            sample = int(32767 * volume * (wave1 + wave2 + wave3) / 3)
-            sound_data.append(sample)
-        
-        return sound_data
-    
-    def create_startup_sound(self):
+        t = self.timeline(duration)
+        # Multiple harmonious frequencies (C5, E5, G5)
+        waves = np.sin(2 * np.pi * np.asarray(freqs)[:, None] * t).mean(axis=0)
+        envelope = volume * np.exp(-3 * t)  # Exponential decay
+        return (32767 * envelope * waves).astype(np.int16)
+    
+    def create_startup_sound(self, duration, freq, sweep, volume):
         """Create game startup sound"""
-        duration = 0.8
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            freq = 200 + 600 * (t / duration)  # Rising frequency
-            volume = 0.6 * (t / duration)      # Fade in
-            sample = int(32767 * volume * math.sin(2 * math.pi * freq * t))
-            sound_data.append(sample)
-        
-        return sound_data
+        return self.sweep(duration, freq, sweep, volume, fade_in=True)  # Rising, fade in
     
-    def create_game_over_sound(self):
+    def create_game_over_sound(self, duration, freq, sweep, volume):
         """Create sad game over sound"""
-        duration = 1.0
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            freq = 400 - 350 * (t / duration)  # Descending frequency
-            volume = 0.7 * (1 - t/duration)    # Fade out
-            sample = int(32767 * volume * math.sin(2 * math.pi * freq * t))
-            sound_data.append(sample)
-        
-        return sound_data
+        return self.sweep(duration, freq, sweep, volume)  # Descending, fade out
     
-    def create_spawn_sound(self):
+    def create_spawn_sound(self, duration, freq, sweep, volume):
         """Create enemy spawn sound"""
-        duration = 0.3
-        sample_rate = 44100
-        samples = int(duration * sample_rate)
-        sound_data = []
-        
-        for i in range(samples):
-            t = i / sample_rate
-            freq = 300 - 250 * (t / duration)  # Descending frequency
-            volume = 0.4 * (1 - t/duration)    # Fade out
-            sample = int(32767 * volume * math.sin(2 * math.pi * freq * t))
-            sound_data.append(sample)
-        
-        return sound_data
+        return self.sweep(duration, freq, sweep, volume)  # Descending, fade out
     
     def play(self, sound_name, volume=1.0):
-        """Play a sound effect"""
+        """Play a sound effect on a channel from the voice pool"""
         if sound_name in self.sounds:
             try:
-                sound = self.sounds[sound_name]
-                sound.set_volume(volume)
-                sound.play()
+                self.voices.play(self.sounds[sound_name], sound_name, volume)
             except Exception as e:
                 print(f"❌ Could not play sound '{sound_name}': {e}")
     
     def stop_all(self):
         """Stop all currently playing sounds"""
-        pygame.mixer.stop()
+        self.voices.stop_all()
 
 class Player:
-    def __init__(self, sound_manager):
-        self.x = SCREEN_WIDTH // 2
+    def __init__(self, sound_manager, color=BLUE, x=SCREEN_WIDTH // 2):
+        self.x = x
         self.y = SCREEN_HEIGHT // 2
+        self.color = color
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.size = PLAYER_SIZE
         self.sound_manager = sound_manager
         self.last_move_time = 0
@@ -223,31 +264,51 @@ class Player:
             self.sound_manager.play('move', volume=0.2)
             self.last_move_time = current_time
     
-    def draw(self, screen):
-        pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), self.size)
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size // 2)
+    def save_previous(self):
+        """Remember the position before a simulation step, for interpolation"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+    
+    def circles(self, alpha=1.0):
+        """(color, center, radius) to draw, between the last two simulation steps"""
+        x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        y = int(self.prev_y + (self.y - self.prev_y) * alpha)
+        return [(self.color, (x, y), self.size), (WHITE, (x, y), self.size // 2)]
+    
+    def draw(self, screen, alpha=1.0):
+        for color, center, radius in self.circles(alpha):
+            pygame.draw.circle(screen, color, center, radius)
+    
+    def sprite_blit(self, atlas, alpha=1.0):
+        """(surface, topleft) of the pre-rendered player sprite"""
+        layers = self.circles(alpha)
+        center = layers[0][1]
+        return atlas.circle(*[(color, radius) for color, _, radius in layers]).place(center)
 
 class Enemy:
-    def __init__(self, sound_manager):
+    def __init__(self, sound_manager, rng=None):
         self.size = ENEMY_SIZE
         self.speed = ENEMY_SPEED
         self.sound_manager = sound_manager
+        # Its own random.Random, so a seeded one replays the same spawns
+        self.rng = rng or random.Random()
         self.respawn()
         
     def respawn(self):
-        side = random.choice(['top', 'right', 'bottom', 'left'])
+        rng = self.rng
+        side = rng.choice(['top', 'right', 'bottom', 'left'])
         if side == 'top':
-            self.x = random.randint(0, SCREEN_WIDTH)
+            self.x = rng.randint(0, SCREEN_WIDTH)
             self.y = -self.size
         elif side == 'right':
             self.x = SCREEN_WIDTH + self.size
-            self.y = random.randint(0, SCREEN_HEIGHT)
+            self.y = rng.randint(0, SCREEN_HEIGHT)
         elif side == 'bottom':
-            self.x = random.randint(0, SCREEN_WIDTH)
+            self.x = rng.randint(0, SCREEN_WIDTH)
             self.y = SCREEN_HEIGHT + self.size
         else:  # left
             self.x = -self.size
-            self.y = random.randint(0, SCREEN_HEIGHT)
+            self.y = rng.randint(0, SCREEN_HEIGHT)
             
     def update(self, player_x, player_y):
         dx = player_x - self.x
@@ -265,142 +326,296 @@ class Enemy:
         pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.size)
 
 class Game:
-    def __init__(self):
+    def __init__(self, port=SERIAL_PORT, sound_manager=None, enemy_count=ENEMY_COUNT, connect_sensor=True,
+                 trace_latency=None, profile=None, fusion=None, ports=None, seed=None, record=None,
+                 effects=True, pacing=FRAME_PACING):
+        # Several boards, one player each, all read by one InputHub
+        self.ports = list(ports) if ports else None
+        self.port = self.ports[0] if self.ports else port
+        # Filter for raw IMU data fused on the host; None keeps the board's own
+        self.fusion = fusion or (SENSOR_FUSION if SERIAL_PROTOCOL == 'raw' else None)
+        self.enemy_count = enemy_count
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("🎵 MPU6050 Tilt Game with SOUND!")
-        self.clock = pygame.time.Clock()
+        # Frame cap with timing stats, and the quality it scales with the frame load
+        self.pacer = FramePacer(RENDER_FPS, mode=pacing)
+        self.quality = QualityGovernor(QUALITY_LEVELS)
+        self.sim_clock = FixedStepClock(SIM_HZ, max_steps=MAX_CATCH_UP_STEPS)
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
+        self.text_cache = TextCache()
+        self.renderer = DirtyRectRenderer(self.screen, BLACK)
+        # Optional sensor-to-display timing, exported to this path on exit
+        self.trace_path = trace_latency
+        self.tracer = LatencyTracer() if trace_latency else None
+        # Optional per-phase frame timing (F3 starts it too), dumped to this path on exit
+        self.profile_path = profile
+        self.profiler = None
+        self.profiler_overlay = None
+        self.show_profiler = False
+        if profile:
+            self.start_profiler()
+        self.sprites = SpriteAtlas()
+        self.overlay = None
+        # Visual-only particles for collisions, spawns, score milestones and trails
+        self.particles = ParticleSystem(PARTICLE_CAPACITY) if effects else None
         
         # Initialize sound manager first
-        self.sound_manager = SoundManager()
+        self.sound_manager = sound_manager or SoundManager()
+        # Sounds due later; drained every frame so no effect ever blocks the loop
+        self.sound_queue = SoundScheduler(self.sound_manager)
+        
+        # Every random draw of the simulation comes from this seed (a fresh one
+        # if None), one stream per round, so a seed and the inputs replay a game
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.round = 0
+        self.steps = 0          # simulation steps since the game started
+        self.restarted = False  # a round started since the last step
         
         # Create game objects with sound manager
-        self.player = Player(self.sound_manager)
-        self.enemies = [Enemy(self.sound_manager) for _ in range(ENEMY_COUNT)]
+        self.players = self.new_players()
+        self.player = self.players[0]
+        self.enemies = self.new_enemies()
         
         self.score = 0
         self.game_over = False
         self.last_score_sound = 0
         
+        # Movement requested by the latest input, applied every simulation step
+        self.move_dx = 0
+        self.move_dy = 0
+        # The same for every other player
+        self.other_moves = [(0, 0)] * (len(self.players) - 1)
+        
         # MPU6050 data
         self.current_pitch = 0
         self.current_roll = 0
+        self.tilt_inputs = [self.new_tilt_input() for _ in self.players]
+        self.tilt_input = self.tilt_inputs[0]
         self.mpu_connected = False
         self.mpu_initialized = False
         self.waiting_for_sensor = True
         self.start_time = time.time()
+        self.ser = None
+        self.serial_reader = None
+        self.connector = None
+        self.hub = None
+        self.board_connects = [0] * len(self.players)
+        
+        # Optional log of every step's input and state, closed on exit
+        self.recorder = Recorder(record, self, keyframe_interval=SIM_HZ) if record else None
+        
+        if not connect_sensor:
+            # Keyboard or scripted input only (e.g. headless runs)
+            self.waiting_for_sensor = False
+            return
         
         # Play startup sound after a short delay
-        pygame.time.delay(500)
-        self.sound_manager.play('game_start', volume=0.8)
+        self.sound_queue.schedule('game_start', delay=0.5, volume=0.8)
         
-        # Initialize serial connection
-        self.initialize_mpu()
+        # Look for the board in the background; the waiting screen stays live
+        self.connect_sensor()
         
-    def initialize_mpu(self):
-        """Initialize MPU6050 connection and wait for first data"""
-        try:
-            print("🔄 Initializing MPU6050 connection...")
-            self.ser = serial.Serial('COM6', 115200, timeout=0.1)
-            self.ser.reset_input_buffer()
-            print("✅ Serial port opened on COM6")
-            
-            # Wait for first valid data with timeout
-            print("⏳ Waiting for MPU6050 data...")
-            max_wait_time = 5  # seconds
-            start_wait = time.time()
-            
-            while time.time() - start_wait < max_wait_time:
-                if self.ser.in_waiting > 0:
-                    raw_data = self.ser.read(self.ser.in_waiting).decode('utf-8', errors='ignore')
-                    lines = raw_data.split('\n')
-                    
-                    for line in reversed(lines):
-                        line = line.strip()
-                        if line and ',' in line:
-                            pitch, roll = self.parse_mpu_data(line)
-                            if pitch is not None and roll is not None:
-                                self.current_pitch = pitch
-                                self.current_roll = roll
-                                self.mpu_connected = True
-                                self.mpu_initialized = True
-                                self.waiting_for_sensor = False
-                                print("🎉 MPU6050 initialized successfully!")
-                                # Play success sound
-                                self.sound_manager.play('powerup', volume=0.6)
-                                return
-                
-                # Show progress
-                elapsed = time.time() - start_wait
-                print(f"⏰ Waiting... {elapsed:.1f}s/{max_wait_time}s")
-                time.sleep(0.1)
-            
-            # If we get here, timeout occurred
-            print("❌ Timeout: No MPU6050 data received")
-            self.ser.close()
-            self.ser = None
+    def new_players(self, count=None):
+        """One player per board (just one without --ports), spread across the middle"""
+        if count is None:
+            count = len(self.ports) if self.ports else 1
+        return [Player(self.sound_manager, PLAYER_COLORS[i % len(PLAYER_COLORS)], SCREEN_WIDTH * (i + 1) // (count + 1))
+                for i in range(count)]
+    
+    def new_tilt_input(self):
+        return TiltInput(TiltPredictor() if TILT_PREDICTION else None,
+                         ResponseCurve(TILT_FULL_SCALE, TILT_DEADZONE, TILT_EXPONENT))
+    
+    def new_enemies(self, rng=None):
+        """Spawn a fresh enemy swarm (Enemy is the per-object reference)"""
+        return EnemySwarm(self.enemy_count, SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE, ENEMY_SPEED,
+                          rng=rng or self.round_rng(),
+                          separation=ENEMY_SEPARATION if self.enemy_count <= SEPARATION_MAX_ENEMIES else 0.0)
+    
+    def round_rng(self):
+        """The current round's random stream"""
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(self.round,)))
+        
+    def restart(self, rng=None):
+        """Start a new round with a fresh player and enemies"""
+        self.sound_queue.cancel()
+        self.round += 1
+        self.restarted = True
+        self.players = self.new_players(len(self.players))
+        self.player = self.players[0]
+        self.other_moves = [(0, 0)] * (len(self.players) - 1)
+        self.enemies = self.new_enemies(rng)
+        if self.particles is not None:
+            self.particles.clear()
+        self.score = 0
+        self.game_over = False
+        self.current_pitch = 0
+        self.current_roll = 0
+        self.sim_clock.reset()
+        
+    def sensor_fusion(self):
+        """Maker of a fresh SensorFusion per handshake, or None for the board's own filter"""
+        if self.fusion is None:
+            return None
+        method = self.fusion
+        return lambda: SensorFusion(method)
+    
+    def connect_sensor(self):
+        """Start looking for the MPU6050 without blocking the game loop"""
+        if self.ports:
+            self.connect_hub()
+            return
+        print(f"🔄 Looking for the MPU6050 on {self.port}...")
+        name = shared_name(self.port)
+        if name is not None:
+            # A sensor_hub.py process owns the board; read its shared ring
+            self.connector = HubConnector(name)
+        else:
+            self.connector = SensorConnector(self.port, prefer_binary=SERIAL_PROTOCOL != 'csv',
+                                             fusion=self.sensor_fusion())
+        self.connector.start()
+    
+    def connect_hub(self):
+        """Look for every board at once, one player each, from a single reader thread"""
+        print(f"🔄 Looking for {len(self.ports)} MPU6050s on {', '.join(self.ports)}...")
+        self.hub = InputHub(prefer_binary=SERIAL_PROTOCOL != 'csv')
+        for player, port in enumerate(self.ports):
+            self.hub.open(port, player, self.sensor_fusion())
+        self.hub.start()
+    
+    def poll_sensor(self):
+        """Once per frame: attach the board if it answered, or stop waiting for it"""
+        if self.hub is not None:
+            self.poll_hub()
+            return
+        if self.connector is None:
+            return
+        connection = self.connector.take()
+        if connection is not None:
+            self.connector = None
+            self.attach_sensor(*connection)
+        elif self.waiting_for_sensor and time.time() - self.start_time >= SENSOR_WAIT:
+            reason = f" ({self.connector.error})" if self.connector.error is not None else ""
+            print(f"❌ Timeout: No MPU6050 data received{reason}; "
+                  "using the keyboard until the board answers")
             self.waiting_for_sensor = False
-            
-        except Exception as e:
-            print(f"❌ Failed to initialize MPU6050: {e}")
-            self.ser = None
-            self.mpu_connected = False
+    
+    def attach_sensor(self, ser, decoder, protocol, records):
+        """Switch to tilt control on a port that is already streaming"""
+        self.ser = ser
+        self.current_pitch = float(records[-1, 0])
+        self.current_roll = float(records[-1, 1])
+        self.mpu_connected = True
+        self.mpu_initialized = True
+        self.waiting_for_sensor = False
+        self.tilt_input.reset()
+        fused = f", {self.fusion} fusion" if protocol == 'raw' else ""
+        print(f"🎉 MPU6050 initialized successfully! ({protocol} protocol{fused})")
+        if isinstance(ser, HubClient):
+            # Samples arrive decoded; the client is its own reader
+            self.serial_reader = ser
+        else:
+            # Keep the decoder so buffered bytes aren't lost
+            self.start_serial_reader(decoder)
+        # Play success sound
+        self.sound_manager.play('powerup', volume=0.6)
+    
+    def poll_hub(self):
+        """Once per frame: greet boards that started streaming; play once all of them do"""
+        devices = self.hub.devices
+        for device in devices:
+            if device.connects != self.board_connects[device.player]:
+                self.board_connects[device.player] = device.connects
+                self.tilt_inputs[device.player].reset()
+                print(f"🎉 MPU6050 for player {device.player + 1} on {device.port} ({device.protocol} protocol)")
+        streaming = sum(device.streaming for device in devices)
+        self.mpu_connected = self.mpu_initialized = streaming > 0
+        if not self.waiting_for_sensor:
+            return
+        if streaming == len(devices):
             self.waiting_for_sensor = False
-        
-    def parse_mpu_data(self, line):
-        """Parse the pitch,roll data from Arduino"""
-        try:
-            line = line.strip()
-            if not line:
-                return None, None
-                
-            parts = line.split(',')
-            if len(parts) != 2:
-                return None, None
-                
-            pitch = float(parts[0])
-            roll = float(parts[1])
-            return pitch, roll
-            
-        except:
-            return None, None
+            self.sound_manager.play('powerup', volume=0.6)
+        elif time.time() - self.start_time >= SENSOR_WAIT:
+            print(f"❌ Timeout: {streaming}/{len(devices)} MPU6050s answered; "
+                  "the others join when they do (the keyboard drives player 1 until then)")
+            self.waiting_for_sensor = False
+    
+    def detach_sensor(self):
+        """Drop a board that stopped answering and go back to the keyboard"""
+        if self.serial_reader:
+            self.serial_reader.stop()
+        if self.ser:
+            self.ser.close()
+        self.ser = None
+        self.serial_reader = None
+        self.mpu_connected = False
+        self.mpu_initialized = False
+    
+    def skip_sensor(self):
+        """Stop waiting and looking for the board (boards on the hub still join later)"""
+        if self.connector is not None:
+            self.connector.cancel()
+            self.connector = None
+        self.waiting_for_sensor = False
+    
+    def start_serial_reader(self, decoder=None):
+        """Hand the open port to a background reader thread"""
+        self.serial_reader = SerialReader(self.ser, decoder=decoder)
+        self.serial_reader.start()
         
     def handle_mpu_input(self):
         """Handle MPU6050 tilt input"""
-        if not self.ser or not self.mpu_initialized:
+        if not self.ser or not self.mpu_initialized or not self.serial_reader:
+            return False
+        
+        if self.serial_reader.error:
+            print(f"MPU read error: {self.serial_reader.error}")
+            self.detach_sensor()
+            # Pick the board up again when it comes back
+            self.connect_sensor()
             return False
             
-        try:
-            if self.ser.in_waiting > 0:
-                raw_data = self.ser.read(self.ser.in_waiting).decode('utf-8', errors='ignore')
-                lines = raw_data.split('\n')
-                
-                for line in reversed(lines):
-                    line = line.strip()
-                    if line and ',' in line:
-                        pitch, roll = self.parse_mpu_data(line)
-                        if pitch is not None and roll is not None:
-                            self.current_pitch = pitch
-                            self.current_roll = roll
-                            
-                            # Convert to movement
-                            dx = -roll / 25.0
-                            dy = pitch / 25.0
-                            
-                            # Minimal deadzone
-                            deadzone = 0.1
-                            if abs(dx) < deadzone: dx = 0
-                            if abs(dy) < deadzone: dy = 0
-                            
-                            # Move player
-                            self.player.move(dx, dy)
-                            return True
-                            
-        except Exception as e:
-            print(f"MPU read error: {e}")
-                
-        return False
+        # Every sample since the last frame, gathered without blocking
+        samples = self.serial_reader.ring.read()
+        if len(samples) == 0 and self.tilt_input.predictor is None:
+            return False
+        if self.tracer is not None:
+            self.tracer.input(samples)
+        
+        # The tilt expected when this frame is shown, through the response curve
+        self.current_pitch, self.current_roll = self.tilt_input.read(samples, time.perf_counter())
+        
+        # Held until the next frame
+        self.move_dx, self.move_dy = self.tilt_input.movement(self.current_pitch, self.current_roll)
+        return len(samples) > 0
+    
+    def handle_hub_input(self):
+        """Tilt input for every player whose board streams; the keyboard stands in for player 1's"""
+        now = time.perf_counter()
+        keyboard = True
+        for device in self.hub.devices:
+            player = device.player
+            if not device.streaming:
+                if player > 0:
+                    self.other_moves[player - 1] = (0, 0)
+                continue
+            if player == 0:
+                keyboard = False
+            samples = device.ring.read()
+            tilt = self.tilt_inputs[player]
+            if len(samples) == 0 and tilt.predictor is None:
+                continue
+            pitch, roll = tilt.read(samples, now)
+            if player == 0:
+                if self.tracer is not None:
+                    self.tracer.input(samples)
+                self.current_pitch, self.current_roll = pitch, roll
+                self.move_dx, self.move_dy = tilt.movement(pitch, roll)
+            else:
+                self.other_moves[player - 1] = tilt.movement(pitch, roll)
+        if keyboard:
+            self.handle_keyboard_input()
         
     def handle_keyboard_input(self):
         """Handle keyboard input as fallback"""
@@ -416,18 +631,89 @@ class Game:
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
             dy = 1
             
-        if dx != 0 or dy != 0:
-            self.player.move(dx, dy)
-            return True
-            
-        return False
+        self.move_dx, self.move_dy = dx, dy
+        return dx != 0 or dy != 0
     
     def handle_input(self):
-        if self.mpu_initialized and self.ser:
+        if self.hub is not None:
+            self.handle_hub_input()
+        elif self.mpu_initialized and self.ser:
             self.handle_mpu_input()
         else:
             self.handle_keyboard_input()
     
+    def step(self):
+        """Advance the simulation by one fixed tick"""
+        for player in self.players:
+            player.save_previous()
+        self.enemies.save_previous()
+        if self.move_dx != 0 or self.move_dy != 0:
+            self.player.move(self.move_dx, self.move_dy)
+        for player, (dx, dy) in zip(self.players[1:], self.other_moves):
+            if dx != 0 or dy != 0:
+                player.move(dx, dy)
+        if self.tracer is not None:
+            self.tracer.consumed()
+        self.update()
+        if self.particles is not None:
+            self.emit_trails()
+            self.particles.update()
+        self.steps += 1
+        if self.recorder is not None:
+            self.recorder.record(self, self.restarted)
+        self.restarted = False
+    
+    def effect(self, name, x, y, **params):
+        """Start a PARTICLE_EFFECTS effect at (x, y), or at each point of arrays"""
+        if self.particles is None:
+            return
+        params = {**PARTICLE_EFFECTS[name], **params}
+        params['count'] = round(params['count'] * self.quality.settings['effects'])
+        if params['count']:
+            self.particles.emit(x, y, **params)
+    
+    def emit_trails(self):
+        """A few particles behind every player that moved this step"""
+        for player in self.players:
+            dx, dy = player.x - player.prev_x, player.y - player.prev_y
+            if dx or dy:
+                self.effect('trail', player.x, player.y, color=player.color, angle=math.atan2(-dy, -dx))
+    
+    def snapshot(self):
+        """Copy of everything the next step depends on; cheap enough to take every second"""
+        moves = [(self.move_dx, self.move_dy), *self.other_moves]
+        players = np.array([(player.x, player.y, player.prev_x, player.prev_y, dx, dy)
+                            for player, (dx, dy) in zip(self.players, moves)], dtype=np.float64)
+        enemies = self.enemies
+        state = np.stack((enemies.x, enemies.y, enemies.prev_x, enemies.prev_y, enemies.size, enemies.speed))
+        flags = (GAME_OVER if self.game_over else 0) | (WAITING if self.waiting_for_sensor else 0)
+        return Snapshot(self.steps, self.round, self.score, flags, self.seed, players, state,
+                        enemies.rng.bit_generator.state)
+    
+    def restore(self, snapshot):
+        """Put the simulation back exactly as it was when the snapshot was taken"""
+        self.steps, self.round, self.score, self.seed = snapshot.steps, snapshot.round, snapshot.score, snapshot.seed
+        self.game_over = bool(snapshot.flags & GAME_OVER)
+        self.waiting_for_sensor = bool(snapshot.flags & WAITING)
+        if len(self.players) != len(snapshot.players):
+            self.players = self.new_players(len(snapshot.players))
+            self.player = self.players[0]
+        for player, (x, y, prev_x, prev_y, _, _) in zip(self.players, snapshot.players.tolist()):
+            player.x, player.y, player.prev_x, player.prev_y = x, y, prev_x, prev_y
+        moves = [(dx, dy) for dx, dy in snapshot.players[:, 4:6].tolist()]
+        (self.move_dx, self.move_dy), self.other_moves = moves[0], moves[1:]
+        
+        state = snapshot.enemies
+        if len(self.enemies) != state.shape[1]:
+            self.enemy_count = state.shape[1]
+            self.enemies = self.new_enemies()
+        enemies = self.enemies
+        for array, row in zip((enemies.x, enemies.y, enemies.prev_x, enemies.prev_y, enemies.size, enemies.speed),
+                              state):
+            np.copyto(array, row)
+        enemies.rng.bit_generator.state = snapshot.rng
+        self.restarted = False
+    
     def update(self):
         if self.game_over or self.waiting_for_sensor:
             return
@@ -440,23 +726,61 @@ class Game:
             if current_time - self.last_score_sound > 1.0:  # Avoid sound spam
                 self.sound_manager.play('score', volume=0.4)
                 self.last_score_sound = current_time
+            for player in self.players:
+                self.effect('score', player.x, player.y)
         
         # Update enemies
-        for enemy in self.enemies:
-            enemy.update(self.player.x, self.player.y)
-            
-            # Check collision
-            distance = math.sqrt(
-                (self.player.x - enemy.x)**2 + 
-                (self.player.y - enemy.y)**2
-            )
-            if distance < self.player.size + enemy.size:
-                self.game_over = True
-                # Play collision sound
-                self.sound_manager.play('collision', volume=0.7)
-                # Play game over sound after a short delay
-                pygame.time.delay(500)
-                self.sound_manager.play('game_over', volume=0.6)
+        enemies = self.enemies
+        if len(self.players) == 1:
+            enemies.update(self.player.x, self.player.y)
+        else:
+            enemies.update(*self.chase_targets())
+        if len(enemies.respawned):
+            # Where they come back in, on the edge of the screen
+            spawned = enemies.respawned
+            self.effect('enemy_spawn', np.clip(enemies.x[spawned], 0, SCREEN_WIDTH),
+                        np.clip(enemies.y[spawned], 0, SCREEN_HEIGHT))
+        
+        # Check collision; with several players, whoever is caught ends the round
+        caught = [player for player in self.players if enemies.collides(player.x, player.y, player.size)]
+        if caught:
+            self.game_over = True
+            self.announce_game_over()
+            for player in caught:
+                self.effect('collision', player.x, player.y)
+    
+    def chase_targets(self):
+        """Per enemy, the position of the player nearest to it"""
+        px = np.array([player.x for player in self.players])
+        py = np.array([player.y for player in self.players])
+        enemies = self.enemies
+        nearest = np.hypot(px[:, None] - enemies.x, py[:, None] - enemies.y).argmin(axis=0)
+        return px[nearest], py[nearest]
+    
+    def announce_game_over(self):
+        # Collision now, game over sound after a short pause
+        self.sound_queue.sequence(('collision', 0.0, 0.7), ('game_over', 0.5, 0.6))
+    
+    def start_profiler(self):
+        """Time every frame's phases and count calls to the hot paths"""
+        self.profiler = FrameProfiler()
+        self.profiler.instrument([
+            (Game, 'step'), (EnemySwarm, 'update'), (SampleRing, 'read'),
+            (LineFramer, 'parse'), (BinaryDecoder, 'parse'), (InputHub, '_decode'),
+            (ParticleSystem, 'update'), (ParticleSystem, 'draw'),
+        ])
+        # Started mid-frame: this frame's row begins now
+        self.profiler.begin_frame()
+    
+    def toggle_profiler(self):
+        """Show or hide the frame-time overlay"""
+        if self.profiler is None:
+            self.start_profiler()
+        if self.profiler_overlay is None:
+            self.profiler_overlay = ProfilerOverlay(self.small_font)
+        self.show_profiler = not self.show_profiler
+        # Erase it (or start from a clean frame under it)
+        self.renderer.invalidate()
     
     def draw_waiting_screen(self):
         """Draw screen while waiting for MPU6050 to initialize"""
@@ -466,10 +790,10 @@ class Game:
         elapsed = time.time() - self.start_time
         dots = "." * (int(elapsed * 2) % 4)
         
-        title = self.font.render("🎵 MPU6050 TILT GAME WITH SOUND!", True, WHITE)
-        waiting_text = self.font.render(f"Initializing Sensor{dots}", True, YELLOW)
-        info_text = self.small_font.render("Please wait while the MPU6050 calibrates...", True, WHITE)
-        tip_text = self.small_font.render("Keep the sensor still during initialization", True, ORANGE)
+        title = self.text(self.font, "🎵 MPU6050 TILT GAME WITH SOUND!", WHITE)
+        waiting_text = self.text(self.font, f"Initializing Sensor{dots}", YELLOW)
+        info_text = self.text(self.small_font, "Please wait while the MPU6050 calibrates...", WHITE)
+        tip_text = self.text(self.small_font, "Keep the sensor still during initialization", ORANGE)
         
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
         self.screen.blit(waiting_text, (SCREEN_WIDTH//2 - waiting_text.get_width()//2, 250))
@@ -487,83 +811,199 @@ class Game:
                         (progress_x, progress_y, progress_width, progress_height))
         
         # Progress
-        progress = min(1.0, elapsed / 5.0)  # 5 second max wait
+        progress = min(1.0, elapsed / SENSOR_WAIT)
         pygame.draw.rect(self.screen, GREEN, 
                         (progress_x, progress_y, int(progress_width * progress), progress_height))
         
-        pygame.display.flip()
+        # What the background connector is doing right now
+        if self.hub is not None:
+            streaming = sum(device.streaming for device in self.hub.devices)
+            state = f"{streaming}/{len(self.hub.devices)} streaming"
+        else:
+            state = self.connector.state if self.connector else "stopped"
+        status_text = self.text(self.small_font, f"{self.port}: {state} - SPACE to play with the keyboard", WHITE)
+        self.screen.blit(status_text, (SCREEN_WIDTH//2 - status_text.get_width()//2, 420))
     
-    def draw(self):
-        if self.waiting_for_sensor:
-            self.draw_waiting_screen()
-            return
-            
-        self.screen.fill(BLACK)
-        
-        # Draw player and enemies
-        self.player.draw(self.screen)
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-        
+    def text(self, font, string, color):
+        """Rendered text, reused while the string stays the same"""
+        return self.text_cache.render(font, string, color)
+    
+    def hud_items(self):
+        """(key, surface, position) for every HUD line"""
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, GREEN)
-        self.screen.blit(score_text, (10, 10))
+        score_text = self.text(self.font, f"Score: {self.score}", GREEN)
         
         # Draw MPU data
-        mpu_text = self.font.render(f"Pitch: {self.current_pitch:5.1f}° Roll: {self.current_roll:5.1f}°", True, YELLOW)
-        self.screen.blit(mpu_text, (10, 50))
+        mpu_text = self.text(self.font, f"Pitch: {self.current_pitch:5.1f}° Roll: {self.current_roll:5.1f}°", YELLOW)
         
         # Draw control method
-        if self.mpu_initialized:
-            control_text = self.font.render("Control: 🎮 MPU6050 - READY!", True, GREEN)
-            status_text = self.font.render("🔊 SOUND ON - TILT TO MOVE", True, GREEN)
+        if self.hub is not None and self.mpu_initialized:
+            streaming = sum(device.streaming for device in self.hub.devices)
+            control_text = self.text(self.font, f"Control: 🎮 {streaming}/{len(self.hub.devices)} MPU6050s - READY!",
+                                     GREEN)
+            status_text = self.text(self.font, "🔊 SOUND ON - TILT TO MOVE", GREEN)
+        elif self.mpu_initialized:
+            control_text = self.text(self.font, "Control: 🎮 MPU6050 - READY!", GREEN)
+            status_text = self.text(self.font, "🔊 SOUND ON - TILT TO MOVE", GREEN)
         else:
-            control_text = self.font.render("Control: ⌨️ Keyboard (MPU failed)", True, RED)
-            status_text = self.font.render("🔊 Using arrow keys to move", True, YELLOW)
-            
-        self.screen.blit(control_text, (10, 90))
-        self.screen.blit(status_text, (SCREEN_WIDTH - 400, 10))
-        
-        # Draw game over
-        if self.game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
-            
-            game_over_text = self.font.render("💥 GAME OVER 💥", True, RED)
-            restart_text = self.font.render("Press R to restart or ESC to quit", True, WHITE)
-            final_score = self.font.render(f"Final Score: {self.score}", True, GREEN)
-            
-            self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - 120, SCREEN_HEIGHT//2 - 60))
-            self.screen.blit(final_score, (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 - 20))
-            self.screen.blit(restart_text, (SCREEN_WIDTH//2 - 180, SCREEN_HEIGHT//2 + 20))
+            control_text = self.text(self.font, "Control: ⌨️ Keyboard (MPU failed)", RED)
+            status_text = self.text(self.font, "🔊 Using arrow keys to move", YELLOW)
         
-        pygame.display.flip()
+        return [
+            ('score', score_text, (10, 10)),
+            ('mpu', mpu_text, (10, 50)),
+            ('control', control_text, (10, 90)),
+            ('status', status_text, (SCREEN_WIDTH - 400, 10)),
+        ]
+    
+    def object_sprites(self, alpha):
+        """(surface, topleft) blits for the players and then every enemy"""
+        blits = [player.sprite_blit(self.sprites, alpha) for player in self.players]
+        if not self.quality.settings['enemy_dots']:
+            blits += self.sprites.place_circles(RED, *self.enemy_positions(alpha), self.enemies.size)
+        return blits
+    
+    def enemy_positions(self, alpha):
+        """Where to draw the enemies: interpolated unless quality is cut back"""
+        enemies = self.enemies
+        return enemies.interpolate(alpha) if self.quality.settings['interpolate'] else (enemies.x, enemies.y)
+    
+    def particle_alpha(self, alpha):
+        """Where between ticks to draw the particles: with the enemies, at the current tick when not interpolating"""
+        return alpha if self.quality.settings['interpolate'] else 1.0
+    
+    def draw_enemy_dots(self, alpha):
+        """Enemies as small squares, when quality calls for it; returns the Rect drawn over, or None"""
+        if not self.quality.settings['enemy_dots']:
+            return None
+        enemy_x, enemy_y = self.enemy_positions(alpha)
+        return draw_squares(self.screen, enemy_x - ENEMY_DOT // 2, enemy_y - ENEMY_DOT // 2, RED, ENEMY_DOT)
+    
+    def draw(self, alpha=1.0):
+        renderer = self.renderer
+        changed = None  # rects to push to the display, None for all of it
+        if self.waiting_for_sensor:
+            self.draw_waiting_screen()
+            renderer.invalidate()
+        elif self.game_over:
+            self.draw_game_over(alpha)
+            renderer.invalidate()
+        else:
+            # Only what moved or changed is erased, redrawn and pushed to the display
+            renderer.begin_frame()
+            # Under load the HUD keeps last frame's text for a few frames
+            if renderer.frames % self.quality.settings['hud_every'] == 0:
+                for key, surface, pos in self.hud_items():
+                    renderer.hud(key, surface, pos)
+            renderer.blit_many(self.object_sprites(alpha))
+            changed = renderer.compose()
+            # Straight into the pixels, on top of everything
+            overdrawn = [self.draw_enemy_dots(alpha)]
+            if self.particles is not None:
+                overdrawn.append(self.particles.draw(self.screen, self.particle_alpha(alpha)))
+            for drawn in overdrawn:
+                if drawn is not None:
+                    renderer.overdraw(drawn)
+                    if changed is not None:
+                        changed.append(drawn)
+        
+        profiler = self.profiler
+        if self.show_profiler:
+            self.profiler_overlay.draw(self.screen, profiler)
+            renderer.invalidate()
+            changed = None
+        if profiler is not None:
+            profiler.lap(DRAW)
+        renderer.present(changed)
+        if profiler is not None:
+            profiler.lap(PRESENT)
+        presented = time.perf_counter()
+        for tilt in self.tilt_inputs:
+            tilt.presented(presented)
+        
+        if self.tracer is not None:
+            self.tracer.presented()
+    
+    def draw_game_over(self, alpha):
+        """Full frame under a dimming overlay"""
+        self.screen.fill(BLACK)
+        self.screen.blits(self.object_sprites(alpha), doreturn=False)
+        self.draw_enemy_dots(alpha)
+        for _, surface, pos in self.hud_items():
+            self.screen.blit(surface, pos)
+        
+        if self.overlay is None:
+            self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.overlay.set_alpha(180)
+            self.overlay.fill(BLACK)
+        self.screen.blit(self.overlay, (0, 0))
+        # The explosion plays out above the dimmed frame
+        if self.particles is not None:
+            self.particles.draw(self.screen, self.particle_alpha(alpha))
+        
+        game_over_text = self.text(self.font, "💥 GAME OVER 💥", RED)
+        restart_text = self.text(self.font, "Press R to restart or ESC to quit", WHITE)
+        final_score = self.text(self.font, f"Final Score: {self.score}", GREEN)
+        
+        self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - 120, SCREEN_HEIGHT//2 - 60))
+        self.screen.blit(final_score, (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 - 20))
+        self.screen.blit(restart_text, (SCREEN_WIDTH//2 - 180, SCREEN_HEIGHT//2 + 20))
+    
+    def report_latency(self):
+        """Export the latency trace and print its percentiles"""
+        report = self.tracer.export(self.trace_path)
+        print(f"⏱️ Latency trace of {report['traced_frames']} frames written to {self.trace_path}")
+        for stage, stats in report['percentiles_ms'].items():
+            if stats:
+                print(f"   {stage:<20} p50 {stats['p50']:6.1f} ms  p95 {stats['p95']:6.1f} ms  "
+                      f"p99 {stats['p99']:6.1f} ms")
+    
+    def report_pacing(self):
+        """Print how evenly frames came out"""
+        stats = self.pacer.stats()
+        if not stats['frames']:
+            return
+        interval = stats['interval_ms']
+        print(f"⏱️ Frame pacing ({stats['mode']}): {stats['fps']:.1f} fps over {stats['frames']} frames, "
+              f"interval p50 {interval['p50']:.2f} ms p99 {interval['p99']:.2f} ms std {interval['std']:.2f} ms, "
+              f"{stats['late']} late, quality changed {self.quality.changes} times")
+    
+    def report_profile(self):
+        """Dump the frame profile and print where the frames went"""
+        self.profiler.dump(self.profile_path)
+        print(f"⏱️ Frame profile of {min(self.profiler.count, len(self.profiler.frames))} frames "
+              f"written to {self.profile_path}")
+        for phase, (mean, p95) in self.profiler.summary().items():
+            print(f"   {phase:<8} mean {mean:6.2f} ms  p95 {p95:6.2f} ms")
+        for label, count in self.profiler.call_counts().items():
+            print(f"   {label:<22} {count} calls")
     
     def run(self):
         running = True
         while running:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # Something else painted over us; the next frame must be complete
+                    self.renderer.invalidate()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r and self.game_over:
                         # Restart game
                         self.sound_manager.play('game_start', volume=0.7)
-                        self.player = Player(self.sound_manager)
-                        self.enemies = [Enemy(self.sound_manager) for _ in range(ENEMY_COUNT)]
-                        self.score = 0
-                        self.game_over = False
-                        self.current_pitch = 0
-                        self.current_roll = 0
+                        self.restart()
                     elif event.key == pygame.K_ESCAPE:
                         running = False
                     elif event.key == pygame.K_SPACE and self.waiting_for_sensor:
                         # Skip waiting
-                        self.waiting_for_sensor = False
+                        self.skip_sensor()
                         self.sound_manager.play('powerup')
                         print("⏩ Skipped sensor initialization")
+                    elif event.key == pygame.K_F3:
+                        self.toggle_profiler()
                     elif event.key == pygame.K_m:
                         # Mute/unmute sounds
                         if pygame.mixer.get_volume() > 0:
@@ -573,21 +1013,89 @@ class Game:
                             pygame.mixer.set_volume(1.0)
                             print("🔊 Sound unmuted")
             
+            # F3 may have just started one
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.lap(EVENTS)
+            self.poll_sensor()
             if not self.waiting_for_sensor:
                 self.handle_input()
-                self.update()
+            if profiler is not None:
+                profiler.lap(INPUT)
+            if not self.waiting_for_sensor:
+                # Run however many fixed steps real time calls for
+                for _ in range(self.sim_clock.advance()):
+                    self.step()
+            else:
+                self.sim_clock.reset()
             
-            self.draw()
-            self.clock.tick(60)
+            self.sound_queue.update()
+            if profiler is not None:
+                profiler.lap(UPDATE)
+            self.draw(self.sim_clock.alpha)
+            self.pacer.wait()
+            if self.quality.update(self.pacer.load):
+                settings = self.quality.settings
+                print(f"🎚️ Quality level {self.quality.level}/{len(QUALITY_LEVELS) - 1} at "
+                      f"{self.pacer.load:.0%} frame load: HUD every {settings['hud_every']} frames, "
+                      f"{settings['effects']:.0%} effects")
+            if profiler is not None:
+                profiler.lap(SLEEP)
+                profiler.end_frame()
         
         # Clean up
         self.sound_manager.stop_all()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"🎞️ Recorded {self.recorder.ticks} steps to {self.recorder.path} (seed {self.seed})")
+        if self.connector:
+            self.connector.cancel()
+        if self.hub is not None:
+            self.hub.stop()
+            print("📉 Dropped MPU samples per board: " +
+                  ", ".join(f"{device.port} {device.dropped}" for device in self.hub.devices))
+        if self.serial_reader:
+            self.serial_reader.stop()
+            print(f"📉 Dropped MPU samples: {self.serial_reader.dropped} "
+                  f"({self.serial_reader.malformed} malformed)")
         if self.ser:
             self.ser.close()
+        self.report_pacing()
+        if self.tracer is not None:
+            self.report_latency()
+        if self.profiler is not None:
+            self.profiler.uninstrument()
+            if self.profile_path:
+                self.report_profile()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MPU6050 tilt game")
+    parser.add_argument('--port', default=SERIAL_PORT,
+                        help="serial port of the board, e.g. COM6, /dev/ttyUSB0 or a mpu_sim.py pty, or "
+                             "shm:NAME to read from a sensor_hub.py process (default: $MPU_PORT or COM6)")
+    parser.add_argument('--ports', nargs='+', metavar='PORT',
+                        help="one board per player, all read by one thread (Linux/macOS); "
+                             "the first one is player 1")
+    parser.add_argument('--trace-latency', metavar='PATH',
+                        help="time tilt input from serial arrival to display and write "
+                             "p50/p95/p99 histograms to PATH (JSON, raw records next to it as .npy)")
+    parser.add_argument('--fusion', choices=['complementary', 'madgwick', 'mahony'],
+                        help="ask the board for raw accelerometer/gyro data and fuse it here with this "
+                             "filter (needs raw-mode firmware; older boards fall back to binary)")
+    parser.add_argument('--seed', type=int, help="seed for every random draw of the game (default: a fresh one)")
+    parser.add_argument('--record', metavar='PATH',
+                        help="log every simulation step's input and state to PATH, to re-simulate or seek "
+                             "with recording.py")
+    parser.add_argument('--pacing', choices=PACING_MODES, default=FRAME_PACING,
+                        help="frame cap: sleep then spin to each frame's deadline, or pygame's Clock.tick "
+                             "(to compare their frame-time variance, printed on exit)")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="time each frame's events/input/update/draw/present/sleep phases and dump "
+                             "them to PATH on exit (.npz, otherwise CSV); F3 shows the overlay")
+    args = parser.parse_args()
+    
     print("🎵 Starting MPU6050 Tilt Game with SOUND EFFECTS!")
     print("📋 Sound Features:")
     print("   - Movement whooshes")
@@ -596,6 +1104,8 @@ if __name__ == "__main__":
     print("   - Game start/end sounds")
     print("   - Enemy spawn sounds")
     print("   - Press M to mute/unmute")
+    print("   - Press F3 for the frame profiler")
     
-    game = Game()
+    game = Game(port=args.port, trace_latency=args.trace_latency, profile=args.profile, fusion=args.fusion,
+                ports=args.ports, seed=args.seed, record=args.record, pacing=args.pacing)
     game.run()
\ No newline at end of file
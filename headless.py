@@ -0,0 +1,94 @@
+"""Run the game simulation without a window, audio device or sensor.
+
+Importing this module selects SDL's dummy video and audio drivers before
+pygame starts, so it must be imported before ``game``:
+
+    from headless import HeadlessGame, ScriptedInput
+    sim = HeadlessGame(enemy_count=1000, inputs=ScriptedInput('circle'))
+    sim.run_ticks(10_000)
+"""
+import math
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+from game import ENEMY_COUNT, Game
+
+
+class NullSoundManager:
+    """SoundManager stand-in that plays nothing"""
+
+    def __init__(self):
+        self.sounds = {}
+        self.played = 0
+
+    def play(self, sound_name, volume=1.0):
+        self.played += 1
+
+    def stop_all(self):
+        pass
+
+
+class ScriptedInput:
+    """Deterministic per-tick (dx, dy) input in place of keyboard or tilt.
+
+    pattern is 'idle', 'circle' (steady orbit), 'random' (seeded random
+    walk), a callable tick -> (dx, dy), or an (n, 2) array replayed in a
+    loop.
+    """
+
+    def __init__(self, pattern='circle', seed=0, period=240):
+        self.pattern = pattern
+        self.period = period
+        self.rng = np.random.default_rng(seed)
+        self.heading = 0.0
+
+    def __call__(self, tick):
+        pattern = self.pattern
+        if callable(pattern):
+            return pattern(tick)
+        if isinstance(pattern, np.ndarray):
+            dx, dy = pattern[tick % len(pattern)]
+            return float(dx), float(dy)
+        if pattern == 'circle':
+            angle = 2 * math.pi * tick / self.period
+            return math.cos(angle), math.sin(angle)
+        if pattern == 'random':
+            self.heading += self.rng.normal(0.0, 0.3)
+            return math.cos(self.heading), math.sin(self.heading)
+        return 0.0, 0.0
+
+
+class HeadlessGame(Game):
+    """Game driven by scripted input, stepped as fast as the CPU allows"""
+
+    def __init__(self, enemy_count=ENEMY_COUNT, inputs=None, seed=None, record=None):
+        super().__init__(sound_manager=NullSoundManager(), enemy_count=enemy_count,
+                         connect_sensor=False, seed=seed, record=record, effects=False)
+        self.inputs = inputs or ScriptedInput()
+        self.ticks = 0
+        self.collisions = 0
+
+    def handle_input(self):
+        self.move_dx, self.move_dy = self.inputs(self.ticks)
+
+    def tick(self):
+        """One input poll plus one fixed simulation step"""
+        self.handle_input()
+        self.step()
+        self.sound_queue.update()
+        self.ticks += 1
+
+    def run_ticks(self, n, keep_going=True):
+        """Run n ticks; with keep_going a collision is counted, not fatal"""
+        for _ in range(n):
+            self.tick()
+            if self.game_over:
+                self.collisions += 1
+                if not keep_going:
+                    break
+                self.game_over = False
+        return self.ticks
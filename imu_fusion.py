@@ -0,0 +1,323 @@
+"""Pitch/roll from raw MPU6050 samples, fused on the host.
+
+In raw mode game.ino skips its 100 Hz complementary filter and streams
+accelerometer and gyroscope counts at ~500 Hz (see RawDecoder). A
+SensorFusion turns every batch of those records into (pitch, roll, seq)
+rows, the same records BinaryDecoder produces, so the rest of the game
+doesn't know the difference:
+
+    fusion = SensorFusion('madgwick')
+    negotiator = ProtocolNegotiator(ser, fusion=fusion)
+
+Each batch goes through GyroBias, which removes the gyro's zero-rate
+offset and keeps re-estimating it while the board is still, and then one
+filter:
+
+- ComplementaryFilter: game.ino's filter with a time constant instead of
+  a per-sample factor, solved for the whole batch at once
+- MadgwickFilter, MahonyFilter: quaternion filters that stay right at
+  large tilts; the per-batch work (normalizing, unit conversion, angles)
+  is vectorized, only the quaternion recursion steps sample by sample
+
+Angles follow game.ino: roll about x (atan2(ay, az)), pitch about y
+(atan2(-ax, hypot(ay, az))), in degrees.
+"""
+import math
+
+import numpy as np
+
+DEG = math.pi / 180.0
+MAX_DT = 0.05           # longest gap integrated across, e.g. after a reconnect
+BLOCK = 128             # complementary filter samples solved per closed-form block
+
+
+def accel_angles(accel):
+    """(pitch, roll) in degrees for accelerometer rows (ax, ay, az)"""
+    ax, ay, az = accel[:, 0], accel[:, 1], accel[:, 2]
+    pitch = np.degrees(np.arctan2(-ax, np.hypot(ay, az)))
+    roll = np.degrees(np.arctan2(ay, az))
+    return np.stack((pitch, roll), axis=1)
+
+
+def quaternion_angles(q):
+    """(pitch, roll) in degrees for rows of unit quaternions (w, x, y, z)"""
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    pitch = np.degrees(np.arcsin(np.clip(2.0 * (w * y - x * z), -1.0, 1.0)))
+    roll = np.degrees(np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)))
+    return np.stack((pitch, roll), axis=1)
+
+
+def tilt_quaternion(pitch, roll):
+    """Unit quaternion (w, x, y, z) for a tilt in degrees, no heading"""
+    cp, sp = math.cos(pitch * DEG / 2), math.sin(pitch * DEG / 2)
+    cr, sr = math.cos(roll * DEG / 2), math.sin(roll * DEG / 2)
+    return [cr * cp, sr * cp, cr * sp, -sr * sp]
+
+
+def imu_from_tilt(pitch, roll, pitch_rate, roll_rate):
+    """What the sensor reads while tilting without turning: (accel in g,
+    gyro in °/s) for arrays of angles (degrees) and their rates (°/s)"""
+    theta, phi = np.radians(pitch), np.radians(roll)
+    accel = np.stack((-np.sin(theta), np.cos(theta) * np.sin(phi), np.cos(theta) * np.cos(phi)), axis=-1)
+    gyro = np.stack((roll_rate, pitch_rate * np.cos(phi), -pitch_rate * np.sin(phi)), axis=-1)
+    return accel, gyro
+
+
+class GyroBias:
+    """Zero-rate offset of the gyro, learned while the board is still.
+
+    The first ``warmup`` seconds of samples with 1 g on the accelerometer
+    and less than ``max_bias`` on every gyro axis are averaged, like
+    game.ino's startup calibration (the waiting screen asks for the sensor
+    to be kept still). After that the estimate follows drift with a
+    ``time_constant`` moving average over samples that are still by both
+    the accelerometer and the corrected gyro.
+    """
+
+    def __init__(self, warmup=0.5, still_accel=0.03, still_rate=1.5, max_bias=10.0, time_constant=10.0):
+        self.warmup = warmup
+        self.still_accel = still_accel
+        self.still_rate = still_rate
+        self.max_bias = max_bias
+        self.time_constant = time_constant
+        self.bias = np.zeros(3)
+        self.still_time = 0.0   # seconds of still samples learned from
+        self.still_samples = 0
+
+    @property
+    def calibrated(self):
+        return self.still_time >= self.warmup
+
+    def update(self, accel, gyro, dt):
+        """The batch's gyro rows with the bias removed"""
+        still = np.abs(np.sqrt(np.einsum('ij,ij->i', accel, accel)) - 1.0) < self.still_accel
+        if self.calibrated:
+            still &= (np.abs(gyro - self.bias) < self.still_rate).all(axis=1)
+        else:
+            still &= (np.abs(gyro) < self.max_bias).all(axis=1)
+        m = int(np.count_nonzero(still))
+        if m:
+            seconds = float(dt[still].sum())
+            if self.calibrated:
+                k = 1.0 - math.exp(-seconds / self.time_constant)
+            else:
+                # Plain running mean until the warm-up is done
+                k = m / (self.still_samples + m)
+            self.bias += k * (gyro[still].mean(axis=0) - self.bias)
+            self.still_time += seconds
+            self.still_samples += m
+        return gyro - self.bias
+
+
+class ComplementaryFilter:
+    """game.ino's filter: integrate the gyro, pull toward the accelerometer.
+
+    ``time_constant`` replaces the board's alpha = 0.98 per 10 ms sample
+    (0.49 s), so the filter behaves the same at any sample rate. Each step
+    is angle = a * (angle + rate * dt) + (1 - a) * accel_angle, a linear
+    recursion, so a batch is solved in closed form with cumulative
+    products and sums in blocks of BLOCK samples.
+    """
+
+    def __init__(self, time_constant=0.49):
+        self.time_constant = time_constant
+        self.angles = None      # (pitch, roll) after the last sample
+
+    def update(self, accel, gyro, dt):
+        measured = accel_angles(accel)
+        if self.angles is None:
+            self.angles = measured[0].copy()
+        # Body rates to pitch/roll rates, using the accelerometer's tilt
+        phi = np.radians(measured[:, 1])
+        rates = np.stack((gyro[:, 1] * np.cos(phi) - gyro[:, 2] * np.sin(phi), gyro[:, 0]), axis=1)
+
+        a = self.time_constant / (self.time_constant + dt)
+        u = (a * dt)[:, None] * rates + (1.0 - a)[:, None] * measured
+        out = np.empty_like(measured)
+        angles = self.angles
+        for start in range(0, len(a), BLOCK):
+            block = slice(start, start + BLOCK)
+            p = np.cumprod(a[block])[:, None]
+            out[block] = p * (angles + np.cumsum(u[block] / p, axis=0))
+            angles = out[min(start + BLOCK, len(a)) - 1]
+        self.angles = angles.copy()
+        return out
+
+
+class MadgwickFilter:
+    """Madgwick's gradient-descent orientation filter (accelerometer + gyro).
+
+    ``beta`` (rad/s) is how hard each step pulls toward the accelerometer;
+    larger converges faster and passes more accelerometer noise.
+    """
+
+    def __init__(self, beta=0.1):
+        self.beta = beta
+        self.q = None   # [w, x, y, z]
+
+    def update(self, accel, gyro, dt):
+        if self.q is None:
+            self.q = tilt_quaternion(*accel_angles(accel[:1])[0])
+        norm = np.sqrt(np.einsum('ij,ij->i', accel, accel))
+        accel = accel / np.where(norm > 0, norm, 1.0)[:, None]
+        rows = np.column_stack((accel, gyro * DEG, dt)).tolist()
+        out = np.empty((len(rows), 4))
+        beta = self.beta
+        q0, q1, q2, q3 = self.q
+        for i, (ax, ay, az, gx, gy, gz, h) in enumerate(rows):
+            d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+            d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+            d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+            d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+            # Gradient of the gravity direction error
+            q0q0, q1q1, q2q2, q3q3 = q0 * q0, q1 * q1, q2 * q2, q3 * q3
+            s0 = 4 * q0 * q2q2 + 2 * q2 * ax + 4 * q0 * q1q1 - 2 * q1 * ay
+            s1 = 4 * q1 * q3q3 - 2 * q3 * ax + 4 * q0q0 * q1 - 2 * q0 * ay - 4 * q1 + 8 * q1 * q1q1 \
+                + 8 * q1 * q2q2 + 4 * q1 * az
+            s2 = 4 * q0q0 * q2 + 2 * q0 * ax + 4 * q2 * q3q3 - 2 * q3 * ay - 4 * q2 + 8 * q2 * q1q1 \
+                + 8 * q2 * q2q2 + 4 * q2 * az
+            s3 = 4 * q1q1 * q3 - 2 * q1 * ax + 4 * q2q2 * q3 - 2 * q2 * ay
+            n = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if n > 0:
+                n = beta / n
+                d0 -= n * s0
+                d1 -= n * s1
+                d2 -= n * s2
+                d3 -= n * s3
+            q0 += d0 * h
+            q1 += d1 * h
+            q2 += d2 * h
+            q3 += d3 * h
+            n = 1.0 / math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+            q0, q1, q2, q3 = q0 * n, q1 * n, q2 * n, q3 * n
+            out[i] = q0, q1, q2, q3
+        self.q = [q0, q1, q2, q3]
+        return quaternion_angles(out)
+
+
+class MahonyFilter:
+    """Mahony's complementary filter on the rotation group (accelerometer + gyro).
+
+    The accelerometer error feeds back into the gyro rate with gain ``kp``
+    and, if ``ki`` > 0, through an integral that soaks up residual gyro
+    bias.
+    """
+
+    def __init__(self, kp=1.0, ki=0.0):
+        self.kp = kp
+        self.ki = ki
+        self.q = None
+        self.integral = [0.0, 0.0, 0.0]
+
+    def update(self, accel, gyro, dt):
+        if self.q is None:
+            self.q = tilt_quaternion(*accel_angles(accel[:1])[0])
+        norm = np.sqrt(np.einsum('ij,ij->i', accel, accel))
+        accel = accel / np.where(norm > 0, norm, 1.0)[:, None]
+        rows = np.column_stack((accel, gyro * DEG, dt)).tolist()
+        out = np.empty((len(rows), 4))
+        kp, ki = self.kp, self.ki
+        ix, iy, iz = self.integral
+        q0, q1, q2, q3 = self.q
+        for i, (ax, ay, az, gx, gy, gz, h) in enumerate(rows):
+            # Error between measured and estimated gravity direction
+            vx = q1 * q3 - q0 * q2
+            vy = q0 * q1 + q2 * q3
+            vz = q0 * q0 - 0.5 + q3 * q3
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+            if ki > 0:
+                ix += 2 * ki * ex * h
+                iy += 2 * ki * ey * h
+                iz += 2 * ki * ez * h
+                gx += ix
+                gy += iy
+                gz += iz
+            gx = (gx + 2 * kp * ex) * 0.5 * h
+            gy = (gy + 2 * kp * ey) * 0.5 * h
+            gz = (gz + 2 * kp * ez) * 0.5 * h
+            q0, q1, q2, q3 = (q0 - q1 * gx - q2 * gy - q3 * gz,
+                              q1 + q0 * gx + q2 * gz - q3 * gy,
+                              q2 + q0 * gy - q1 * gz + q3 * gx,
+                              q3 + q0 * gz + q1 * gy - q2 * gx)
+            n = 1.0 / math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+            q0, q1, q2, q3 = q0 * n, q1 * n, q2 * n, q3 * n
+            out[i] = q0, q1, q2, q3
+        self.q = [q0, q1, q2, q3]
+        self.integral = [ix, iy, iz]
+        return quaternion_angles(out)
+
+
+FILTERS = {
+    'complementary': ComplementaryFilter,
+    'madgwick': MadgwickFilter,
+    'mahony': MahonyFilter,
+}
+
+
+class SensorFusion:
+    """Raw IMU records in, (pitch, roll, seq) records out.
+
+    method is a FILTERS name; params go to the filter. bias=False trusts
+    the gyro as it is (for boards calibrated some other way).
+    """
+
+    def __init__(self, method='madgwick', bias=True, **params):
+        self.method = method
+        self.filter = FILTERS[method](**params)
+        self.bias = GyroBias() if bias else None
+        self.samples = 0
+
+    def process(self, records):
+        """(n, 8) RawDecoder records to (n, 3) (pitch, roll, seq) rows"""
+        accel = records[:, 0:3]
+        gyro = records[:, 3:6]
+        dt = np.minimum(records[:, 6], MAX_DT)
+        if self.bias is not None:
+            gyro = self.bias.update(accel, gyro, dt)
+        out = np.empty((len(records), 3))
+        out[:, 0:2] = self.filter.update(accel, gyro, dt)
+        out[:, 2] = records[:, 7]
+        self.samples += len(records)
+        return out
+
+    def wrap(self, decoder):
+        """A decoder whose records come out fused"""
+        return FusingDecoder(decoder, self)
+
+
+class FusingDecoder:
+    """RawDecoder plus SensorFusion: a drop-in for BinaryDecoder"""
+    fields = 3
+
+    def __init__(self, decoder, fusion):
+        self.decoder = decoder
+        self.fusion = fusion
+        self.empty = np.empty((0, 3), dtype=np.float64)
+
+    @property
+    def records(self):
+        return self.decoder.records
+
+    @property
+    def malformed(self):
+        return self.decoder.malformed
+
+    @property
+    def lost(self):
+        return self.decoder.lost
+
+    def reset(self):
+        self.decoder.reset()
+
+    def read_from(self, ser):
+        return self.fuse(self.decoder.read_from(ser))
+
+    def feed(self, data):
+        return self.fuse(self.decoder.feed(data))
+
+    def fuse(self, records):
+        if len(records) == 0:
+            return self.empty
+        return self.fusion.process(records)
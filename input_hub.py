@@ -0,0 +1,281 @@
+import os
+import selectors
+import threading
+import time
+
+import serial
+
+from serial_reader import SampleRing
+from wire_protocol import BinaryDecoder, ProtocolNegotiator, parse_many
+
+
+class InputDevice:
+    """One board on an InputHub: its port, connection state and samples.
+
+    ``ring`` is read by the game loop exactly like SerialReader.ring, and
+    ``player`` says whose movement the board drives. States go opening ->
+    handshake -> streaming, and to retrying after a failed open, a
+    handshake that timed out or a read error, until the hub tries again.
+    """
+
+    def __init__(self, port, player, fusion=None):
+        self.port = port
+        self.player = player
+        self.fusion = fusion
+        self.ring = SampleRing(fields=3)
+        self.state = 'opening'      # opening, handshake, streaming, retrying, closed
+        self.ser = None
+        self.fd = None
+        self.negotiator = None
+        self.decoder = None
+        self.protocol = None
+        self.due = 0.0              # monotonic time of the next open, or the handshake deadline
+        self.connects = 0           # times it got as far as streaming
+        self.error = None           # why the last attempt failed
+        self.reads = 0
+        self.bytes = 0
+
+    @property
+    def streaming(self):
+        return self.state == 'streaming'
+
+    @property
+    def malformed(self):
+        """Lines or frames that failed to decode"""
+        return self.decoder.malformed if self.decoder is not None else 0
+
+    @property
+    def lost(self):
+        """Frames missing from the board's sequence numbers (binary streams only)"""
+        return getattr(self.decoder, 'lost', 0) if self.decoder is not None else 0
+
+    @property
+    def dropped(self):
+        """Samples lost to malformed lines or ring overruns"""
+        return self.malformed + self.ring.overruns
+
+
+class InputHub(threading.Thread):
+    """Read any number of boards from one thread.
+
+    Every port is registered with one selector; the loop wakes when any of
+    them has bytes, reads each ready port once and decodes its stream into
+    that device's SampleRing (stamped with time.perf_counter(), as
+    SerialReader does). The handshake runs in the same loop, so a board
+    costs a file descriptor and a decoder, not a thread.
+
+    After each pass the loop waits until ``coalesce`` seconds have gone by
+    since the last wake-up, so busy boards are read in chunks of several
+    samples and the per-wake-up cost (select, Python dispatch) is shared by
+    every device. That bounds the wake-up rate whatever the device count,
+    at the price of up to ``coalesce`` seconds on the arrival stamps.
+    Binary streams read in the same pass are then decoded together (see
+    wire_protocol.parse_many), so a device adds little more than its read.
+
+    Needs ports the OS can select() on: serial devices and ptys on Linux
+    and macOS, not Windows COM ports (use SensorConnector/SerialReader).
+    """
+
+    def __init__(self, baud=115200, prefer_binary=True, handshake_timeout=5.0, retry_interval=1.0,
+                 coalesce=0.002, chunk=65536):
+        super().__init__(name='mpu-input-hub', daemon=True)
+        self.baud = baud
+        self.prefer_binary = prefer_binary
+        self.handshake_timeout = handshake_timeout
+        self.retry_interval = retry_interval
+        self.coalesce = coalesce
+        self.chunk = chunk
+        self.devices = []
+        self.selector = selectors.DefaultSelector()
+        self.wakeups = 0
+        self.cpu_time = 0.0         # seconds of CPU the loop has used
+        self.error = None           # what stopped the loop, if anything but stop()
+        self._lock = threading.Lock()
+        self._pending = []          # devices opened since the loop last looked
+        self._stop_event = threading.Event()
+        # Lets open() and stop() interrupt a select() that is waiting
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def open(self, port, player=None, fusion=None):
+        """Start connecting to a board; returns its InputDevice at once.
+
+        ``player`` defaults to the device's index. ``fusion`` is called for
+        a fresh imu_fusion.SensorFusion per handshake, as in SensorConnector.
+        """
+        with self._lock:
+            if player is None:
+                player = len(self.devices)
+            device = InputDevice(port, player, fusion)
+            self.devices.append(device)
+            self._pending.append(device)
+        self._wake()
+        return device
+
+    def device(self, player):
+        """The device driving a player, or None"""
+        for device in self.devices:
+            if device.player == player:
+                return device
+        return None
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        self._wake()
+        if self.is_alive():
+            self.join(timeout)
+        for device in self.devices:
+            self._close(device)
+            device.state = 'closed'
+        self.selector.close()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _wake(self):
+        try:
+            os.write(self._wake_w, b'\0')
+        except (BlockingIOError, OSError):
+            # Already has a wake-up pending (or we are shutting down)
+            pass
+
+    def run(self):
+        try:
+            self.loop()
+        except (OSError, ValueError) as e:
+            # The selector itself failed; the devices keep their last samples
+            self.error = e
+
+    def loop(self):
+        cpu_start = time.thread_time()
+        last_wake = time.monotonic()
+        while not self._stop_event.is_set():
+            timeout = self._service(time.monotonic())
+            events = self.selector.select(timeout)
+            self.wakeups += 1
+            batch = []
+            for key, _ in events:
+                if key.data is None:
+                    self._drain_wake()
+                else:
+                    self._read(key.data, batch)
+            if batch:
+                self._decode(batch)
+            self.cpu_time = time.thread_time() - cpu_start
+            if self.coalesce and events:
+                # Let the other boards catch up before the next pass
+                now = time.monotonic()
+                pause = last_wake + self.coalesce - now
+                if pause > 0:
+                    time.sleep(pause)
+                    now += pause
+                last_wake = now
+
+    def _drain_wake(self):
+        try:
+            while os.read(self._wake_r, 256):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _service(self, now):
+        """Open due ports, expire handshakes; seconds until the next such event"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for device in pending:
+            device.due = now
+        timeout = None
+        for device in self.devices:
+            if device.state in ('opening', 'retrying') and device.due <= now:
+                self._connect(device, now)
+            elif device.state == 'handshake' and device.due <= now:
+                self._fail(device, TimeoutError(f"no data from {device.port} in {self.handshake_timeout:.0f}s"),
+                           now)
+            if device.state in ('retrying', 'handshake'):
+                wait = max(device.due - now, 0.0)
+                timeout = wait if timeout is None else min(timeout, wait)
+        return timeout
+
+    def _connect(self, device, now):
+        device.state = 'opening'
+        try:
+            # timeout=0: reads return what has arrived and never block the loop
+            ser = serial.Serial(device.port, self.baud, timeout=0)
+            ser.reset_input_buffer()
+            fd = ser.fileno()
+        except (serial.SerialException, OSError, ValueError) as e:
+            self._fail(device, e, now)
+            return
+        device.ser, device.fd = ser, fd
+        fusion = device.fusion() if device.fusion is not None else None
+        device.negotiator = ProtocolNegotiator(ser, prefer_binary=self.prefer_binary, fusion=fusion)
+        device.decoder = None
+        device.state = 'handshake'
+        device.due = now + self.handshake_timeout
+        self.selector.register(fd, selectors.EVENT_READ, device)
+
+    def _fail(self, device, error, now):
+        device.error = error
+        self._close(device)
+        device.state = 'retrying'
+        device.due = now + self.retry_interval
+
+    def _close(self, device):
+        if device.fd is not None:
+            try:
+                self.selector.unregister(device.fd)
+            except (KeyError, ValueError, OSError):
+                pass
+            device.fd = None
+        if device.ser is not None:
+            device.ser.close()
+            device.ser = None
+        device.negotiator = None
+
+    def _read(self, device, batch):
+        """Read a ready port; binary bytes are left in ``batch`` for _decode()"""
+        try:
+            if device.state == 'handshake':
+                records = device.negotiator.poll()
+                if device.negotiator.decoder is not None:
+                    device.decoder = device.negotiator.decoder
+                    device.protocol = device.negotiator.protocol
+                    device.negotiator = None
+                    device.connects += 1
+                    device.state = 'streaming'
+            else:
+                data = os.read(device.fd, self.chunk)
+                device.reads += 1
+                device.bytes += len(data)
+                if not data:
+                    # Readable with nothing to read: the port is gone (unplugged, pty closed)
+                    self._fail(device, ConnectionError(f"{device.port} closed"), time.monotonic())
+                    return
+                decoder = device.decoder
+                if isinstance(decoder, BinaryDecoder) and decoder.append(data):
+                    batch.append((device, time.perf_counter()))
+                    return
+                records = decoder.feed(data)
+        except BlockingIOError:
+            return
+        except (serial.SerialException, OSError, TypeError) as e:
+            # The board went away; look for it again
+            self._fail(device, e, time.monotonic())
+            return
+        if len(records):
+            device.ring.push_many(time.perf_counter(), records)
+
+    def _decode(self, batch):
+        """Decode the binary bytes read this pass, one parse_many() per frame type"""
+        groups = {}
+        for device, stamp in batch:
+            groups.setdefault(type(device.decoder), []).append((device, stamp))
+        for group in groups.values():
+            results = parse_many([device.decoder for device, _ in group])
+            for (device, stamp), records in zip(group, results):
+                if len(records):
+                    device.ring.push_many(stamp, records)
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+import numpy as np
+
+# One row per presented frame that carried new sensor input. Times are
+# time.perf_counter() seconds, the clock SerialReader stamps arrivals with.
+TRACE_DTYPE = np.dtype([
+    ('frame', '<u8'),           # frame number, counting every presented frame
+    ('samples', '<u4'),         # sensor samples that frame consumed
+    ('seq', '<f8'),             # board sample counter of the newest one (NaN if none)
+    ('arrival_first', '<f8'),   # serial arrival of the oldest sample
+    ('arrival_last', '<f8'),    # serial arrival of the newest sample
+    ('consumed', '<f8'),        # first simulation step that applied them
+    ('presented', '<f8'),       # display flip/update that showed the result
+])
+
+# (name, start column, end column) of each latency reported
+STAGES = (
+    ('arrival_to_consume', 'arrival_last', 'consumed'),
+    ('consume_to_present', 'consumed', 'presented'),
+    ('arrival_to_present', 'arrival_last', 'presented'),
+    ('oldest_to_present', 'arrival_first', 'presented'),
+)
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyTracer:
+    """Sensor-to-photon timing of tilt input, one record per frame.
+
+    The game loop reports three moments: input() when it reads samples off
+    the SampleRing (their arrival stamps come along), consumed() when a
+    simulation step applies them, and presented() right after the display
+    flip or update. Records go into a preallocated ring of ``capacity``
+    frames, so tracing allocates nothing per frame; once full, the oldest
+    records are overwritten. "Presented" is when flip returns, which is as
+    close to the photons as pygame can see.
+    """
+
+    def __init__(self, capacity=1 << 16, time_source=time.perf_counter):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.records = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.mask = capacity - 1
+        self.time_source = time_source
+        self.written = 0
+        self.frames = 0
+        # One view per field, so filling a record indexes arrays in place
+        self._columns = {name: self.records[name] for name in TRACE_DTYPE.names}
+        # Input read but not yet recorded
+        self._samples = 0
+        self._seq = np.nan
+        self._first = np.nan
+        self._last = np.nan
+        self._consumed = False  # a record is written, waiting for presented()
+
+    def __len__(self):
+        return min(self.written, len(self.records))
+
+    def input(self, samples):
+        """Samples read this frame: SampleRing rows (ts, pitch, roll[, seq])"""
+        if len(samples) == 0:
+            return
+        if self._samples == 0:
+            self._first = samples[0, 0]
+        # Read twice before a step applied it: one record for both
+        self._samples += len(samples)
+        self._seq = samples[-1, 3] if samples.shape[1] > 3 else np.nan
+        self._last = samples[-1, 0]
+
+    def consumed(self):
+        """A simulation step just applied the latest input"""
+        if self._samples == 0 or self._consumed:
+            return
+        i = self.written & self.mask
+        columns = self._columns
+        columns['samples'][i] = self._samples
+        columns['seq'][i] = self._seq
+        columns['arrival_first'][i] = self._first
+        columns['arrival_last'][i] = self._last
+        columns['consumed'][i] = self.time_source()
+        # Anything read from here on goes into the next record
+        self._samples = 0
+        self._consumed = True
+
+    def presented(self):
+        """The frame showing the latest consumed input is on the display"""
+        now = self.time_source()
+        self.frames += 1
+        if not self._consumed:
+            return
+        i = self.written & self.mask
+        self._columns['frame'][i] = self.frames
+        self._columns['presented'][i] = now
+        self.written += 1
+        self._consumed = False
+
+    def rows(self):
+        """Recorded frames, oldest first"""
+        n = len(self)
+        start = self.written - n
+        return self.records.take(np.arange(start, self.written) & self.mask)
+
+    def latencies(self):
+        """{stage: latencies in seconds} for every recorded frame"""
+        rows = self.rows()
+        return {name: rows[end] - rows[start] for name, start, end in STAGES}
+
+    def summary(self):
+        """{stage: {'p50', 'p95', 'p99', 'max', 'mean'}} in milliseconds"""
+        out = {}
+        for name, values in self.latencies().items():
+            ms = values * 1000
+            if len(ms) == 0:
+                out[name] = {}
+                continue
+            stats = {f'p{p}': float(v) for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES))}
+            stats['max'] = float(ms.max())
+            stats['mean'] = float(ms.mean())
+            out[name] = stats
+        return out
+
+    def histograms(self, bin_ms=1.0, max_ms=200.0):
+        """{stage: counts per bin_ms bin}; the last bin collects everything slower"""
+        edges = np.arange(0.0, max_ms + bin_ms, bin_ms)
+        edges[-1] = np.inf
+        out = {}
+        for name, values in self.latencies().items():
+            counts, _ = np.histogram(np.maximum(values * 1000, 0.0), edges)
+            out[name] = counts.tolist()
+        return out
+
+    def export(self, path, bin_ms=1.0, max_ms=200.0):
+        """Write percentiles and histograms as JSON, and the raw records
+        next to it as .npy for correlating with device-side timing by seq"""
+        report = {
+            'frames': self.frames,
+            'traced_frames': len(self),
+            'samples': int(self.rows()['samples'].sum()),
+            'percentiles_ms': self.summary(),
+            'histogram_bin_ms': bin_ms,
+            'histograms': self.histograms(bin_ms, max_ms),
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=1)
+        np.save(os.path.splitext(path)[0] + '.npy', self.rows())
+        return report
@@ -0,0 +1,136 @@
+import numpy as np
+
+NEWLINE_TO_COMMA = bytes.maketrans(b'\n', b',')
+NEWLINE, COMMA = ord('\n'), ord(',')
+# Blocks with fewer lines than this are parsed line by line: below it the
+# NumPy pass costs more than it saves (serial reads bring tens of bytes)
+BULK_MIN_LINES = 16
+# Below this many lines a failed bulk parse goes line by line
+BISECT_MIN_LINES = 32
+
+
+class LineFramer:
+    """Incremental framer for the ``pitch,roll\\r\\n`` text stream.
+
+    Received bytes accumulate in one reusable bytearray. Each call parses
+    every complete line and keeps the trailing partial line for the next
+    read, so nothing is lost at chunk boundaries. A few lines (what a serial
+    read usually brings) are parsed one by one; a backlog of them in a
+    single NumPy pass.
+    Lines that don't parse are counted in ``malformed`` instead of being
+    swallowed.
+    """
+
+    def __init__(self, capacity=65536, fields=2):
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.fill = 0
+        self.fields = fields
+        self.empty = np.empty((0, fields), dtype=np.float64)
+        self.records = 0    # records successfully parsed
+        self.malformed = 0  # non-empty lines that failed to parse
+        self.overflows = 0  # times the buffer filled without a newline
+
+    def reset(self):
+        """Forget any buffered partial line"""
+        self.fill = 0
+
+    def read_from(self, ser):
+        """Read what the port has straight into the buffer and parse it"""
+        free = len(self.buffer) - self.fill
+        want = min(max(1, ser.in_waiting), free)
+        got = ser.readinto(self.view[self.fill:self.fill + want])
+        if not got:
+            return self.empty
+        self.fill += got
+        return self.parse()
+
+    def feed(self, data):
+        """Append received bytes and return every complete record"""
+        n = len(data)
+        if n <= len(self.buffer) - self.fill:
+            # The usual case: the read fits
+            self.buffer[self.fill:self.fill + n] = data
+            self.fill += n
+            return self.parse()
+        data = memoryview(data)
+        out = []
+        while len(data):
+            take = min(len(data), len(self.buffer) - self.fill)
+            self.view[self.fill:self.fill + take] = data[:take]
+            self.fill += take
+            data = data[take:]
+            out.append(self.parse())
+        if len(out) == 1:
+            return out[0]
+        return np.concatenate(out) if out else self.empty
+
+    def parse(self):
+        """Parse the complete-line region and keep the partial tail"""
+        end = self.buffer.rfind(b'\n', 0, self.fill)
+        if end < 0:
+            if self.fill == len(self.buffer):
+                # A whole buffer without a newline can't be a record: resync
+                self.overflows += 1
+                self.malformed += 1
+                self.fill = 0
+            return self.empty
+
+        end += 1
+        records = self.parse_block(self.view[:end].tobytes())
+
+        # Move the partial line to the front for the next read
+        tail = self.fill - end
+        if tail:
+            self.buffer[:tail] = self.buffer[end:self.fill]
+        self.fill = tail
+        self.records += len(records)
+        return records
+
+    def parse_block(self, lines):
+        """Bulk-parse a block of lines, bisecting around malformed ones"""
+        count = lines.count(b'\n')
+        if count < BULK_MIN_LINES:
+            return self.parse_lines(lines)
+        # One comma per line means the shape is right; let NumPy do the rest
+        if lines.count(b',') == count * (self.fields - 1) and self.shaped(lines):
+            # The block ends in a newline, so drop the empty field after it
+            tokens = lines.translate(NEWLINE_TO_COMMA)[:-1].split(b',')
+            try:
+                values = np.array(tokens, dtype=np.float64)
+            except ValueError:
+                values = None
+            if values is not None and len(values) == count * self.fields:
+                return values.reshape(count, self.fields)
+
+        if count <= BISECT_MIN_LINES:
+            return self.parse_lines(lines)
+        # Keep the clean half on the fast path
+        mid = lines.index(b'\n', len(lines) // 2 - 1) + 1
+        if mid >= len(lines):
+            return self.parse_lines(lines)
+        return np.concatenate((self.parse_block(lines[:mid]), self.parse_block(lines[mid:])))
+
+    def shaped(self, lines):
+        """True when every line has exactly fields - 1 commas, given that the block as a whole does"""
+        raw = np.frombuffer(lines, dtype=np.uint8)
+        # Separators in order: fields - 1 commas, then the newline, per line
+        separators = raw[(raw == COMMA) | (raw == NEWLINE)]
+        return bool((separators.reshape(-1, self.fields)[:, -1] == NEWLINE).all())
+
+    def parse_lines(self, lines):
+        """Line-by-line fallback that counts what it has to drop"""
+        rows = []
+        fields = self.fields
+        for line in lines.split(b'\n'):
+            parts = line.split(b',')
+            if len(parts) == fields:
+                try:
+                    rows.append(list(map(float, parts)))
+                    continue
+                except ValueError:
+                    pass
+            elif not line.strip():
+                continue
+            self.malformed += 1
+        return np.array(rows, dtype=np.float64) if rows else self.empty
@@ -0,0 +1,360 @@
+"""Hardware-free stand-in for the MPU6050 board.
+
+VirtualMPU opens a pseudo-terminal and behaves like game.ino on the other
+end: it streams ``pitch,roll`` CSV lines and switches to binary frames, or
+to raw accelerometer/gyro frames, when the host asks for them. Raw frames
+are what the sensor would read at each tilt, with noise and a gyro bias
+added. Samples come from a synthetic motion function or
+from a capture recorded off a real board. Point the game at
+``VirtualMPU.port``.
+
+Captures are flat binary files: a 16-byte header followed by fixed-size
+(t, pitch, roll) records, so they can be memory-mapped and appended to
+without rewriting anything.
+
+    python mpu_sim.py serve --rate 200 --jitter 0.002 --corrupt 0.01
+    python mpu_sim.py record --port COM6 --seconds 60 session.mpucap
+    python mpu_sim.py serve --replay session.mpucap --speed max
+"""
+import argparse
+import math
+import os
+import pty
+import random
+import select
+import threading
+import time
+import tty
+
+import numpy as np
+
+from imu_fusion import imu_from_tilt
+from wire_protocol import ACCEL_SENS, BINARY_ACK, GYRO_SENS, RAW_ACK, encode_frame, encode_raw_frame
+
+CAPTURE_MAGIC = b'MPUCAP\x00\x01'
+CAPTURE_HEADER = 16
+CAPTURE_DTYPE = np.dtype([('t', '<f8'), ('pitch', '<f4'), ('roll', '<f4')])
+# Sensor errors added to raw frames, in the MPU6050's typical range
+GYRO_BIAS = (1.5, -0.8, 0.3)    # °/s
+ACCEL_NOISE = 0.006             # g
+GYRO_NOISE = 0.08               # °/s
+
+
+def wobble(t):
+    """Default synthetic motion: a slow figure-eight tilt"""
+    return 20.0 * math.sin(t * 1.3), 25.0 * math.sin(t * 0.7)
+
+
+def load_capture(path):
+    """Memory-map a capture file as a CAPTURE_DTYPE array"""
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not an MPU capture")
+    size = os.path.getsize(path) - CAPTURE_HEADER
+    # A recorder that died mid-write can leave a partial record at the end
+    count = size // CAPTURE_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=CAPTURE_DTYPE)
+    return np.memmap(path, dtype=CAPTURE_DTYPE, mode='r', offset=CAPTURE_HEADER, shape=(count,))
+
+
+class CaptureRecorder:
+    """Append timestamped samples to a capture file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(CAPTURE_MAGIC.ljust(CAPTURE_HEADER, b'\x00'))
+        self.count = 0
+        self.t0 = None
+
+    def write(self, ts, records):
+        """Append rows of (pitch, roll) stamped with monotonic times ts"""
+        n = len(records)
+        if n == 0:
+            return
+        if self.t0 is None:
+            self.t0 = float(np.min(ts))
+        block = np.empty(n, dtype=CAPTURE_DTYPE)
+        block['t'] = np.asarray(ts) - self.t0
+        block['pitch'] = records[:, 0]
+        block['roll'] = records[:, 1]
+        self.file.write(block.tobytes())
+        self.count += n
+
+    def write_ring(self, rows):
+        """Append rows read from a SampleRing (ts, pitch, roll[, seq])"""
+        self.write(rows[:, 0], rows[:, 1:3])
+
+    def close(self):
+        self.file.close()
+
+
+class VirtualMPU:
+    """Pseudo-terminal device that speaks the game.ino protocols.
+
+    rate      samples per second for synthetic motion
+    jitter    standard deviation of send-time jitter in seconds
+    corrupt   probability that a sample's bytes are mangled on the wire
+    replay    capture array (see load_capture) to stream instead of source
+    speed     replay speed factor; None streams as fast as the host reads
+    csv_seq   append the sample counter to CSV lines, like CSV_SEQUENCE 1
+    raw_capable  answer 'R' with raw IMU frames (needs binary_capable)
+    gyro_bias, accel_noise, gyro_noise  sensor errors in raw frames (°/s, g)
+    """
+
+    def __init__(self, rate=100.0, source=wobble, binary_capable=True,
+                 jitter=0.0, corrupt=0.0, replay=None, speed=1.0, loop=False, seed=None,
+                 csv_seq=False, raw_capable=True, gyro_bias=GYRO_BIAS, accel_noise=ACCEL_NOISE,
+                 gyro_noise=GYRO_NOISE):
+        self.rate = rate
+        self.source = source
+        self.binary_capable = binary_capable
+        self.raw_capable = raw_capable and binary_capable
+        self.gyro_bias = np.asarray(gyro_bias, dtype=np.float64)
+        self.accel_noise = accel_noise
+        self.gyro_noise = gyro_noise
+        self.jitter = jitter
+        self.corrupt = corrupt
+        self.replay = replay
+        self.speed = speed
+        self.loop = loop
+        self.csv_seq = csv_seq
+        self.rng = random.Random(seed)
+        self.binary = False
+        self.raw = False
+        self.previous = None    # (t, pitch, roll) of the last raw sample
+        self.seq = 0
+        self.sent = 0
+        self.corrupted = 0
+        self.overflowed = 0  # samples dropped because the host wasn't reading
+        self.finished = threading.Event()
+
+        self.master, self.slave = pty.openpty()
+        # No echo or newline translation, like a real USB serial adapter
+        tty.setraw(self.slave)
+        # A full line discipline buffer drops samples instead of stalling us
+        os.set_blocking(self.master, False)
+        self.port = os.ttyname(self.slave)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name='virtual-mpu', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(1.0)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle_commands(self):
+        """Apply any 'B'/'C' commands the host wrote"""
+        while select.select([self.master], [], [], 0)[0]:
+            try:
+                data = os.read(self.master, 256)
+            except OSError:
+                return
+            if not data:
+                return
+            for c in data:
+                if c == ord('B') and self.binary_capable:
+                    self.send(BINARY_ACK, block=True)
+                    self.binary = True
+                    self.raw = False
+                    self.seq = 0
+                elif c == ord('R') and self.raw_capable:
+                    self.send(RAW_ACK, block=True)
+                    self.raw = True
+                    self.binary = False
+                    self.seq = 0
+                elif c == ord('C') and self.binary_capable:
+                    self.binary = self.raw = False
+                    self.send(b'#CSV\r\n', block=True)
+
+    def encode_raw(self, t, pitch, roll):
+        """A raw frame of what the sensor reads at this tilt"""
+        t0, pitch0, roll0 = self.previous or (t - 1.0 / self.rate, pitch, roll)
+        self.previous = t, pitch, roll
+        dt = max(t - t0, 1e-6)
+        accel, gyro = imu_from_tilt(pitch, roll, (pitch - pitch0) / dt, (roll - roll0) / dt)
+        gauss = self.rng.gauss
+        accel = [a + gauss(0.0, self.accel_noise) for a in accel]
+        gyro = [g + gauss(0.0, self.gyro_noise) for g in gyro + self.gyro_bias]
+        accel = [max(-32768, min(32767, round(a * ACCEL_SENS))) for a in accel]
+        gyro = [max(-32768, min(32767, round(g * GYRO_SENS))) for g in gyro]
+        data = encode_raw_frame(self.seq, accel, gyro, dt * 1e6)
+        self.seq = (self.seq + 1) & 0xFFFF
+        return data
+
+    def encode(self, t, pitch, roll):
+        if self.raw:
+            data = self.encode_raw(t, pitch, roll)
+        elif self.binary:
+            data = encode_frame(self.seq, pitch, roll)
+            self.seq = (self.seq + 1) & 0xFFFF
+        elif self.csv_seq:
+            data = b"%.3f,%.3f,%d\r\n" % (pitch, roll, self.seq)
+            self.seq = (self.seq + 1) & 0xFFFF
+        else:
+            data = b"%.3f,%.3f\r\n" % (pitch, roll)
+        if self.corrupt and self.rng.random() < self.corrupt:
+            mangled = bytearray(data)
+            mangled[self.rng.randrange(len(mangled))] ^= 1 << self.rng.randrange(8)
+            self.corrupted += 1
+            data = bytes(mangled)
+        return data
+
+    def send(self, data, block=False):
+        """Write to the host; drop (or wait, if block) when its buffer is full"""
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self.master, view)
+            except BlockingIOError:
+                if not block or self._stop_event.is_set():
+                    return False
+                select.select([], [self.master], [], 0.1)
+                continue
+            view = view[written:]
+        return True
+
+    def samples(self):
+        """Yield (send_time, pitch, roll) with send_time relative to start"""
+        if self.replay is None:
+            period = 1.0 / self.rate
+            i = 0
+            while True:
+                t = i * period
+                pitch, roll = self.source(t)
+                yield t, pitch, roll
+                i += 1
+        else:
+            offset = 0.0
+            while True:
+                for t, pitch, roll in self.replay:
+                    yield offset + float(t), float(pitch), float(roll)
+                if not self.loop or len(self.replay) == 0:
+                    return
+                offset += float(self.replay['t'][-1]) + 1.0 / self.rate
+
+    def run(self):
+        max_speed = self.speed is None
+        start = time.monotonic()
+        for t, pitch, roll in self.samples():
+            if self._stop_event.is_set():
+                break
+            self.handle_commands()
+            if not max_speed:
+                due = start + t / self.speed
+                if self.jitter:
+                    due += abs(self.rng.gauss(0.0, self.jitter))
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                # At max speed the host's read rate is the only clock
+                if self.send(self.encode(t, pitch, roll), block=max_speed):
+                    self.sent += 1
+                else:
+                    self.overflowed += 1
+            except OSError:
+                break
+        self.finished.set()
+
+
+def record(port, path, seconds, baud=115200):
+    """Record a real board's samples to a capture file"""
+    import serial
+    from serial_reader import SerialReader
+    from wire_protocol import ProtocolNegotiator
+
+    ser = serial.Serial(port, baud, timeout=0.1)
+    negotiator = ProtocolNegotiator(ser)
+    deadline = time.monotonic() + 5
+    while negotiator.decoder is None and time.monotonic() < deadline:
+        negotiator.poll()
+        time.sleep(0.01)
+    if negotiator.decoder is None:
+        raise SystemExit(f"❌ No MPU6050 data on {port}")
+
+    recorder = CaptureRecorder(path)
+    reader = SerialReader(ser, decoder=negotiator.decoder)
+    reader.start()
+    print(f"🔴 Recording {port} ({negotiator.protocol}) to {path} for {seconds}s...")
+    end = time.monotonic() + seconds
+    try:
+        while time.monotonic() < end:
+            time.sleep(0.05)
+            recorder.write_ring(reader.ring.read())
+    except KeyboardInterrupt:
+        pass
+    reader.stop()
+    recorder.write_ring(reader.ring.read())
+    recorder.close()
+    ser.close()
+    print(f"✅ Recorded {recorder.count} samples, dropped {reader.dropped}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Virtual MPU6050 board and capture tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help="stream samples on a pseudo-terminal")
+    serve.add_argument('--rate', type=float, default=100.0)
+    serve.add_argument('--jitter', type=float, default=0.0, help="send-time jitter (s)")
+    serve.add_argument('--corrupt', type=float, default=0.0, help="per-sample corruption probability")
+    serve.add_argument('--replay', help="capture file to replay")
+    serve.add_argument('--speed', default='1', help="replay speed factor or 'max'")
+    serve.add_argument('--loop', action='store_true', help="restart the replay when it ends")
+    serve.add_argument('--csv-only', action='store_true', help="behave like firmware without binary mode")
+    serve.add_argument('--csv-seq', action='store_true', help="append the sample counter to CSV lines")
+    serve.add_argument('--no-raw', action='store_true', help="behave like firmware without raw IMU mode")
+
+    rec = sub.add_parser('record', help="record a real board to a capture file")
+    rec.add_argument('--port', default='COM6')
+    rec.add_argument('--seconds', type=float, default=60.0)
+    rec.add_argument('path')
+
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        record(args.port, args.path, args.seconds)
+        return
+
+    device = VirtualMPU(
+        rate=args.rate,
+        binary_capable=not args.csv_only,
+        jitter=args.jitter,
+        corrupt=args.corrupt,
+        replay=load_capture(args.replay) if args.replay else None,
+        speed=None if args.speed == 'max' else float(args.speed),
+        loop=args.loop,
+        csv_seq=args.csv_seq,
+        raw_capable=not args.no_raw,
+    )
+    device.start()
+    print(f"🛰️ Virtual MPU6050 on {device.port} - run: python game.py --port {device.port}")
+    try:
+        while not device.finished.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    device.stop()
+    print(f"📤 Sent {device.sent} samples ({device.corrupted} corrupted, {device.overflowed} dropped)")
+
+
+if __name__ == '__main__':
+    main()
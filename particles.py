@@ -0,0 +1,179 @@
+import math
+
+import numpy as np
+import pygame
+
+
+def draw_squares(surface, x, y, rgb, size):
+    """Fill a size x size square at each top-left (x, y) straight in the surface's
+    pixels; rgb is one color or one per square. Squares not wholly on the
+    surface are skipped. Returns the Rect drawn over, or None.
+
+    24- and 32-bit surfaces are written through pygame.surfarray; other
+    depths have no view to write colors into and get one fill per square."""
+    width, height = surface.get_size()
+    px = np.asarray(x).astype(np.intp)
+    py = np.asarray(y).astype(np.intp)
+    rgb = np.asarray(rgb, dtype=np.uint32)
+
+    visible = (px >= 0) & (px <= width - size) & (py >= 0) & (py <= height - size)
+    if not visible.all():
+        if not visible.any():
+            return None
+        px, py = px[visible], py[visible]
+        if rgb.ndim > 1:
+            rgb = rgb[visible]
+    left, top = int(px.min()), int(py.min())
+    drawn = pygame.Rect(left, top, int(px.max()) - left + size, int(py.max()) - top + size)
+
+    bytesize = surface.get_bytesize()
+    if bytesize == 4:
+        # One mapped int per pixel, opaque on surfaces with per-pixel alpha
+        shift_r, shift_g, shift_b, _ = surface.get_shifts()
+        values = (rgb[..., 0] << shift_r) | (rgb[..., 1] << shift_g) | (rgb[..., 2] << shift_b)
+        values |= surface.get_masks()[3]
+        pixels = pygame.surfarray.pixels2d(surface)
+    elif bytesize == 3:
+        values = rgb.astype(np.uint8)
+        pixels = pygame.surfarray.pixels3d(surface)
+    else:
+        colors = np.broadcast_to(rgb, (len(px), 3)).tolist()
+        for left, top, color in zip(px.tolist(), py.tolist(), colors):
+            surface.fill(color, (left, top, size, size))
+        return drawn
+    for dx in range(size):
+        for dy in range(size):
+            pixels[px + dx, py + dy] = values
+    # The surface stays locked while the array exists
+    del pixels
+    return drawn
+
+
+class ParticleSystem:
+    """Short-lived visual particles as one preallocated structure of arrays.
+
+    Every particle lives in a slot of fixed-size arrays (position, velocity,
+    life, color). emit() takes slots off a free stack, update() advances
+    every live particle with a handful of array operations per simulation
+    tick and hands the slots of the ones that ran out back to the stack, so
+    nothing is allocated per particle. Work is limited to the slots below
+    the high-water mark of those in use, which drops back to zero whenever
+    the system empties. When every slot is taken, further emits are counted
+    in ``dropped`` instead of growing the arrays.
+
+    draw() writes the particles straight into the surface's pixels with
+    draw_squares(), one square of ``size`` pixels each, fading with their
+    remaining life, between their previous and current tick's positions
+    like the sprites. Particles are purely visual: they
+    have their own random generator and never touch the simulation's.
+    """
+
+    def __init__(self, capacity, drag=0.94, size=2, rng=None):
+        self.capacity = capacity
+        self.drag = drag
+        self.size = size
+        self.rng = rng or np.random.default_rng()
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.prev_x = np.zeros(capacity, dtype=np.float32)     # last tick's positions, for drawing
+        self.prev_y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)        # ticks left
+        self.lifetime = np.ones(capacity, dtype=np.float32)     # ticks at emission, for fading
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.live = np.zeros(capacity, dtype=bool)
+
+        # free[:free_count] are the free slots, the next one to use on top
+        self.free = np.arange(capacity)[::-1].copy()
+        self.free_count = capacity
+        self.high = 0           # no slot at or above this is live
+        self.dropped = 0
+
+        # Per-tick scratch space
+        self._dead = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        """Live particles"""
+        return self.capacity - self.free_count
+
+    def clear(self):
+        self.live[:self.high] = False
+        self.free = np.arange(self.capacity)[::-1].copy()
+        self.free_count = self.capacity
+        self.high = 0
+
+    def emit(self, x, y, count, color, speed=2.0, life=30, angle=0.0, spread=2 * math.pi):
+        """Burst of count particles from each point (x, y may be scalars or arrays).
+
+        Directions are spread around ``angle`` (radians), speeds range up to
+        ``speed`` pixels per tick and lifetimes from half to all of ``life``
+        ticks.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float32))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float32))
+        wanted = len(x) * count
+        n = min(wanted, self.free_count)
+        self.dropped += wanted - n
+        if n == 0:
+            return
+        slots = self.free[self.free_count - n:self.free_count]
+        self.free_count -= n
+
+        rng = self.rng
+        direction = angle + rng.uniform(-spread / 2, spread / 2, n)
+        velocity = speed * np.sqrt(rng.random(n))
+        self.x[slots] = np.repeat(x, count)[:n]
+        self.y[slots] = np.repeat(y, count)[:n]
+        self.prev_x[slots] = self.x[slots]
+        self.prev_y[slots] = self.y[slots]
+        self.vx[slots] = np.cos(direction) * velocity
+        self.vy[slots] = np.sin(direction) * velocity
+        self.life[slots] = life * rng.uniform(0.5, 1.0, n)
+        self.lifetime[slots] = self.life[slots]
+        self.color[slots] = color
+        self.live[slots] = True
+        self.high = max(self.high, int(slots.max()) + 1)
+
+    def update(self):
+        """Advance every live particle one tick and recycle the expired ones"""
+        high = self.high
+        if high == 0:
+            return
+        x, y, vx, vy = self.x[:high], self.y[:high], self.vx[:high], self.vy[:high]
+        life, live, dead = self.life[:high], self.live[:high], self._dead[:high]
+        self.prev_x[:high] = x
+        self.prev_y[:high] = y
+        x += vx
+        y += vy
+        vx *= self.drag
+        vy *= self.drag
+        life -= 1
+        np.less_equal(life, 0, out=dead)
+        dead &= live
+        expired = np.flatnonzero(dead)
+        if len(expired):
+            live[expired] = False
+            self.free[self.free_count:self.free_count + len(expired)] = expired
+            self.free_count += len(expired)
+        if self.free_count == self.capacity:
+            self.clear()
+
+    def draw(self, surface, alpha=1.0):
+        """Rasterize the live particles alpha of the way from the previous tick
+        to the current one; returns the Rect drawn over, or None"""
+        if len(self) == 0:
+            return None
+        idx = np.flatnonzero(self.live[:self.high])
+        fade = self.life[idx] / self.lifetime[idx]
+        x, y = self.x[idx], self.y[idx]
+        if alpha != 1.0:
+            prev_x, prev_y = self.prev_x[idx], self.prev_y[idx]
+            x -= prev_x
+            x *= alpha
+            x += prev_x
+            y -= prev_y
+            y *= alpha
+            y += prev_y
+        return draw_squares(surface, x, y, self.color[idx] * fade[:, None], self.size)
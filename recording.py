@@ -0,0 +1,380 @@
+"""Game recordings: every tick's input and state, seekable to any tick.
+
+A recording is one append-only file, like an mpu_sim capture:
+
+    header  64 bytes: magic, seed, players, enemies, keyframe interval, options
+    blocks  16-byte block header (kind, first tick, payload size), then payload:
+            KEYF  a Snapshot of the state before that tick's step
+            TICK  one TICK row per tick for the following keyframe interval
+    INDX    (tick, keyframe offset, tick block offset) per keyframe
+    footer  16 bytes: index magic and the INDX block's offset
+
+A keyframe starts every ``keyframe_interval`` ticks, so seeking to tick t
+reads keyframe t // interval through the index and re-simulates fewer
+than ``interval`` ticks from it, however long the recording. A file whose
+writer died has no index; it is rebuilt by walking the block headers.
+
+Each TICK row holds the inputs the step applied (float64, exactly as
+given, so re-simulating reproduces the run), flags, the score and player
+positions after the step and, unless disabled, every enemy's move since
+the previous tick quantized to 1/16 px. Those deltas are taken against the
+previous quantized position, so summing them from a keyframe rebuilds
+positions to within 1/32 px without drift and without simulating.
+
+    python game.py --record run.mpurec --seed 7
+    python recording.py run.mpurec --seek 1234
+"""
+import argparse
+import os
+import struct
+import time
+
+import numpy as np
+
+RECORDING_MAGIC = b'MPUREC\x00\x01'
+INDEX_MAGIC = b'MPUIDX\x00\x01'
+HEADER = struct.Struct('<8s16sIIII')    # magic, seed, players, enemies, keyframe interval, options
+HEADER_SIZE = 64
+BLOCK = struct.Struct('<4sIQ')          # kind, first tick, payload bytes
+FOOTER = struct.Struct('<8sQ')
+INDEX_DTYPE = np.dtype([('tick', '<u8'), ('keyframe', '<u8'), ('ticks', '<u8')])
+KEYFRAME, TICKS, INDEX = b'KEYF', b'TICK', b'INDX'
+
+OPT_ENEMY_DELTAS = 1
+DELTA_SCALE = 16.0      # enemy deltas in 1/16 px
+
+# Tick flags
+GAME_OVER = 1           # the round was over after the step
+RESTARTED = 2           # a new round started just before the step
+WAITING = 4             # still waiting for the sensor (nothing but the players moves)
+
+SNAPSHOT_HEAD = struct.Struct('<qqqIII16s16s16sII')
+# steps, round, score, flags, players, enemies, seed, rng state, rng inc, rng has_uint32, rng uinteger
+
+
+def seed_bytes(seed):
+    return int(seed).to_bytes(16, 'little')
+
+
+def tick_dtype(players, enemies, enemy_deltas=True):
+    fields = [
+        ('input', '<f8', (players, 2)),     # (dx, dy) each player's step applied
+        ('player', '<f4', (players, 2)),    # positions after the step
+        ('score', '<i8'),
+        ('flags', 'u1'),
+    ]
+    if enemy_deltas:
+        fields.append(('enemy', '<i2', (enemies, 2)))
+    return np.dtype(fields)
+
+
+class Snapshot:
+    """Everything a simulation step depends on, copied out of a Game.
+
+    ``players`` rows are (x, y, prev_x, prev_y, dx, dy); ``enemies`` rows
+    are x, y, prev_x, prev_y, size and speed. ``rng`` is the enemy
+    generator's bit_generator.state. See Game.snapshot() and restore().
+    """
+
+    def __init__(self, steps, round, score, flags, seed, players, enemies, rng):
+        self.steps = steps
+        self.round = round
+        self.score = score
+        self.flags = flags
+        self.seed = seed
+        self.players = players
+        self.enemies = enemies
+        self.rng = rng
+
+    def to_bytes(self):
+        if self.rng['bit_generator'] != 'PCG64':
+            raise ValueError(f"can't store {self.rng['bit_generator']} state")
+        state = self.rng['state']
+        head = SNAPSHOT_HEAD.pack(
+            self.steps, self.round, self.score, self.flags, len(self.players), self.enemies.shape[1],
+            seed_bytes(self.seed), state['state'].to_bytes(16, 'little'), state['inc'].to_bytes(16, 'little'),
+            self.rng['has_uint32'], self.rng['uinteger'])
+        return b''.join((head, self.players.tobytes(), self.enemies.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data):
+        (steps, round, score, flags, players, enemies, seed, state, inc, has_uint32,
+         uinteger) = SNAPSHOT_HEAD.unpack_from(data)
+        offset = SNAPSHOT_HEAD.size
+        player_rows = np.frombuffer(data, np.float64, players * 6, offset).reshape(players, 6).copy()
+        offset += player_rows.nbytes
+        enemy_rows = np.frombuffer(data, np.float64, enemies * 6, offset).reshape(6, enemies).copy()
+        rng = {
+            'bit_generator': 'PCG64',
+            'state': {'state': int.from_bytes(state, 'little'), 'inc': int.from_bytes(inc, 'little')},
+            'has_uint32': has_uint32,
+            'uinteger': uinteger,
+        }
+        return cls(steps, round, score, flags, int.from_bytes(seed, 'little'), player_rows, enemy_rows, rng)
+
+
+class Recorder:
+    """Append a Game's ticks to a recording.
+
+    Created before the first step (the first keyframe is the state then);
+    the game calls record() after every step. Rows go into a preallocated
+    block that is written out, with the next keyframe, once per interval,
+    so a tick costs one row copy and a keyframe one snapshot.
+    """
+
+    def __init__(self, path, game, keyframe_interval=60, enemy_deltas=True):
+        self.path = path
+        self.interval = keyframe_interval
+        snapshot = game.snapshot()
+        self.players = len(snapshot.players)
+        self.enemies = snapshot.enemies.shape[1]
+        self.enemy_deltas = enemy_deltas
+        self.dtype = tick_dtype(self.players, self.enemies, enemy_deltas)
+        self.rows = np.zeros(keyframe_interval, dtype=self.dtype)
+        self.fill = 0
+        self.first_tick = snapshot.steps
+        self.tick = snapshot.steps
+        self.index = []
+        self.file = open(path, 'wb')
+        header = HEADER.pack(RECORDING_MAGIC, seed_bytes(snapshot.seed), self.players, self.enemies,
+                             keyframe_interval, OPT_ENEMY_DELTAS if enemy_deltas else 0)
+        self.file.write(header.ljust(HEADER_SIZE, b'\x00'))
+        self.quantized = None
+        self.write_keyframe(snapshot)
+
+    def write_block(self, kind, tick, payload):
+        offset = self.file.tell()
+        self.file.write(BLOCK.pack(kind, tick, len(payload)))
+        self.file.write(payload)
+        return offset
+
+    def write_keyframe(self, snapshot):
+        offset = self.write_block(KEYFRAME, snapshot.steps, snapshot.to_bytes())
+        self.index.append((snapshot.steps, offset, 0))
+        if self.enemy_deltas:
+            self.quantized = np.rint(snapshot.enemies[:2] * DELTA_SCALE).astype(np.int64)
+
+    def record(self, game, restarted=False):
+        """Add the step the game just took"""
+        row = self.rows[self.fill]
+        row['input'][0] = (game.move_dx, game.move_dy)
+        if self.players > 1:
+            row['input'][1:] = game.other_moves
+        row['player'] = [(player.x, player.y) for player in game.players]
+        row['score'] = game.score
+        row['flags'] = ((GAME_OVER if game.game_over else 0) | (RESTARTED if restarted else 0) |
+                        (WAITING if game.waiting_for_sensor else 0))
+        if self.enemy_deltas:
+            enemies = game.enemies
+            quantized = np.rint(np.stack((enemies.x, enemies.y)) * DELTA_SCALE).astype(np.int64)
+            row['enemy'] = (quantized - self.quantized).T
+            self.quantized = quantized
+        self.fill += 1
+        self.tick += 1
+        if self.fill == self.interval:
+            self.flush()
+            self.write_keyframe(game.snapshot())
+
+    def flush(self):
+        """Write the buffered rows as a TICK block"""
+        if self.fill == 0:
+            return
+        offset = self.write_block(TICKS, self.tick - self.fill, self.rows[:self.fill].tobytes())
+        tick, keyframe, _ = self.index[-1]
+        self.index[-1] = (tick, keyframe, offset)
+        self.fill = 0
+
+    def close(self):
+        self.flush()
+        index = np.array(self.index, dtype=INDEX_DTYPE)
+        offset = self.write_block(INDEX, self.first_tick, index.tobytes())
+        self.file.write(FOOTER.pack(INDEX_MAGIC, offset))
+        self.file.close()
+
+    @property
+    def ticks(self):
+        return self.tick - self.first_tick
+
+
+class Recording:
+    """A recording file, memory-mapped: keyframes and tick rows by tick number"""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, seed, self.players, self.enemies, self.interval, options = HEADER.unpack_from(self.data)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a game recording")
+        self.seed = int.from_bytes(seed, 'little')
+        self.enemy_deltas = bool(options & OPT_ENEMY_DELTAS)
+        self.dtype = tick_dtype(self.players, self.enemies, self.enemy_deltas)
+        self.index = self.read_index()
+        if len(self.index) == 0:
+            raise ValueError(f"{path} has no keyframes")
+        self.first_tick = int(self.index['tick'][0])
+        last = self.index[-1]
+        self.end_tick = int(last['tick']) + (self.block_rows(int(last['ticks'])) if last['ticks'] else 0)
+
+    def read_index(self):
+        """The INDX block, or the block headers walked if the writer never closed"""
+        if len(self.data) >= HEADER_SIZE + FOOTER.size:
+            magic, offset = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                kind, _, size = BLOCK.unpack_from(self.data, offset)
+                return np.frombuffer(self.data, INDEX_DTYPE, size // INDEX_DTYPE.itemsize, offset + BLOCK.size)
+        index = []
+        offset = HEADER_SIZE
+        while offset + BLOCK.size <= len(self.data):
+            kind, tick, size = BLOCK.unpack_from(self.data, offset)
+            if offset + BLOCK.size + size > len(self.data):
+                break   # cut off mid-block
+            if kind == KEYFRAME:
+                index.append((tick, offset, 0))
+            elif kind == TICKS and index:
+                index[-1] = index[-1][:2] + (offset,)
+            offset += BLOCK.size + size
+        return np.array(index, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return self.end_tick - self.first_tick
+
+    def block_rows(self, offset):
+        return BLOCK.unpack_from(self.data, offset)[2] // self.dtype.itemsize
+
+    def entry(self, tick):
+        """Index row of the keyframe at or before tick"""
+        if not self.first_tick <= tick <= self.end_tick:
+            raise IndexError(f"tick {tick} is outside {self.first_tick}..{self.end_tick}")
+        return self.index[min((tick - self.first_tick) // self.interval, len(self.index) - 1)]
+
+    def keyframe(self, tick):
+        """Snapshot of the state before the step of the keyframe at or before tick"""
+        offset = int(self.entry(tick)['keyframe'])
+        _, _, size = BLOCK.unpack_from(self.data, offset)
+        start = offset + BLOCK.size
+        return Snapshot.from_bytes(self.data[start:start + size])
+
+    def block(self, tick):
+        """(first tick, TICK rows) of the block holding tick, as a view of the file"""
+        entry = self.entry(tick)
+        offset = int(entry['ticks'])
+        if offset == 0:
+            return int(entry['tick']), np.zeros(0, dtype=self.dtype)
+        return int(entry['tick']), np.frombuffer(self.data, self.dtype, self.block_rows(offset),
+                                                 offset + BLOCK.size)
+
+    def rows(self, start, stop):
+        """TICK rows for ticks start..stop-1"""
+        out = []
+        tick = start
+        while tick < stop:
+            first, rows = self.block(tick)
+            if len(rows) == 0:
+                break
+            out.append(rows[tick - first:stop - first])
+            tick = first + len(rows)
+        return np.concatenate(out) if out else np.zeros(0, dtype=self.dtype)
+
+    def enemy_positions(self, tick):
+        """(x, y) of every enemy after the step before tick, from the deltas (no simulation)"""
+        if not self.enemy_deltas:
+            raise ValueError("recorded without enemy deltas")
+        snapshot = self.keyframe(tick)
+        quantized = np.rint(snapshot.enemies[:2] * DELTA_SCALE)
+        rows = self.rows(snapshot.steps, tick)
+        if len(rows):
+            quantized += rows['enemy'].sum(axis=0, dtype=np.int64).T
+        return quantized / DELTA_SCALE
+
+
+def apply_tick(game, row):
+    """Replay one recorded step on a game in the state before it"""
+    flags = int(row['flags'])
+    if flags & RESTARTED:
+        game.restart()
+    game.waiting_for_sensor = bool(flags & WAITING)
+    inputs = row['input']
+    game.move_dx, game.move_dy = float(inputs[0, 0]), float(inputs[0, 1])
+    game.other_moves = [(float(dx), float(dy)) for dx, dy in inputs[1:]]
+    game.step()
+
+
+class Replay:
+    """Re-simulate a recording headless, from any tick, as fast as the CPU goes"""
+
+    def __init__(self, path):
+        self.recording = Recording(path)
+        self.game = None
+
+    def new_game(self):
+        # Imported here so reading a recording doesn't start pygame
+        from headless import HeadlessGame
+
+        game = HeadlessGame(enemy_count=self.recording.enemies)
+        game.handle_input = lambda: None
+        return game
+
+    def seek(self, tick):
+        """A game in exactly the state before the step of tick"""
+        recording = self.recording
+        snapshot = recording.keyframe(tick)
+        if self.game is None:
+            self.game = self.new_game()
+        self.game.restore(snapshot)
+        for row in recording.rows(snapshot.steps, tick):
+            apply_tick(self.game, row)
+        return self.game
+
+    def run(self, stop=None, check=True):
+        """Step from where seek() left off up to stop; with check, the first tick whose
+        score or player positions differ from the recording, else None"""
+        recording = self.recording
+        game = self.game
+        stop = recording.end_tick if stop is None else stop
+        tick = game.steps
+        while tick < stop:
+            rows = recording.rows(tick, min(stop, tick + recording.interval))
+            for row in rows:
+                apply_tick(game, row)
+                if check:
+                    positions = np.array([(player.x, player.y) for player in game.players], dtype=np.float32)
+                    if game.score != row['score'] or not np.array_equal(positions, row['player']):
+                        return game.steps - 1
+            tick += len(rows)
+            if len(rows) == 0:
+                break
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="inspect and re-simulate a game recording")
+    parser.add_argument('path')
+    parser.add_argument('--seek', type=int, help="show the state at this tick")
+    args = parser.parse_args()
+
+    recording = Recording(args.path)
+    size = os.path.getsize(args.path)
+    print(f"🎞️ {args.path}: {len(recording)} ticks, {recording.players} player(s), {recording.enemies} enemies, "
+          f"seed {recording.seed}")
+    print(f"   {len(recording.index)} keyframes every {recording.interval} ticks, {size / 1024:.1f} KiB "
+          f"({size / max(len(recording), 1):.0f} bytes per tick)")
+
+    replay = Replay(args.path)
+    start = time.perf_counter()
+    replay.seek(recording.first_tick)
+    mismatch = replay.run()
+    seconds = time.perf_counter() - start
+    print(f"   re-simulated in {seconds:.2f} s ({len(recording) / seconds:.0f} ticks/s): "
+          + ("identical to the recording" if mismatch is None else f"differs from tick {mismatch}"))
+
+    if args.seek is not None:
+        start = time.perf_counter()
+        game = replay.seek(args.seek)
+        seconds = time.perf_counter() - start
+        print(f"   tick {args.seek} (sought in {seconds * 1000:.1f} ms): score {game.score}, "
+              + ", ".join(f"player {i + 1} at ({p.x:.1f}, {p.y:.1f})" for i, p in enumerate(game.players))
+              + (", game over" if game.game_over else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color).
+
+    HUD strings mostly repeat frame to frame, so rendering them once and
+    reusing the Surface saves a font.render per string per frame. Reusing
+    the same Surface object also lets callers detect "unchanged" by
+    identity.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (text, font, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class DirtyRectRenderer:
+    """Redraws only what changed and pushes just those rects to the display.
+
+    Each frame the caller registers the HUD (retained surfaces, see hud())
+    and queues the moving objects as (surface, topleft) blits, then
+    end_frame() composes the frame: it erases last frame's object rects and
+    any HUD item that must be re-blitted, draws every queued object with one
+    Surface.blits call, blits the HUD on top and calls
+    pygame.display.update() with the rects that changed. Erasing a HUD item
+    before re-blitting keeps antialiased text from stacking on itself.
+    When too much changed (or after invalidate()) it falls back to one
+    full clear and flip. compose() and present() are the two halves of
+    end_frame(), for callers that draw on top or time them separately;
+    whatever they draw after compose() is reported with overdraw() so it
+    gets erased next frame.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0), max_rects=64):
+        self.screen = screen
+        self.background = background
+        self.max_rects = max_rects
+        self.full_redraw = True
+        self.blits = []             # (surface, topleft) queued this frame
+        self.previous_rects = []    # object rects drawn last frame
+        self.hud_items = {}         # key -> [surface, rect]
+        self.hud_erase = []         # old rects of HUD items that changed
+        self.hud_changed = set()
+        self.overdrawn = []         # rects drawn over after compose(), erased next frame
+        self.frames = 0
+        self.full_frames = 0
+
+    def invalidate(self):
+        """Force a full redraw next frame (mode change, window exposed...)"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        self.blits = []
+        self.hud_erase = []
+        self.hud_changed = set()
+
+    def hud(self, key, surface, pos):
+        """Place a retained HUD surface; unchanged items cost nothing"""
+        rect = surface.get_rect(topleft=pos)
+        item = self.hud_items.get(key)
+        if item is not None:
+            if item[0] is surface and item[1] == rect:
+                return
+            self.hud_erase.append(item[1])
+        self.hud_items[key] = [surface, rect]
+        self.hud_changed.add(key)
+
+    def remove_hud(self, key):
+        item = self.hud_items.pop(key, None)
+        if item is not None:
+            self.hud_erase.append(item[1])
+
+    def blit(self, surface, pos):
+        """Queue one object for this frame"""
+        self.blits.append((surface, pos))
+
+    def blit_many(self, blits):
+        """Queue (surface, topleft) pairs, e.g. from Sprite.place_many()"""
+        self.blits += blits
+
+    def overdraw(self, rect):
+        """Note a rect the caller drew into after compose(); the caller presents it"""
+        self.overdrawn.append(rect)
+
+    def end_frame(self):
+        self.present(self.compose())
+
+    def compose(self):
+        """Draw the frame on the screen surface; returns the rects that
+        changed, or None when the whole display must be flipped"""
+        screen = self.screen
+        if self.full_redraw or len(self.previous_rects) + len(self.blits) > self.max_rects:
+            return self.compose_full()
+
+        bounds = [surface.get_rect(topleft=pos) for surface, pos in self.blits]
+        erased = self.previous_rects + self.hud_erase + self.overdrawn
+        self.overdrawn = []
+        # HUD items to re-blit: changed, or something under them changed
+        reblit = [
+            (surface, rect) for key, (surface, rect) in self.hud_items.items()
+            if key in self.hud_changed or rect.collidelist(erased) != -1 or rect.collidelist(bounds) != -1
+        ]
+        reblit_rects = [rect for _, rect in reblit]
+        for rect in erased + reblit_rects:
+            screen.fill(self.background, rect)
+
+        drawn = screen.blits(self.blits)
+        for surface, rect in reblit:
+            screen.blit(surface, rect)
+
+        self.frames += 1
+        self.previous_rects = drawn
+        return erased + reblit_rects + drawn
+
+    def present(self, rects=None):
+        """Push the composed frame: just rects, or everything when None"""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def compose_full(self):
+        screen = self.screen
+        screen.fill(self.background)
+        self.overdrawn = []
+        # Too many objects for dirty rects next frame either: skip the Rects
+        crowded = len(self.blits) > self.max_rects
+        drawn = screen.blits(self.blits, doreturn=not crowded)
+        for surface, rect in self.hud_items.values():
+            screen.blit(surface, rect)
+        self.frames += 1
+        self.full_frames += 1
+        self.previous_rects = drawn or []
+        self.full_redraw = crowded
+        return None
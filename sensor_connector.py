@@ -0,0 +1,108 @@
+import threading
+import time
+
+import serial
+
+from wire_protocol import ProtocolNegotiator
+
+
+class SensorConnector(threading.Thread):
+    """Open the board's port and negotiate its protocol off the main thread.
+
+    Keeps trying until the board streams data: a port that can't be opened
+    is retried every ``retry_interval`` seconds and a handshake that gets
+    no data within ``handshake_timeout`` starts over, so a board plugged in
+    late is still picked up. The game polls take() once per frame. cancel()
+    returns at once; the thread notices within ``poll_interval`` and closes
+    whatever it had open. ``fusion`` makes each handshake ask for raw IMU
+    frames first (see ProtocolNegotiator); it is called for a fresh
+    imu_fusion.SensorFusion per attempt.
+    """
+
+    def __init__(self, port, baud=115200, prefer_binary=True, handshake_timeout=5.0,
+                 retry_interval=1.0, poll_interval=0.01, fusion=None):
+        super().__init__(name='mpu-connector', daemon=True)
+        self.port = port
+        self.baud = baud
+        self.prefer_binary = prefer_binary
+        self.handshake_timeout = handshake_timeout
+        self.retry_interval = retry_interval
+        self.poll_interval = poll_interval
+        self.fusion = fusion
+        self.state = 'starting'     # opening, handshake, retrying, connected, cancelled
+        self.attempts = 0
+        self.error = None           # why the last attempt failed
+        self.connected = threading.Event()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._result = None         # (ser, decoder, protocol, first records)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Stop looking; a connection nobody took yet is closed"""
+        with self._lock:
+            self._cancel.set()
+            if self._result is not None:
+                self._result[0].close()
+                self._result = None
+
+    def take(self):
+        """(ser, decoder, protocol, records) once connected, else None.
+
+        Ownership of the port passes to the caller; later calls return None.
+        """
+        with self._lock:
+            result, self._result = self._result, None
+        return result
+
+    def run(self):
+        while not self._cancel.is_set():
+            self.attempts += 1
+            result = self.attempt()
+            if result is not None:
+                with self._lock:
+                    if self._cancel.is_set():
+                        result[0].close()
+                        break
+                    self._result = result
+                    self.state = 'connected'
+                    self.connected.set()
+                return
+            self.state = 'retrying'
+            self._cancel.wait(self.retry_interval)
+        self.state = 'cancelled'
+
+    def attempt(self):
+        """One open and handshake; the connection, or None after closing it"""
+        self.state = 'opening'
+        try:
+            ser = serial.Serial(self.port, self.baud, timeout=0.1)
+        except (serial.SerialException, OSError, ValueError) as e:
+            self.error = e
+            return None
+        try:
+            ser.reset_input_buffer()
+        except (serial.SerialException, OSError) as e:
+            self.error = e
+            ser.close()
+            return None
+
+        self.state = 'handshake'
+        fusion = self.fusion() if self.fusion is not None else None
+        negotiator = ProtocolNegotiator(ser, prefer_binary=self.prefer_binary, fusion=fusion)
+        deadline = time.monotonic() + self.handshake_timeout
+        try:
+            while not self._cancel.is_set() and time.monotonic() < deadline:
+                records = negotiator.poll()
+                if len(records):
+                    return ser, negotiator.decoder, negotiator.protocol, records
+                self._cancel.wait(self.poll_interval)
+            if not self._cancel.is_set():
+                self.error = TimeoutError(f"no data from {self.port} in {self.handshake_timeout:.0f}s")
+        except (serial.SerialException, OSError) as e:
+            self.error = e
+        ser.close()
+        return None
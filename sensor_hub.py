@@ -0,0 +1,244 @@
+"""Share one board with every local process that wants its samples.
+
+Only one process can open a serial port. The hub owns it and publishes
+the decoded samples into a SharedSampleRing; the game, a logger and a
+dashboard can all read them at once:
+
+    python sensor_hub.py --port /dev/ttyUSB0 --name mpu
+    python game.py --port shm:mpu
+"""
+import argparse
+import os
+import signal
+import threading
+import time
+
+from imu_fusion import SensorFusion
+from sensor_connector import SensorConnector
+from serial_reader import SerialReader
+from shared_ring import SharedSampleRing
+
+SHARED_PREFIX = 'shm:'      # --port shm:NAME reads from a hub instead of a serial port
+DEFAULT_NAME = 'mpu'
+STATUS_INTERVAL = 0.1       # seconds between heartbeats
+STALE_AFTER = 1.0           # a hub silent this long is taken to be gone
+
+
+def shared_name(port):
+    """The ring name in a shm:NAME port, or None for a serial port"""
+    if port.startswith(SHARED_PREFIX):
+        return port[len(SHARED_PREFIX):] or DEFAULT_NAME
+    return None
+
+
+class SensorHub:
+    """Own the board's port and publish its samples for any number of readers.
+
+    A SensorConnector finds the board and negotiates the protocol, then a
+    SerialReader decodes straight into the shared ring; if the board goes
+    away the hub looks for it again, keeping the ring. Status (state,
+    protocol, malformed/lost counts, the hub's CPU time) is published
+    every STATUS_INTERVAL seconds as a heartbeat.
+    """
+
+    def __init__(self, port, name=DEFAULT_NAME, capacity=4096, fusion=None, prefer_binary=True):
+        self.port = port
+        self.fusion = fusion
+        self.prefer_binary = prefer_binary
+        self.ring = SharedSampleRing(name, capacity=capacity, create=True)
+        self.reader = None
+        self.protocol = None
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        ring = self.ring
+        ring.publish('starting')
+        try:
+            while not self._stop_event.is_set():
+                if self.reader is None:
+                    self.connect()
+                    continue
+                if self.reader.error:
+                    print(f"MPU read error: {self.reader.error}")
+                    self.disconnect()
+                    continue
+                decoder = self.reader.decoder
+                ring.publish('streaming', self.protocol, decoder.malformed, getattr(decoder, 'lost', 0),
+                             time.process_time())
+                self._stop_event.wait(STATUS_INTERVAL)
+        finally:
+            self.disconnect()
+            ring.publish('stopped', cpu=time.process_time())
+            ring.release()
+
+    def connect(self):
+        """Wait for the board, publishing heartbeats meanwhile"""
+        fusion = None
+        if self.fusion is not None:
+            method = self.fusion
+            fusion = lambda: SensorFusion(method)
+        connector = SensorConnector(self.port, prefer_binary=self.prefer_binary, fusion=fusion)
+        connector.start()
+        while not self._stop_event.is_set():
+            self.ring.publish('connecting', cpu=time.process_time())
+            if connector.connected.wait(STATUS_INTERVAL):
+                break
+        connection = connector.take()
+        connector.cancel()
+        if connection is None:
+            return
+        ser, decoder, self.protocol, records = connection
+        self.ring.push_many(time.perf_counter(), records)
+        self.reader = SerialReader(ser, ring=self.ring, decoder=decoder)
+        self.reader.start()
+        print(f"🎉 Sharing the MPU6050 on {self.port} as {SHARED_PREFIX}{self.ring.name} ({self.protocol} protocol)")
+
+    def disconnect(self):
+        if self.reader is not None:
+            self.reader.stop()
+            self.reader.ser.close()
+            self.reader = None
+
+
+class HubClient:
+    """A hub's samples in place of a port and its SerialReader.
+
+    ``ring`` is this process's reader of the shared ring: read() copies
+    every row since the last call, read_views() hands out zero-copy views
+    and latest() the newest row, none of it touching the hub. ``error`` is
+    set once the hub stops or its heartbeat goes stale, like a SerialReader
+    whose port failed.
+    """
+
+    def __init__(self, name=DEFAULT_NAME):
+        self.name = name
+        self.ring = SharedSampleRing(name)
+
+    @property
+    def protocol(self):
+        return self.ring.status()['protocol']
+
+    @property
+    def streaming(self):
+        return self.ring.status()['state'] == 'streaming'
+
+    @property
+    def malformed(self):
+        """Lines or frames the hub failed to decode"""
+        return self.ring.status()['malformed']
+
+    @property
+    def dropped(self):
+        """Samples lost to malformed lines or this reader falling a lap behind"""
+        return self.malformed + self.ring.overruns
+
+    @property
+    def error(self):
+        if self.ring.header is None:
+            return None
+        status = self.ring.status()
+        if status['state'] == 'stopped':
+            return ConnectionError(f"sensor hub {self.name} stopped")
+        if status['state'] == 'stalled':
+            return ConnectionError(f"sensor hub {self.name} died halfway through an update")
+        if time.perf_counter() - status['heartbeat'] > STALE_AFTER:
+            return TimeoutError(f"sensor hub {self.name} stopped answering")
+        return None
+
+    def stop(self, timeout=None):
+        """Nothing runs in this process; here so the client can stand in for a SerialReader"""
+
+    def close(self):
+        if self.ring.header is not None:
+            self.ring.release()
+
+
+class HubConnector(threading.Thread):
+    """SensorConnector for a hub: attach once it is streaming, without blocking.
+
+    Same take()/cancel()/state interface, so the game polls it the same
+    way; take() hands over (HubClient, None, protocol, latest record).
+    """
+
+    def __init__(self, name=DEFAULT_NAME, retry_interval=0.5):
+        super().__init__(name='mpu-hub-connector', daemon=True)
+        self.name = name
+        self.retry_interval = retry_interval
+        self.state = 'starting'     # waiting for hub, connected, cancelled
+        self.attempts = 0
+        self.error = None
+        self.connected = threading.Event()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._result = None
+
+    def cancel(self):
+        with self._lock:
+            self._cancel.set()
+            if self._result is not None:
+                self._result[0].close()
+                self._result = None
+
+    def take(self):
+        with self._lock:
+            result, self._result = self._result, None
+        return result
+
+    def run(self):
+        while not self._cancel.is_set():
+            self.attempts += 1
+            result = self.attempt()
+            if result is not None:
+                with self._lock:
+                    if self._cancel.is_set():
+                        result[0].close()
+                        break
+                    self._result = result
+                    self.state = 'connected'
+                    self.connected.set()
+                return
+            self.state = 'waiting for hub'
+            self._cancel.wait(self.retry_interval)
+        self.state = 'cancelled'
+
+    def attempt(self):
+        try:
+            client = HubClient(self.name)
+        except (FileNotFoundError, ValueError) as e:
+            self.error = e
+            return None
+        latest = client.ring.latest()
+        if client.error is not None or not client.streaming or latest is None:
+            self.error = client.error or TimeoutError(f"sensor hub {self.name} has no board yet")
+            client.close()
+            return None
+        # Only samples from now on are new to this reader
+        return client, None, client.protocol, latest[None, 1:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="share one MPU6050 with several local processes")
+    parser.add_argument('--port', default=os.environ.get('MPU_PORT', 'COM6'), help="serial port of the board")
+    parser.add_argument('--name', default=DEFAULT_NAME,
+                        help=f"shared memory name; readers use --port {SHARED_PREFIX}NAME")
+    parser.add_argument('--capacity', type=int, default=4096, help="samples kept (a power of two)")
+    parser.add_argument('--fusion', choices=['complementary', 'madgwick', 'mahony'],
+                        help="ask for raw IMU data and fuse it in the hub")
+    parser.add_argument('--csv', action='store_true', help="never ask the board for binary frames")
+    args = parser.parse_args(argv)
+
+    hub = SensorHub(args.port, args.name, args.capacity, args.fusion, prefer_binary=not args.csv)
+    signal.signal(signal.SIGTERM, lambda *_: hub.stop())
+    print(f"🔄 Looking for the MPU6050 on {args.port}, sharing it as {SHARED_PREFIX}{args.name}...")
+    try:
+        hub.run()
+    except KeyboardInterrupt:
+        pass
+    print("👋 Sensor hub stopped")
+
+
+if __name__ == '__main__':
+    main()
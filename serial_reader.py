@@ -0,0 +1,133 @@
+import threading
+import time
+
+import numpy as np
+import serial
+
+from line_framer import LineFramer
+
+
+class SampleRing:
+    """Preallocated ring buffer of (ts, pitch, roll[, ...]) records.
+
+    One producer (the reader thread) pushes, one consumer (the game loop)
+    reads. Neither side blocks: the producer overwrites the oldest records
+    when the consumer falls behind, and those losses are counted as overruns.
+    Each row is a timestamp plus ``fields`` values; columns a batch doesn't
+    supply (e.g. the sequence number of a CSV stream without one) are NaN.
+    """
+
+    def __init__(self, capacity=4096, fields=2):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.data = np.zeros((capacity, 1 + fields), dtype=np.float64)
+        self.written = 0    # total records ever pushed (producer only)
+        self.cursor = 0     # next record the consumer will read (consumer only)
+        self.overruns = 0   # records overwritten before they were read
+
+    def push(self, ts, pitch, roll):
+        """Append one record (producer side, no allocation)"""
+        i = self.written & self.mask
+        self.data[i, 0] = ts
+        self.data[i, 1] = pitch
+        self.data[i, 2] = roll
+        self.data[i, 3:] = np.nan
+        # Publish only after the row is complete
+        self.written += 1
+
+    def read(self):
+        """Return a copy of every record since the last read, oldest first"""
+        head = self.written
+        start = max(self.cursor, head - self.capacity)
+        rows = self.data.take(np.arange(start, head) & self.mask, axis=0)
+
+        # The producer may have lapped the oldest rows while we copied them
+        torn = self.written - self.capacity - start
+        if torn > 0:
+            rows = rows[torn:]
+            start += torn
+
+        self.overruns += start - self.cursor
+        self.cursor = head
+        return rows
+
+    def push_many(self, ts, records):
+        """Append a batch of (pitch, roll[, ...]) rows sharing one arrival time"""
+        n = len(records)
+        if n == 0:
+            return
+        base = self.written
+        if n > self.capacity:
+            # Only the newest lap can survive anyway
+            base += n - self.capacity
+            records = records[-self.capacity:]
+        idx = (base + np.arange(len(records))) & self.mask
+        width = records.shape[1]
+        self.data[idx, 0] = ts
+        self.data[idx, 1:1 + width] = records
+        self.data[idx, 1 + width:] = np.nan
+        self.written += n
+
+    def latest(self):
+        """Return the newest record without consuming anything, or None"""
+        head = self.written
+        if head == 0:
+            return None
+        return self.data[(head - 1) & self.mask].copy()
+
+    def pending(self):
+        """Number of records waiting for the consumer"""
+        return min(self.written - self.cursor, self.capacity)
+
+
+class SerialReader(threading.Thread):
+    """Continuously drain a serial port into a SampleRing.
+
+    Runs as a daemon thread so a slow frame in the game loop never delays
+    reading the port; every complete ``pitch,roll`` line becomes one record
+    stamped with the time.perf_counter() time its chunk arrived, so it can
+    be compared with timings taken in the game loop. Rows are (ts, pitch,
+    roll, seq); seq is the board's sample counter, NaN when the stream has
+    none. The decoder is a LineFramer or BinaryDecoder; pass the one that
+    already holds the handshake's leftover bytes to avoid losing them.
+    """
+
+    def __init__(self, ser, ring=None, decoder=None):
+        super().__init__(name='mpu-serial-reader', daemon=True)
+        self.ser = ser
+        self.ring = ring or SampleRing(fields=3)
+        self.decoder = decoder or LineFramer()
+        self.chunks = 0
+        self.error = None
+        self._stop_event = threading.Event()
+
+    @property
+    def malformed(self):
+        """Lines or frames that failed to decode"""
+        return self.decoder.malformed
+
+    @property
+    def dropped(self):
+        """Samples lost to malformed lines or ring overruns"""
+        return self.malformed + self.ring.overruns
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                # Blocks for at most ser.timeout when the port is idle
+                records = self.decoder.read_from(self.ser)
+            except (serial.SerialException, OSError, TypeError) as e:
+                # TypeError: pyserial raises it when the port is closed under us
+                if not self._stop_event.is_set():
+                    self.error = e
+                break
+            if len(records):
+                self.chunks += 1
+                self.ring.push_many(time.perf_counter(), records)
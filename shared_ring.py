@@ -0,0 +1,203 @@
+import time
+
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+from serial_reader import SampleRing
+
+# Header: 16 little-endian 8-byte slots ahead of the rows, which start on
+# their own cache line. Integer and float slots share the block.
+HEADER_SIZE = 128
+MAGIC = 0x4D505553484D3031  # "MPUSHM01"
+# Integer slots
+H_MAGIC, H_CAPACITY, H_WIDTH, H_SEQUENCE, H_WRITTEN, H_STATE, H_PROTOCOL, H_MALFORMED, H_LOST = range(9)
+# Float slots
+H_HEARTBEAT, H_CPU = 9, 10
+
+STATES = ('starting', 'connecting', 'streaming', 'stopped')
+# A reader waits this long for a write in progress to finish before it
+# takes the producer for dead halfway through it
+SNAPSHOT_TIMEOUT = 0.01
+PROTOCOLS = (None, 'csv', 'binary', 'raw')
+
+
+class SharedSampleRing(SampleRing):
+    """SampleRing in shared memory: one process writes, any number read.
+
+    The producer creates the block (``create=True``) and pushes exactly as
+    into a SampleRing; every other process attaches by ``name`` and keeps
+    its own read cursor, so readers never write to the block and adding
+    one costs the producer nothing. Rows are published by bumping
+    ``written`` after they are complete; a reader lapped while copying
+    drops the torn rows and counts them as overruns, as in SampleRing.
+
+    The header is a seqlock: the producer makes ``sequence`` odd while it
+    changes rows or status and even again when done, so latest() and
+    status() retry until they see one consistent snapshot. A producer
+    killed halfway through a write leaves it odd for good; readers give up
+    after SNAPSHOT_TIMEOUT and status() reports the state as ``stalled``.
+    A write that was interrupted is healed by the next one. Timestamps are
+    the producer's time.perf_counter(), which is system-wide on Linux,
+    macOS and Windows, so readers can compare them with their own.
+    """
+
+    def __init__(self, name=None, capacity=4096, fields=3, create=False):
+        if create:
+            if capacity & (capacity - 1):
+                raise ValueError("capacity must be a power of two")
+            size = HEADER_SIZE + capacity * (1 + fields) * 8
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = attach(name)
+        self.owner = create
+        self.name = self.shm.name
+        self.header = np.ndarray((HEADER_SIZE // 8,), dtype='<i8', buffer=self.shm.buf)
+        self.floats = np.ndarray((HEADER_SIZE // 8,), dtype='<f8', buffer=self.shm.buf)
+        if create:
+            self.header[:] = 0
+            self.header[H_CAPACITY] = capacity
+            self.header[H_WIDTH] = 1 + fields
+            self.floats[H_HEARTBEAT] = time.perf_counter()
+            # Readers check the magic last, once the rest is in place
+            self.header[H_MAGIC] = MAGIC
+        elif self.header[H_MAGIC] != MAGIC:
+            self.release()
+            raise ValueError(f"{name} is not a sensor ring")
+        self.capacity = int(self.header[H_CAPACITY])
+        self.mask = self.capacity - 1
+        self.data = np.ndarray((self.capacity, int(self.header[H_WIDTH])), dtype=np.float64,
+                               buffer=self.shm.buf, offset=HEADER_SIZE)
+        # A reader starts at the newest row: only what arrives after it joins
+        self.cursor = self.written
+        self.overruns = 0
+        self.view_start = None
+
+    @property
+    def written(self):
+        """Total rows ever published (lives in the shared header)"""
+        return int(self.header[H_WRITTEN])
+
+    @written.setter
+    def written(self, value):
+        self.header[H_WRITTEN] = value
+
+    def begin_write(self):
+        # Odd while writing; an interrupted write already left it odd
+        self.header[H_SEQUENCE] |= 1
+
+    def end_write(self):
+        self.header[H_SEQUENCE] += 1
+
+    def push(self, ts, pitch, roll):
+        self.begin_write()
+        super().push(ts, pitch, roll)
+        self.end_write()
+
+    def push_many(self, ts, records):
+        if len(records) == 0:
+            return
+        self.begin_write()
+        super().push_many(ts, records)
+        self.end_write()
+
+    def publish(self, state, protocol=None, malformed=0, lost=0, cpu=0.0):
+        """Producer: update the status readers see, and the heartbeat"""
+        header, floats = self.header, self.floats
+        self.begin_write()
+        header[H_STATE] = STATES.index(state)
+        header[H_PROTOCOL] = PROTOCOLS.index(protocol)
+        header[H_MALFORMED] = malformed
+        header[H_LOST] = lost
+        floats[H_CPU] = cpu
+        floats[H_HEARTBEAT] = time.perf_counter()
+        self.end_write()
+
+    def snapshot(self, read, timeout=SNAPSHOT_TIMEOUT):
+        """read() under the seqlock: retried until no write overlapped it, or None
+        if the producer stays mid-write for timeout seconds"""
+        sequence = self.header[H_SEQUENCE:H_SEQUENCE + 1]
+        deadline = None
+        while True:
+            before = int(sequence[0])
+            if not before & 1:
+                value = read()
+                if int(sequence[0]) == before:
+                    return value
+            if deadline is None:
+                deadline = time.perf_counter() + timeout
+            elif time.perf_counter() > deadline:
+                return None
+            # Let the producer finish
+            time.sleep(0)
+
+    def status(self):
+        """The producer's last published status as a dict"""
+        header, floats = self.header, self.floats
+
+        def read():
+            return {
+                'state': STATES[header[H_STATE]],
+                'protocol': PROTOCOLS[header[H_PROTOCOL]],
+                'malformed': int(header[H_MALFORMED]),
+                'lost': int(header[H_LOST]),
+                'heartbeat': float(floats[H_HEARTBEAT]),
+                'cpu': float(floats[H_CPU]),
+            }
+        status = self.snapshot(read)
+        if status is None:
+            # Whatever the header holds, marked as never finished
+            status = read()
+            status['state'] = 'stalled'
+        return status
+
+    def latest(self):
+        """Return the newest record without consuming anything, or None (also if stalled)"""
+        def read():
+            head = self.written
+            return self.data[(head - 1) & self.mask].copy() if head else None
+        return self.snapshot(read)
+
+    def read_views(self):
+        """Every row since the last read as NumPy views of the shared block, oldest first.
+
+        One view, or two when the rows wrap around the end of the ring;
+        nothing is copied. The producer keeps writing, so check torn()
+        after using them: that many of the oldest rows were overwritten.
+        """
+        head = self.written
+        start = max(self.cursor, head - self.capacity)
+        self.overruns += start - self.cursor
+        self.cursor = head
+        self.view_start = start
+        lo, hi = start & self.mask, head & self.mask
+        if head == start:
+            return [self.data[:0]]
+        if lo < hi:
+            return [self.data[lo:hi]]
+        return [self.data[lo:], self.data[:hi]]
+
+    def torn(self):
+        """Rows of the last read_views() the producer has since overwritten"""
+        if self.view_start is None:
+            return 0
+        return max(0, min(self.written - self.capacity - self.view_start, self.cursor - self.view_start))
+
+    def release(self):
+        """Drop this process's mapping; the owner also removes the block"""
+        # Views into the block must go before it can be closed
+        self.header = self.floats = self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def attach(name):
+    """Open an existing block without making this process responsible for it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 every attach is tracked and unlinked when the
+        # process exits, which would pull the ring out from under the hub
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
@@ -0,0 +1,54 @@
+import time
+
+
+class FixedStepClock:
+    """Accumulator for running the simulation at a fixed rate.
+
+    Each rendered frame calls advance(), which adds the real time since the
+    last call to an accumulator and returns how many fixed steps to run.
+    Whatever is left over becomes ``alpha`` (0..1), the fraction of a step
+    to interpolate positions by when drawing. Under overload at most
+    ``max_steps`` run per frame and the rest of the backlog is dropped, so
+    a stall slows the game down instead of snowballing.
+    """
+
+    def __init__(self, hz=60, max_steps=5, time_source=time.perf_counter):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.time_source = time_source
+        self.accumulator = 0.0
+        self.last = None
+        self.steps = 0          # total steps handed out
+        self.dropped_time = 0.0  # seconds of backlog discarded under overload
+
+    @property
+    def hz(self):
+        return 1.0 / self.dt
+
+    @property
+    def alpha(self):
+        """How far between the last two steps the current frame is"""
+        return min(1.0, self.accumulator / self.dt)
+
+    def reset(self):
+        """Forget accumulated time, e.g. after a pause or a restart"""
+        self.accumulator = 0.0
+        self.last = None
+
+    def advance(self, now=None):
+        """Return the number of fixed steps due since the previous call"""
+        if now is None:
+            now = self.time_source()
+        if self.last is None:
+            self.last = now
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        self.steps += steps
+        return steps
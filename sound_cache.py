@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Bump whenever the synthesis code changes in a way the parameters don't capture
+SOUND_CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    """Per-user cache directory for generated sound buffers"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'mpu6050-tilt-game')
+
+
+def cache_key(sample_rate, specs):
+    """Stable key for a set of sound specs at a given sample rate"""
+    payload = json.dumps(
+        {'version': SOUND_CACHE_VERSION, 'sample_rate': sample_rate, 'specs': specs},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class SoundCache:
+    """On-disk store for finished int16 stereo sound buffers.
+
+    All sounds of one spec set live in a single .npy file (concatenated
+    along the sample axis) next to a small JSON index of slice bounds, so a
+    warm start is one memory-map plus a few array views.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def _paths(self, key):
+        stem = os.path.join(self.cache_dir, f"sounds-v{SOUND_CACHE_VERSION}-{key}")
+        return stem + '.npy', stem + '.json'
+
+    def load(self, key):
+        """Return {name: (n, 2) int16 view} or None on a cache miss"""
+        data_path, index_path = self._paths(key)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            data = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+        if data.dtype != np.int16 or data.ndim != 2 or data.shape[1] != 2:
+            return None
+        if any(stop > data.shape[0] for _, stop in index.values()):
+            return None
+        return {name: data[start:stop] for name, (start, stop) in index.items()}
+
+    def store(self, key, buffers):
+        """Write {name: (n, 2) int16 array} atomically under key"""
+        data_path, index_path = self._paths(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        index = {}
+        offset = 0
+        for name, buf in buffers.items():
+            index[name] = (offset, offset + len(buf))
+            offset += len(buf)
+        data = np.concatenate([np.asarray(b, dtype=np.int16) for b in buffers.values()])
+
+        # Write to temp names first so a crashed launch never leaves a torn cache
+        tmp_data = data_path + '.tmp'
+        tmp_index = index_path + '.tmp'
+        with open(tmp_data, 'wb') as f:
+            np.save(f, data)
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_index, index_path)
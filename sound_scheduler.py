@@ -0,0 +1,54 @@
+import heapq
+import itertools
+import time
+
+
+class SoundScheduler:
+    """Timed queue of sound effects, drained once per frame.
+
+    Instead of sleeping between two sounds, schedule the later one ahead of
+    time and let update() play whatever has come due. Nothing here ever
+    waits, so a sound sequence can't hold up input, simulation or drawing;
+    a sound is at most one frame late.
+    """
+
+    def __init__(self, sound_manager, time_source=time.perf_counter):
+        self.sound_manager = sound_manager
+        self.time_source = time_source
+        self.queue = []             # heap of (due, order, name, volume)
+        self.order = itertools.count()
+        self.played = 0
+        self.cancelled = 0
+        self.max_lateness = 0.0     # seconds, worst gap between due and played
+
+    def __len__(self):
+        return len(self.queue)
+
+    def schedule(self, sound_name, delay=0.0, volume=1.0):
+        """Play a sound delay seconds from now"""
+        due = self.time_source() + delay
+        heapq.heappush(self.queue, (due, next(self.order), sound_name, volume))
+
+    def sequence(self, *steps):
+        """Schedule (sound_name, delay, volume) steps, delays measured from now"""
+        for sound_name, delay, volume in steps:
+            self.schedule(sound_name, delay, volume)
+
+    def cancel(self):
+        """Drop everything still pending, e.g. on restart"""
+        self.cancelled += len(self.queue)
+        self.queue.clear()
+
+    def update(self, now=None):
+        """Play every sound that has come due; returns how many played"""
+        if now is None:
+            now = self.time_source()
+        played = 0
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            due, _, sound_name, volume = heapq.heappop(queue)
+            self.sound_manager.play(sound_name, volume=volume)
+            self.max_lateness = max(self.max_lateness, now - due)
+            played += 1
+        self.played += played
+        return played
@@ -0,0 +1,163 @@
+import numpy as np
+
+# Cell coordinates are packed into one int64 key: cx * KEY_STRIDE + cy
+KEY_STRIDE = 1 << 32
+KEY_OFFSET = 1 << 31
+
+# Half of the 3x3 neighbourhood: every pair of adjacent cells is visited once
+HALF_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class SpatialHash:
+    """Uniform-grid broad phase over point sets such as EnemySwarm.
+
+    rebuild() buckets every point by its cell and sorts the points by cell
+    key, reusing last tick's order so the sort runs on nearly-sorted input.
+    Queries then look up neighbouring cells with searchsorted and expand
+    the candidates with array ops, so cost tracks the number of nearby
+    points rather than n squared. The cell size must be at least the
+    largest interaction distance (e.g. twice the largest radius).
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.intp)
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self.cx = self.cy = self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def cell_keys(self, cx, cy):
+        return cx * KEY_STRIDE + (cy + KEY_OFFSET)
+
+    def rebuild(self, x, y):
+        """Re-bucket all points after they moved"""
+        self.x = x
+        self.y = y
+        self.cx = np.floor_divide(x, self.cell_size).astype(np.int64)
+        self.cy = np.floor_divide(y, self.cell_size).astype(np.int64)
+        keys = self.cell_keys(self.cx, self.cy)
+
+        if len(keys) == len(self.order):
+            if np.array_equal(keys, self.keys):
+                # Nobody changed cell: the previous order is still valid
+                return
+            # Most points stay put, so last tick's order is nearly sorted
+            step = np.argsort(keys[self.order], kind='stable')
+            self.order = self.order[step]
+        else:
+            self.order = np.argsort(keys, kind='stable')
+        self.keys = keys
+        self.sorted_keys = keys[self.order]
+
+    def _cell_ranges(self, keys):
+        """[lo, hi) slices of the sorted order for each requested cell key"""
+        lo = np.searchsorted(self.sorted_keys, keys, side='left')
+        hi = np.searchsorted(self.sorted_keys, keys, side='right')
+        return lo, hi
+
+    @staticmethod
+    def _expand(owners, lo, hi):
+        """Pair each owner with every sorted position in its [lo, hi)"""
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        rep = np.repeat(owners, counts)
+        # Position within each owner's run, offset by its lo
+        starts = np.cumsum(counts) - counts
+        pos = np.arange(total) - np.repeat(starts - lo, counts)
+        return rep, pos
+
+    @staticmethod
+    def _block_pairs(start_a, count_a, start_b, count_b, same):
+        """Sorted positions of every (a, b) pair between runs a and b, run by run;
+        same keeps each unordered pair within a run once"""
+        size = count_a * count_b
+        total = int(size.sum())
+        block = np.repeat(np.arange(len(size)), size)
+        # Index within each block, split into row (a) and column (b)
+        local = np.arange(total) - np.repeat(np.cumsum(size) - size, size)
+        width = count_b[block]
+        a = local // width
+        b = local - a * width
+        if same:
+            keep = a < b
+            block, a, b = block[keep], a[keep], b[keep]
+        return start_a[block] + a, start_b[block] + b
+
+    def candidate_pairs(self, max_per_cell=None):
+        """All (i, j), i < j by sorted rank, sharing or touching a cell.
+
+        Works cell by cell: each occupied cell finds its neighbours with
+        one searchsorted over the occupied cells, and every pair between
+        two cells' runs is expanded with array ops. With max_per_cell only
+        the first that many points of each cell take part, which bounds the
+        work when a crowd piles into a few cells.
+        """
+        sorted_keys = self.sorted_keys
+        n = len(sorted_keys)
+        if n == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        # Occupied cells in key order, and the run of sorted points in each
+        new_cell = np.empty(n, dtype=bool)
+        new_cell[0] = True
+        np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=new_cell[1:])
+        starts = np.flatnonzero(new_cell)
+        cells = sorted_keys[starts]
+        counts = np.diff(starts, append=n)
+        if max_per_cell is not None:
+            np.minimum(counts, max_per_cell, out=counts)
+
+        ii, jj = [], []
+        for dx, dy in HALF_NEIGHBOURS:
+            if dx == 0 and dy == 0:
+                a = b = np.arange(len(cells))
+            else:
+                # Shifting every key by the same offset keeps them sorted
+                wanted = cells + (dx * KEY_STRIDE + dy)
+                b = np.searchsorted(cells, wanted)
+                np.minimum(b, len(cells) - 1, out=b)
+                a = np.flatnonzero(cells[b] == wanted)
+                b = b[a]
+            i, j = self._block_pairs(starts[a], counts[a], starts[b], counts[b], dx == 0 and dy == 0)
+            ii.append(self.order[i])
+            jj.append(self.order[j])
+        return np.concatenate(ii), np.concatenate(jj)
+
+    def overlapping_pairs(self, radius, max_per_cell=None):
+        """Pairs (i, j) whose circles overlap; radius is scalar or per point"""
+        i, j = self.candidate_pairs(max_per_cell)
+        radius = np.broadcast_to(radius, self.keys.shape)
+        dx = self.x[i] - self.x[j]
+        dy = self.y[i] - self.y[j]
+        reach = radius[i] + radius[j]
+        hit = dx * dx + dy * dy < reach * reach
+        return i[hit], j[hit]
+
+    def query_radius(self, x, y, radius):
+        """Indices of points within radius of (x, y); radius may exceed a cell"""
+        c0x = int(np.floor((x - radius) / self.cell_size))
+        c1x = int(np.floor((x + radius) / self.cell_size))
+        c0y = int(np.floor((y - radius) / self.cell_size))
+        c1y = int(np.floor((y + radius) / self.cell_size))
+        gx, gy = np.meshgrid(np.arange(c0x, c1x + 1), np.arange(c0y, c1y + 1), indexing='ij')
+        lo, hi = self._cell_ranges(self.cell_keys(gx.ravel(), gy.ravel()))
+        _, pos = self._expand(np.arange(len(lo)), lo, hi)
+        idx = self.order[pos]
+        dx = self.x[idx] - x
+        dy = self.y[idx] - y
+        return idx[dx * dx + dy * dy <= radius * radius]
+
+    def query_circle(self, x, y, radius, radii):
+        """Indices of points whose own circle (radii) overlaps the given circle"""
+        idx = self.query_radius(x, y, radius + float(np.max(radii, initial=0.0)))
+        radii = np.broadcast_to(radii, self.keys.shape)[idx]
+        dx = self.x[idx] - x
+        dy = self.y[idx] - y
+        reach = radius + radii
+        return idx[dx * dx + dy * dy < reach * reach]
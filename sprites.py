@@ -0,0 +1,78 @@
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+
+class Sprite:
+    """A pre-rendered surface plus the offset from its center to its top-left"""
+
+    def __init__(self, surface, offset):
+        self.surface = surface
+        self.offset = offset
+
+    def place(self, center):
+        """(surface, topleft) for one blit centered on an integer point"""
+        x, y = center
+        return self.surface, (x - self.offset, y - self.offset)
+
+    def place_many(self, x, y):
+        """(surface, topleft) pairs for Surface.blits, one per center.
+
+        Centers are truncated like int() so the pixels match
+        pygame.draw.circle at the same (int(x), int(y)).
+        """
+        left = (x.astype(int) - self.offset).tolist()
+        top = (y.astype(int) - self.offset).tolist()
+        return list(zip(repeat(self.surface), zip(left, top)))
+
+
+class SpriteAtlas:
+    """Circle sprites rendered once and reused every frame.
+
+    A sprite is a stack of concentric filled circles, outermost first,
+    drawn with pygame.draw.circle onto a per-pixel-alpha surface and
+    converted to the display format. Blitting it leaves exactly the pixels
+    the same draw.circle calls would, but a whole frame of objects goes out
+    in one Surface.blits call instead of one draw call per circle. Sprites
+    are RLE-encoded: their pixels are either transparent or opaque, so the
+    blit copies opaque runs instead of blending every pixel.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def circle(self, *layers):
+        """Sprite for (color, radius) layers sharing a center"""
+        sprite = self.sprites.get(layers)
+        if sprite is None:
+            sprite = self.sprites[layers] = self.render(layers)
+        return sprite
+
+    @staticmethod
+    def render(layers):
+        radius = max(int(r) for _, r in layers)
+        surface = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        for color, r in layers:
+            pygame.draw.circle(surface, color, (radius, radius), int(r))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        surface.set_alpha(255, pygame.RLEACCEL)
+        return Sprite(surface, radius)
+
+    def place_circles(self, color, x, y, radii):
+        """Blit list for one-color circles with per-circle radii"""
+        if len(radii) == 0:
+            return []
+        first = radii[0]
+        if (radii == first).all():
+            return self.circle((color, int(first))).place_many(x, y)
+        # Size variants: one sprite and one run of placements per radius
+        blits = []
+        for radius in np.unique(radii):
+            mask = radii == radius
+            blits += self.circle((color, int(radius))).place_many(x[mask], y[mask])
+        return blits
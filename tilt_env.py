@@ -0,0 +1,256 @@
+"""reset()/step() environments over the game, for controllers and fuzzing.
+
+TiltEnv wraps one HeadlessGame. VectorTiltEnv advances N independent games
+in lock-step as NumPy arrays, and run_parallel() spreads VectorTiltEnv
+rollouts over worker processes:
+
+    from tilt_env import VectorTiltEnv, RandomPolicy
+    env = VectorTiltEnv(1024)
+    obs, info = env.reset(seed=0)
+    policy = RandomPolicy(len(env), seed=0)
+    for _ in range(1000):
+        obs, reward, terminated, truncated, info = env.step(policy(obs))
+
+Both follow the Gymnasium conventions without depending on it. An action
+is the movement intent (dx, dy), each clipped to [-1, 1], exactly like a
+tilt or key press. The observation is float32 [player x, player y, enemy
+x0, enemy y0, ...]. Every step survived is worth 1 point, the same as the
+score, and an episode ends when an enemy touches the player.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from headless import HeadlessGame
+from enemy_swarm import spawn_points
+from game import (ENEMY_COUNT, ENEMY_SEPARATION, ENEMY_SIZE, ENEMY_SPEED, PLAYER_SIZE,
+                  PLAYER_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH)
+
+
+class TiltEnv:
+    """One headless game stepped by (dx, dy) actions"""
+
+    def __init__(self, enemy_count=ENEMY_COUNT, max_steps=None):
+        self.game = HeadlessGame(enemy_count)
+        self.max_steps = max_steps
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new episode; the same seed gives the same enemy spawns"""
+        self.game.restart(np.random.default_rng(seed))
+        self.steps = 0
+        return self.observation(), {}
+
+    def step(self, action):
+        game = self.game
+        dx, dy = np.clip(action, -1.0, 1.0)
+        game.move_dx, game.move_dy = float(dx), float(dy)
+        score = game.score
+        game.step()
+        self.steps += 1
+        terminated = game.game_over
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observation(), float(game.score - score), terminated, truncated, {'score': game.score}
+
+    def observation(self):
+        enemies = self.game.enemies
+        obs = np.empty(2 + 2 * len(enemies), dtype=np.float32)
+        obs[0] = self.game.player.x
+        obs[1] = self.game.player.y
+        obs[2::2] = enemies.x
+        obs[3::2] = enemies.y
+        return obs
+
+
+class VectorTiltEnv:
+    """N independent games advanced together, one array op per rule.
+
+    Mirrors Game.step with an EnemySwarm (homing, separation, respawn,
+    collision) across a (games, enemies) batch, so a VectorTiltEnv seeded
+    like a TiltEnv plays out the same episodes. Separation checks every
+    pair of enemies in a game, like EnemySwarm does for small swarms, so
+    keep enemy_count to a few dozen. Finished games reset themselves
+    inside step(); the observation returned for them is the new episode's
+    first, and info['final_score'] holds the score they ended on.
+    """
+
+    def __init__(self, num_envs, enemy_count=ENEMY_COUNT, max_steps=None, separation=ENEMY_SEPARATION):
+        self.num_envs = num_envs
+        self.enemy_count = enemy_count
+        self.max_steps = max_steps
+        self.separation = separation
+        self.rngs = [np.random.default_rng() for _ in range(num_envs)]
+
+        shape = (num_envs, enemy_count)
+        self.player_x = np.zeros(num_envs)
+        self.player_y = np.zeros(num_envs)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.size = np.full(shape, float(ENEMY_SIZE))
+        self.speed = np.full(shape, float(ENEMY_SPEED))
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+        # Enemy pairs within a game, and their flat indices across the batch
+        i, j = np.triu_indices(enemy_count, 1)
+        base = np.arange(num_envs)[:, None] * enemy_count
+        self._pairs = i, j
+        self._flat_i = (base + i).ravel()
+        self._flat_j = (base + j).ravel()
+
+        self.episodes = 0
+        self.total_score = 0
+        self.total_steps = 0
+
+    def __len__(self):
+        return self.num_envs
+
+    def reset(self, seed=None):
+        """Reset every game; game k is seeded with seed + k"""
+        if seed is not None:
+            self.rngs = [np.random.default_rng(seed + k) for k in range(self.num_envs)]
+        self.reset_envs(np.arange(self.num_envs))
+        return self.observation(), {}
+
+    def reset_envs(self, envs):
+        self.player_x[envs] = SCREEN_WIDTH // 2
+        self.player_y[envs] = SCREEN_HEIGHT // 2
+        self.score[envs] = 0
+        self.steps[envs] = 0
+        for k in envs:
+            self.x[k], self.y[k] = spawn_points(self.rngs[k], self.size[k], SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def step(self, actions):
+        actions = np.clip(actions, -1.0, 1.0)
+        px, py = self.player_x, self.player_y
+        px += actions[:, 0] * PLAYER_SPEED
+        py += actions[:, 1] * PLAYER_SPEED
+        np.clip(px, PLAYER_SIZE, SCREEN_WIDTH - PLAYER_SIZE, out=px)
+        np.clip(py, PLAYER_SIZE, SCREEN_HEIGHT - PLAYER_SIZE, out=py)
+        self.score += 1
+        self.steps += 1
+
+        # Home in on each game's player (EnemySwarm.update)
+        vx = px[:, None] - self.x
+        vy = py[:, None] - self.y
+        dist = np.hypot(vx, vy)
+        np.maximum(dist, 1, out=dist)
+        np.divide(self.speed, dist, out=dist)
+        vx *= dist
+        vy *= dist
+        self.x += vx
+        self.y += vy
+        if self.separation and self.enemy_count > 1:
+            self.separate()
+
+        out = (self.x < -100) | (self.x > SCREEN_WIDTH + 100) | (self.y < -100) | (self.y > SCREEN_HEIGHT + 100)
+        for k in np.flatnonzero(out.any(axis=1)):
+            idx = np.flatnonzero(out[k])
+            self.x[k, idx], self.y[k, idx] = spawn_points(self.rngs[k], self.size[k, idx],
+                                                          SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        hit = np.hypot(self.x - px[:, None], self.y - py[:, None]) < self.size + PLAYER_SIZE
+        terminated = hit.any(axis=1)
+        truncated = ~terminated & (self.steps >= self.max_steps) if self.max_steps else np.zeros_like(terminated)
+        final_score = np.where(terminated | truncated, self.score, 0)
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            self.episodes += len(done)
+            self.total_score += int(final_score.sum())
+            self.reset_envs(done)
+        self.total_steps += self.num_envs
+        rewards = np.ones(self.num_envs, dtype=np.float32)
+        return self.observation(), rewards, terminated, truncated, {'final_score': final_score}
+
+    def separate(self):
+        """EnemySwarm.separate over every game's pairs at once"""
+        i, j = self._pairs
+        dx = self.x[:, i] - self.x[:, j]
+        dy = self.y[:, i] - self.y[:, j]
+        dist = np.hypot(dx, dy)
+        reach = self.size[:, i] + self.size[:, j]
+        hit = dist < reach
+        if not hit.any():
+            return
+        zero = hit & (dist == 0)
+        dx[zero] = 1.0
+        dist[zero] = 1.0
+        push = np.where(hit, self.separation * 0.5 * (reach - dist) / dist, 0.0)
+        n = self.x.size
+        hit = hit.ravel()
+        fi, fj = self._flat_i[hit], self._flat_j[hit]
+        px = (dx * push).ravel()[hit]
+        py = (dy * push).ravel()[hit]
+        self.x += (np.bincount(fi, px, n) - np.bincount(fj, px, n)).reshape(self.x.shape)
+        self.y += (np.bincount(fi, py, n) - np.bincount(fj, py, n)).reshape(self.y.shape)
+
+    def observation(self):
+        obs = np.empty((self.num_envs, 2 + 2 * self.enemy_count), dtype=np.float32)
+        obs[:, 0] = self.player_x
+        obs[:, 1] = self.player_y
+        obs[:, 2::2] = self.x
+        obs[:, 3::2] = self.y
+        return obs
+
+
+class RandomPolicy:
+    """Uniform random (dx, dy) for every game"""
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, obs):
+        return self.rng.uniform(-1.0, 1.0, (self.num_envs, 2))
+
+
+class FleePolicy:
+    """Move away from the enemies, weighting the closest ones most"""
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+
+    def __call__(self, obs):
+        dx = obs[:, 0:1] - obs[:, 2::2]
+        dy = obs[:, 1:2] - obs[:, 3::2]
+        weight = 1.0 / np.maximum(dx * dx + dy * dy, 1.0)
+        action = np.stack(((dx * weight).sum(axis=1), (dy * weight).sum(axis=1)), axis=1)
+        return action / np.maximum(np.abs(action).max(axis=1, keepdims=True), 1e-9)
+
+
+def rollout(num_envs, steps, enemy_count=ENEMY_COUNT, seed=0, policy=RandomPolicy, max_steps=None):
+    """Run one VectorTiltEnv; returns its totals and the seconds spent stepping"""
+    env = VectorTiltEnv(num_envs, enemy_count, max_steps=max_steps)
+    obs, _ = env.reset(seed)
+    act = policy(num_envs, seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        obs, _, _, _, _ = env.step(act(obs))
+    seconds = time.perf_counter() - start
+    return {'steps': env.total_steps, 'episodes': env.episodes, 'score': env.total_score, 'seconds': seconds}
+
+
+def run_parallel(workers, num_envs, steps, enemy_count=ENEMY_COUNT, seed=0, policy=RandomPolicy,
+                 max_steps=None):
+    """Spread rollouts over worker processes and add up the results.
+
+    Each worker runs its own VectorTiltEnv of num_envs games; game seeds
+    never repeat across workers. The pool is started and warmed up before
+    the clock starts, so steps_per_second is the steady-state aggregate.
+    """
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers) as pool:
+        # Start every worker and import the game before timing
+        list(pool.map(rollout, [1] * workers, [1] * workers))
+        start = time.perf_counter()
+        futures = [pool.submit(rollout, num_envs, steps, enemy_count, seed + w * num_envs, policy, max_steps)
+                   for w in range(workers)]
+        results = [f.result() for f in futures]
+        seconds = time.perf_counter() - start
+    total = {key: sum(r[key] for r in results) for key in ('steps', 'episodes', 'score')}
+    total['workers'] = workers
+    total['seconds'] = seconds
+    total['steps_per_second'] = total['steps'] / seconds
+    return total
@@ -0,0 +1,170 @@
+"""From buffered tilt samples to the movement a frame applies.
+
+A tilt read at the start of a frame is already old: it left the board
+one serial interval or more ago, and the frame showing its effect reaches
+the display later still. TiltInput hides most of that:
+
+- TiltPredictor, a constant-velocity Kalman filter over pitch and roll,
+  takes every sample buffered since the last frame and extrapolates the
+  tilt to when this frame will be presented
+- ResponseCurve maps the tilt to movement with a soft deadzone (no jump
+  at its edge) and an optional exponent for finer control near level
+
+    tilt = TiltInput()
+    pitch, roll = tilt.read(samples, time.perf_counter())   # SampleRing rows
+    dx, dy = tilt.movement(pitch, roll)
+    ...
+    tilt.presented(time.perf_counter())                      # after the flip
+"""
+import numpy as np
+
+
+class TiltPredictor:
+    """Constant-velocity Kalman filter over (pitch, roll).
+
+    Both axes see the same sample times and noise, so they share one
+    covariance. ``process_noise`` is the white-noise angular acceleration
+    density (deg²/s³): higher follows quick flicks sooner and lets more
+    sensor noise through. ``measurement_noise`` is the sample variance
+    (deg²).
+
+    Samples read together carry their chunk's arrival time, so sample
+    times are rebuilt by spacing them at the board's sample interval,
+    learned from the arrivals, and backdating by ``transport_delay`` (the
+    serial link and USB). predict() extrapolates at most ``max_horizon``
+    seconds past the last sample, so a stalled stream can't run away.
+    """
+
+    def __init__(self, process_noise=2e4, measurement_noise=0.01, max_horizon=0.1,
+                 transport_delay=0.0015, period=0.01):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.max_horizon = max_horizon
+        self.transport_delay = transport_delay
+        self.period = period        # board sample interval, learned
+        self.x = None               # [pitch, roll]
+        self.v = [0.0, 0.0]         # deg/s
+        self.p = [0.0, 0.0, 0.0]    # covariance p00, p01, p11
+        self.t = None               # time of the last sample folded in
+        self.last_arrival = None
+
+    def reset(self):
+        self.x = None
+        self.t = None
+        self.last_arrival = None
+
+    def update(self, samples):
+        """Fold in SampleRing rows (ts, pitch, roll[, seq]), oldest first"""
+        n = len(samples)
+        if n == 0:
+            return
+        arrival = float(samples[-1, 0])
+        if self.last_arrival is not None and arrival > self.last_arrival:
+            self.period += 0.05 * ((arrival - self.last_arrival) / n - self.period)
+        self.last_arrival = arrival
+        last = arrival - self.transport_delay
+        times = (last - self.period * np.arange(n - 1, -1, -1)).tolist()
+        angles = samples[:, 1:3].tolist()
+
+        if self.x is None:
+            self.x = list(angles[0])
+            self.v = [0.0, 0.0]
+            self.p = [self.r, 0.0, 1e4]
+            self.t = times[0]
+        q, r = self.q, self.r
+        (x0, x1), (v0, v1) = self.x, self.v
+        p00, p01, p11 = self.p
+        t = self.t
+        for ts, (z0, z1) in zip(times, angles):
+            dt = max(ts - t, 0.0)
+            t = max(ts, t)
+            # Predict
+            x0 += v0 * dt
+            x1 += v1 * dt
+            p00 += dt * (2 * p01 + dt * p11) + q * dt ** 3 / 3
+            p01 += dt * p11 + q * dt * dt / 2
+            p11 += q * dt
+            # Correct
+            s = p00 + r
+            k0, k1 = p00 / s, p01 / s
+            e0, e1 = z0 - x0, z1 - x1
+            x0 += k0 * e0
+            x1 += k0 * e1
+            v0 += k1 * e0
+            v1 += k1 * e1
+            p11 -= k1 * p01
+            p00, p01 = (1 - k0) * p00, (1 - k0) * p01
+        self.x, self.v, self.p, self.t = [x0, x1], [v0, v1], [p00, p01, p11], t
+
+    def predict(self, t):
+        """(pitch, roll) expected at time t"""
+        h = min(max(t - self.t, 0.0), self.max_horizon)
+        return self.x[0] + self.v[0] * h, self.x[1] + self.v[1] * h
+
+
+class ResponseCurve:
+    """Tilt in degrees to movement, per axis.
+
+    Output is 0 inside ``deadzone`` degrees and then grows from 0, so
+    leaving the deadzone never jumps; it reaches 1 at ``full_tilt``. An
+    ``exponent`` above 1 gives finer control near level, below 1 a
+    quicker start. ``max_output`` caps steep tilts (None: no cap).
+    """
+
+    def __init__(self, full_tilt=25.0, deadzone=2.5, exponent=1.0, max_output=None):
+        self.full_tilt = full_tilt
+        self.deadzone = deadzone
+        self.exponent = exponent
+        self.max_output = max_output
+
+    def __call__(self, tilt):
+        live = max(abs(tilt) - self.deadzone, 0.0) / (self.full_tilt - self.deadzone)
+        out = live ** self.exponent
+        if self.max_output is not None:
+            out = min(out, self.max_output)
+        return out if tilt >= 0 else -out
+
+
+class TiltInput:
+    """Samples in, (pitch, roll) and movement out, once per frame.
+
+    ``lead`` is how long after read() the frame gets presented; it starts
+    at one frame and follows presented() calls. Without a predictor the
+    frame's samples are averaged, as the game used to.
+    """
+
+    def __init__(self, predictor=None, curve=None, lead=1 / 60):
+        self.predictor = predictor
+        self.curve = curve or ResponseCurve()
+        self.lead = lead
+        self.read_at = None
+        self.pitch = 0.0
+        self.roll = 0.0
+
+    def reset(self):
+        if self.predictor is not None:
+            self.predictor.reset()
+        self.read_at = None
+
+    def read(self, samples, now):
+        """The tilt to act on this frame; samples may be empty"""
+        predictor = self.predictor
+        if predictor is None:
+            if len(samples):
+                self.pitch, self.roll = (float(v) for v in samples[:, 1:3].mean(axis=0))
+        else:
+            predictor.update(samples)
+            if predictor.x is not None:
+                self.pitch, self.roll = predictor.predict(now + self.lead)
+        self.read_at = now
+        return self.pitch, self.roll
+
+    def movement(self, pitch, roll):
+        """(dx, dy) for a tilt: roll steers x, pitch steers y"""
+        return self.curve(-roll), self.curve(pitch)
+
+    def presented(self, now):
+        """The frame that used the last read() is on the display"""
+        if self.read_at is not None:
+            self.lead += 0.1 * (now - self.read_at - self.lead)
+            self.read_at = None
@@ -0,0 +1,105 @@
+import time
+from collections import Counter
+
+import pygame
+
+
+class VoicePool:
+    """Mixer channels handed out by priority class, with voice stealing.
+
+    Every mixer channel is reserved and split into fixed blocks, one per
+    priority class, so a burst of low-priority effects can never take the
+    channel an important cue needs. Each effect also has a polyphony cap.
+    When a new sound would exceed the effect's cap, the effect's oldest
+    voice is restarted with it. When its class has no free channel, the
+    class's oldest voice is stolen, or, for classes created with
+    steal=False, the new sound is dropped. Volume is set on the channel,
+    never on the shared Sound, so it only affects the voice being started.
+    """
+
+    def __init__(self, classes, limits, default=None, time_source=time.monotonic):
+        # classes: (name, channel count, steal) in priority order
+        # limits: effect -> (class name, max voices)
+        self.limits = limits
+        self.default = default or (classes[-1][0], 1)
+        self.time_source = time_source
+        self.steals = {name: steal for name, _, steal in classes}
+
+        total = sum(count for _, count, _ in classes)
+        self.enabled = pygame.mixer.get_init() is not None
+        if self.enabled:
+            pygame.mixer.set_num_channels(total)
+            pygame.mixer.set_reserved(total)
+
+        self.channels = {}      # class -> [channel index]
+        first = 0
+        for name, count, _ in classes:
+            self.channels[name] = list(range(first, first + count))
+            first += count
+        self.owner = [None] * total     # effect playing on each channel
+        self.started = [0.0] * total
+
+        self.played = Counter()
+        self.stolen = Counter()
+        self.dropped = Counter()
+        self.peak_voices = 0
+
+    def busy(self, index):
+        return self.owner[index] is not None and pygame.mixer.Channel(index).get_busy()
+
+    def voices(self, indices, effect=None):
+        """Busy channel indices, oldest first, optionally for one effect"""
+        busy = [i for i in indices if self.busy(i) and (effect is None or self.owner[i] == effect)]
+        return sorted(busy, key=self.started.__getitem__)
+
+    def choose(self, effect):
+        """Channel index for a new voice of effect, or None to drop it"""
+        voice_class, cap = self.limits.get(effect, self.default)
+        indices = self.channels[voice_class]
+        playing = self.voices(indices, effect)
+        if len(playing) >= cap:
+            self.stolen[effect] += 1
+            return playing[0]
+        for i in indices:
+            if not self.busy(i):
+                return i
+        if not self.steals[voice_class]:
+            return None
+        self.stolen[effect] += 1
+        return self.voices(indices)[0]
+
+    def play(self, sound, effect, volume=1.0):
+        """Start sound as a voice of effect; returns its Channel or None"""
+        index = self.choose(effect) if self.enabled else None
+        if index is None:
+            self.dropped[effect] += 1
+            return None
+        channel = pygame.mixer.Channel(index)
+        channel.set_volume(volume)
+        channel.play(sound)
+        self.owner[index] = effect
+        self.started[index] = self.time_source()
+        self.played[effect] += 1
+        self.peak_voices = max(self.peak_voices, self.active())
+        return channel
+
+    def active(self):
+        """Voices playing right now"""
+        return sum(self.busy(i) for i in range(len(self.owner)))
+
+    def stop_all(self):
+        for i in range(len(self.owner)):
+            if self.enabled:
+                pygame.mixer.Channel(i).stop()
+            self.owner[i] = None
+
+    def stats(self):
+        """Voices used and dropped, overall and per effect"""
+        return {
+            'active': self.active() if self.enabled else 0,
+            'peak': self.peak_voices,
+            'channels': {name: len(indices) for name, indices in self.channels.items()},
+            'played': dict(self.played),
+            'stolen': dict(self.stolen),
+            'dropped': dict(self.dropped),
+        }
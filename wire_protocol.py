@@ -0,0 +1,393 @@
+import struct
+import time
+
+import numpy as np
+
+from line_framer import LineFramer
+
+# Frame layout (little-endian, 9 bytes):
+#   sync  u16  0xA5 0x5A on the wire
+#   seq   u16  wraps at 65536
+#   pitch i16  centidegrees
+#   roll  i16  centidegrees
+#   crc   u8   CRC-8 (poly 0x07, init 0) over seq..roll
+SYNC = b'\xa5\x5a'
+FRAME = struct.Struct('<2sHhhB')
+FRAME_SIZE = FRAME.size
+FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'), ('seq', '<u2'), ('pitch', '<i2'), ('roll', '<i2'), ('crc', 'u1'),
+])
+SYNC_WORD = int.from_bytes(SYNC, 'little')
+ANGLE_SCALE = 100.0
+
+# Raw IMU frame (little-endian, 19 bytes), for fusion on the host:
+#   sync  u16  0xA5 0x5B on the wire
+#   seq   u16  wraps at 65536
+#   accel i16 x3  accelerometer counts (ax, ay, az), ±2 g full scale
+#   gyro  i16 x3  gyroscope counts (gx, gy, gz), ±250 °/s, bias not removed
+#   dt    u16  microseconds since the previous sample
+#   crc   u8   CRC-8 (poly 0x07, init 0) over seq..dt
+RAW_SYNC = b'\xa5\x5b'
+RAW_FRAME = struct.Struct('<2sH6hHB')
+RAW_FRAME_SIZE = RAW_FRAME.size
+RAW_FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'), ('seq', '<u2'), ('accel', '<i2', 3), ('gyro', '<i2', 3), ('dt', '<u2'), ('crc', 'u1'),
+])
+ACCEL_SENS = 16384.0  # counts per g
+GYRO_SENS = 131.0     # counts per °/s
+
+# Negotiation: the host asks with a one-letter command, the board answers
+# with an ack line and switches protocol right after it.
+BINARY_REQUEST = b'B\n'
+CSV_REQUEST = b'C\n'
+BINARY_ACK = b'#BIN1\r\n'
+RAW_REQUEST = b'R\n'
+RAW_ACK = b'#RAW1\r\n'
+
+
+def _crc8_table(poly=0x07):
+    table = np.zeros(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) if crc & 0x80 else (crc << 1)
+        table[i] = crc & 0xFF
+    return table
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data):
+    """CRC-8 of a bytes-like object, matching crc8() in game.ino"""
+    crc = 0
+    for b in bytes(data):
+        crc = int(CRC8_TABLE[crc ^ b])
+    return crc
+
+
+def crc8_frames(frames):
+    """Vectorized CRC-8 over the payload of an array of frame records"""
+    size = frames.dtype.itemsize
+    payload = frames.view(np.uint8).reshape(-1, size)[:, 2:size - 1]
+    crc = np.zeros(len(frames), dtype=np.uint8)
+    for column in payload.T:
+        crc = CRC8_TABLE[crc ^ column]
+    return crc
+
+
+def encode_frame(seq, pitch, roll):
+    """Build one binary frame (what the board sends in binary mode)"""
+    p = int(round(max(-327.68, min(327.67, pitch)) * ANGLE_SCALE))
+    r = int(round(max(-327.68, min(327.67, roll)) * ANGLE_SCALE))
+    body = struct.pack('<Hhh', seq & 0xFFFF, p, r)
+    return SYNC + body + bytes([crc8(body)])
+
+
+def encode_raw_frame(seq, accel, gyro, dt_us):
+    """Build one raw IMU frame from counts (what the board sends in raw mode)"""
+    body = struct.pack('<H6hH', seq & 0xFFFF, *accel, *gyro, min(int(dt_us), 0xFFFF))
+    return RAW_SYNC + body + bytes([crc8(body)])
+
+
+def decode_frame(frame):
+    """Decode a single frame to (seq, pitch, roll), or None if it's corrupt"""
+    sync, seq, pitch, roll, crc = FRAME.unpack(frame)
+    if sync != SYNC or crc8(frame[2:FRAME_SIZE - 1]) != crc:
+        return None
+    return seq, pitch / ANGLE_SCALE, roll / ANGLE_SCALE
+
+
+class BinaryDecoder:
+    """Incremental decoder for binary frames, a drop-in for LineFramer.
+
+    Frames are validated in bulk with np.frombuffer straight on the receive
+    buffer. After a bad sync or CRC the decoder slides forward one byte and
+    searches for the next sync word. Sequence gaps are counted as lost.
+    Records are (pitch, roll, seq).
+    """
+    sync = SYNC
+    frame_dtype = FRAME_DTYPE
+    fields = 3
+
+    def __init__(self, capacity=65536):
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.fill = 0
+        self.frame_size = self.frame_dtype.itemsize
+        self.sync_word = int.from_bytes(self.sync, 'little')
+        self.empty = np.empty((0, self.fields), dtype=np.float64)
+        self.last_seq = None
+        self.records = 0        # frames accepted
+        self.malformed = 0      # resyncs after a corrupt frame or stray bytes
+        self.skipped_bytes = 0  # bytes discarded while resyncing
+        self.lost = 0           # frames missing according to sequence numbers
+
+    def reset(self):
+        self.fill = 0
+        self.last_seq = None
+
+    def read_from(self, ser):
+        """Read what the port has straight into the buffer and decode it"""
+        free = len(self.buffer) - self.fill
+        want = min(max(1, ser.in_waiting), free)
+        got = ser.readinto(self.view[self.fill:self.fill + want])
+        if not got:
+            return self.empty
+        self.fill += got
+        return self.parse()
+
+    def feed(self, data):
+        """Append received bytes and return every complete record"""
+        data = memoryview(data)
+        out = []
+        while len(data):
+            take = min(len(data), len(self.buffer) - self.fill)
+            self.view[self.fill:self.fill + take] = data[:take]
+            self.fill += take
+            data = data[take:]
+            out.append(self.parse())
+        if len(out) == 1:
+            return out[0]
+        return np.concatenate(out) if out else self.empty
+
+    def append(self, data):
+        """Buffer received bytes without decoding them (see parse_many); False if they don't fit"""
+        n = len(data)
+        if n > len(self.buffer) - self.fill:
+            return False
+        self.view[self.fill:self.fill + n] = data
+        self.fill += n
+        return True
+
+    def parse(self):
+        """Decode every whole frame in the buffer, resyncing past garbage"""
+        accepted = []
+        pos = 0
+        size = self.frame_size
+        while True:
+            start = self.buffer.find(self.sync, pos, self.fill)
+            if start < 0:
+                # Keep a trailing half sync word; drop anything else
+                keep = 1 if self.fill > pos and self.buffer[self.fill - 1] == self.sync[0] else 0
+                self._skip(self.fill - keep - pos)
+                pos = self.fill - keep
+                break
+            self._skip(start - pos)
+            count = (self.fill - start) // size
+            if count == 0:
+                pos = start
+                break
+
+            frames = np.frombuffer(self.buffer, dtype=self.frame_dtype, count=count, offset=start)
+            ok = (frames['sync'] == self.sync_word) & (crc8_frames(frames) == frames['crc'])
+            bad = np.flatnonzero(~ok)
+            run = count if len(bad) == 0 else int(bad[0])
+            if run:
+                accepted.append(frames[:run].copy())
+            pos = start + run * size
+            if run < count:
+                # Corrupt frame: step past its sync byte and hunt again
+                self.malformed += 1
+                self._skip(1)
+                pos += 1
+
+        tail = self.fill - pos
+        self.buffer[:tail] = self.buffer[pos:self.fill]
+        self.fill = tail
+
+        if not accepted:
+            return self.empty
+        frames = accepted[0] if len(accepted) == 1 else np.concatenate(accepted)
+        self._track_sequence(frames['seq'])
+        self.records += len(frames)
+        return self.decode(frames)
+
+    def decode(self, frames):
+        """Records for a run of valid frames"""
+        records = np.empty((len(frames), 3), dtype=np.float64)
+        records[:, 0] = frames['pitch']
+        records[:, 1] = frames['roll']
+        records[:, :2] /= ANGLE_SCALE
+        records[:, 2] = frames['seq']
+        return records
+
+    def _skip(self, n):
+        if n > 0:
+            self.skipped_bytes += n
+
+    def _track_sequence(self, seq):
+        seq = seq.astype(np.int64)
+        if self.last_seq is not None:
+            seq = np.concatenate(([self.last_seq], seq))
+        gaps = (np.diff(seq) - 1) % 65536
+        self.lost += int(gaps.sum())
+        self.last_seq = int(seq[-1])
+
+
+def parse_many(decoders):
+    """parse() for several decoders of one class, sharing the NumPy work.
+
+    The whole frames of every decoder whose buffer starts on a sync word
+    are checked, sequence-tracked and decoded in one pass, so the cost per
+    decoder is a few Python operations instead of a full parse(). A
+    decoder with bytes to resync past, or a corrupt frame, goes through
+    its own parse(). Returns each decoder's records, in order.
+    """
+    out = [None] * len(decoders)
+    batch, chunks, counts = [], [], []
+    for i, decoder in enumerate(decoders):
+        count = decoder.fill // decoder.frame_size
+        if count and decoder.buffer.startswith(decoder.sync):
+            batch.append(i)
+            chunks.append(decoder.view[:count * decoder.frame_size])
+            counts.append(count)
+        else:
+            out[i] = decoder.parse()
+    if not batch:
+        return out
+
+    first = decoders[batch[0]]
+    frames = np.frombuffer(b''.join(chunks), dtype=first.frame_dtype)
+    ok = (frames['sync'] == first.sync_word) & (crc8_frames(frames) == frames['crc'])
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    bad = np.add.reduceat(~ok, starts)
+
+    # Sequence gaps, each decoder's run continuing from its last frame
+    seq = frames['seq'].astype(np.int64)
+    prev = np.empty_like(seq)
+    prev[1:] = seq[:-1]
+    prev[starts] = [seq[start] - 1 if decoders[i].last_seq is None else decoders[i].last_seq
+                    for i, start in zip(batch, starts.tolist())]
+    lost = np.add.reduceat((seq - prev - 1) % 65536, starts)
+    records = first.decode(frames)
+
+    rows = zip(batch, counts, starts.tolist(), ends.tolist(), bad.tolist(), lost.tolist(),
+               seq[ends - 1].tolist())
+    for i, count, start, end, corrupt, gaps, last_seq in rows:
+        decoder = decoders[i]
+        if corrupt:
+            out[i] = decoder.parse()
+            continue
+        used = count * decoder.frame_size
+        tail = decoder.fill - used
+        decoder.buffer[:tail] = decoder.buffer[used:decoder.fill]
+        decoder.fill = tail
+        decoder.lost += gaps
+        decoder.last_seq = last_seq
+        decoder.records += count
+        out[i] = records[start:end]
+    return out
+
+
+class RawDecoder(BinaryDecoder):
+    """BinaryDecoder for raw IMU frames.
+
+    Records are (ax, ay, az, gx, gy, gz, dt, seq): acceleration in g,
+    angular rate in °/s with the gyro bias still in it, and the time since
+    the previous sample in seconds. imu_fusion turns them into pitch/roll.
+    """
+    sync = RAW_SYNC
+    frame_dtype = RAW_FRAME_DTYPE
+    fields = 8
+
+    def decode(self, frames):
+        records = np.empty((len(frames), 8), dtype=np.float64)
+        records[:, 0:3] = frames['accel']
+        records[:, 0:3] /= ACCEL_SENS
+        records[:, 3:6] = frames['gyro']
+        records[:, 3:6] /= GYRO_SENS
+        records[:, 6] = frames['dt']
+        records[:, 6] /= 1e6
+        records[:, 7] = frames['seq']
+        return records
+
+
+class ProtocolNegotiator:
+    """Ask the board for binary frames, falling back to CSV.
+
+    Call poll() repeatedly while waiting for the sensor. Once the board acks
+    the request (or keeps streaming CSV for ``csv_grace`` seconds without
+    acking) ``decoder`` is set and poll() starts returning records from it.
+    CSV lines may carry a third field, the board's sample counter (see
+    CSV_SEQUENCE in game.ino); the field count is taken from the stream.
+
+    With a ``fusion`` (see imu_fusion.SensorFusion) the first
+    ``raw_attempts`` requests ask for raw IMU frames instead, and the
+    decoder fuses them into pitch/roll on the host. Firmware without raw
+    mode is then asked for binary, and CSV waits that much longer.
+    """
+
+    def __init__(self, ser, prefer_binary=True, retry_interval=0.2, csv_grace=0.6, fusion=None,
+                 raw_attempts=3):
+        self.ser = ser
+        self.prefer_binary = prefer_binary
+        self.retry_interval = retry_interval
+        self.fusion = fusion
+        self.raw_attempts = raw_attempts if fusion is not None else 0
+        self.csv_grace = csv_grace + self.raw_attempts * retry_interval if prefer_binary else 0.0
+        self.requests = 0
+        self.text = LineFramer()
+        self.pending = bytearray()
+        self.first_data = None
+        self.last_request = 0.0
+        self.decoder = None
+        self.protocol = None
+
+    def poll(self):
+        """Read from the port; return decoded records once the protocol is known"""
+        if self.decoder is not None:
+            if self.ser.in_waiting > 0:
+                return self.decoder.read_from(self.ser)
+            return self.decoder.empty
+
+        data = self.ser.read(self.ser.in_waiting) if self.ser.in_waiting > 0 else b''
+        now = time.monotonic()
+        if data and self.first_data is None:
+            self.first_data = now
+        # The board ignores input until its setup() is done, so only ask
+        # once it is streaming and keep asking until it answers
+        if self.prefer_binary and self.first_data is not None and now - self.last_request >= self.retry_interval:
+            self.ser.write(RAW_REQUEST if self.requests < self.raw_attempts else BINARY_REQUEST)
+            self.requests += 1
+            self.last_request = now
+
+        self.pending += data
+        if self.prefer_binary:
+            # A late raw ack can arrive after we moved on to binary: the last ack wins
+            ack, protocol = max((self.pending.rfind(BINARY_ACK), 'binary'),
+                                (self.pending.rfind(RAW_ACK) if self.fusion is not None else -1, 'raw'))
+            if ack >= 0:
+                if protocol == 'raw':
+                    self.decoder = self.fusion.wrap(RawDecoder())
+                    ack += len(RAW_ACK)
+                else:
+                    self.decoder = BinaryDecoder()
+                    ack += len(BINARY_ACK)
+                self.protocol = protocol
+                records = self.decoder.feed(self.pending[ack:])
+                self.pending = bytearray()
+                return records
+
+        fields = csv_fields(data)
+        if fields in (2, 3) and fields != self.text.fields:
+            self.text = LineFramer(fields=fields)
+        records = self.text.feed(data) if data else self.text.empty
+        # Keep just enough bytes to spot an ack split across reads
+        del self.pending[:-max(len(BINARY_ACK), len(RAW_ACK))]
+        # Decide once at least one whole line has shown the field count
+        if self.text.records and now - self.first_data >= self.csv_grace:
+            self.decoder = self.text
+            self.protocol = 'csv'
+            return records
+        return self.text.empty
+
+
+def csv_fields(data):
+    """Field count of the newest complete CSV line in data, or None"""
+    for line in reversed(bytes(data).split(b'\n')[:-1]):
+        line = line.strip()
+        if line and not line.startswith(b'#'):
+            return line.count(b',') + 1
+    return None